@@ -3,6 +3,7 @@
 # define the Agents for the multi-agent system
 # And define the graph structure
 #################################################
+import asyncio
 import os
 from langchain_mcp_adapters.client import MultiServerMCPClient
 # from langchain.agents import create_agent
@@ -31,6 +32,9 @@ from app.models.agent_models import (
     VegaAgentOutput,
     GeneralAgentOutput
 )
+from app.services.artifact_store import get_artifact_manager
+from app.utils.column_profile import cached_profile
+from app.utils.plot_sepcs import build_chart_spec, is_chart_request
 from pathlib import Path
 
 
@@ -161,11 +165,44 @@ class State(TypedDict):
     profile: Optional[Dict[str, Any]] = None 
 
 
+# ----------------------------------------------
+# Deterministic charts
+# ----------------------------------------------
+async def build_direct_chart(state: State) -> Optional[Dict[str, Any]]:
+    """
+    Build the requested chart without the vega_plot_generator agent when
+    the chart type and fields resolve from the user's query and the
+    dataset profile. Returns the state updates, or None to fall back to
+    the agent.
+    """
+    path = state.get("sample_data_path")
+    query = next((m.content for m in reversed(state["messages"]) if isinstance(m, HumanMessage)), None)
+    if not path or not isinstance(query, str) or not is_chart_request(query):
+        return None
+    try:
+        # a newly saved profile grows the dataset, so its indexed size is refreshed
+        profile = await asyncio.to_thread(cached_profile, path, on_saved=get_artifact_manager().register)
+    except Exception as e:
+        print(f"[Charts] Could not profile {path}, using vega_plot_generator: {e}")
+        return None
+    if not profile.get("ok"):
+        return None
+    spec = build_chart_spec(query, profile)
+    if spec is None:
+        return None
+    print(f"[Charts] Built '{spec['title']}' without vega_plot_generator")
+    return {"vega_spec": spec, "profile": profile}
+
+
 # ----------------------------------------------
 # Supervisor Node (AI-Powered)
 # ----------------------------------------------
 @traceable(run_type="chain", name="supervisor_decision")
 async def supervisor_node(state: State) -> dict:
+    # RULE 3 step 3 without a routing call: a ready chart finishes the turn
+    if state.get("vega_spec"):
+        return {"next": "FINISH", "messages": [AIMessage(content="Supervisor routing to FINISH.")]}
+
     # Dynamically get the list of agents from your Registry
     # This will return ['geomaterial_collector', 'locality_collector', ...]
     registered_agents = registry.list_agents()
@@ -189,6 +226,14 @@ async def supervisor_node(state: State) -> dict:
     decision = await chain.ainvoke({"messages": state["messages"]})
     
     print(f"\n[SUPERVISOR] Decision: {decision.next_agent}")
+
+    # routing to the plot agent means no collection is pending (a request
+    # may need several collectors), so a common chart is built directly
+    if decision.next_agent == "vega_plot_generator" and state.get("sample_data_path"):
+        chart = await build_direct_chart(state)
+        if chart is not None:
+            print("[SUPERVISOR] Decision: FINISH (chart built directly)")
+            return {**chart, "next": "FINISH", "messages": [AIMessage(content="Supervisor routing to FINISH.")]}
     
     return {
         "next": decision.next_agent,
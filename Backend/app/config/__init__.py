@@ -1,5 +1,5 @@
 # Config package - contains configuration and settings
 from .settings import settings
-from .mindat_config import MindatAPIClient
+from .mindat_config import MindatAPIClient, get_mindat_client, close_mindat_client
 
-__all__ = ["settings", "MindatAPIClient"]
\ No newline at end of file
+__all__ = ["settings", "MindatAPIClient", "get_mindat_client", "close_mindat_client"]
\ No newline at end of file
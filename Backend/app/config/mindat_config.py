@@ -1,10 +1,18 @@
 # Backend/app/config/mindat_config.py
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
-import requests
+from typing import Optional, List, Dict, Callable, Any
+import asyncio
+import json
+import threading
+import httpx
 from urllib.parse import urljoin
 from app.utils.custom_message import MindatAPIException, ErrorSeverity
 from app.config.settings import settings
+from app.utils.mindat_cache import MindatResponseCache, build_mindat_cache, make_cache_key
+from app.utils.single_flight import SingleFlight
+from app.utils.rate_limiter import TokenBucketRateLimiter, build_mindat_rate_limiter
+from app.utils.resilience import CircuitBreaker, RETRYABLE_STATUS_CODES, backoff_delay, parse_retry_after
+from app.utils.json_stream import JSONStreamError, ResultsStreamParser
 
 
 
@@ -39,18 +47,88 @@ class MindatAuth:
         return {
             'Authorization': f'Token {self.api_key}',
             'Content-Type': 'application/json',
-            'User-Agent': 'Mindat-API-Tutorial/1.0'
+            'User-Agent': 'Mindat-API-Tutorial/1.0',
+            # httpx decodes zstd transparently because zstandard is installed
+            'Accept-Encoding': 'gzip, zstd',
         }
 
 
 
+class _OrderedPages:
+    """
+    Reorder buffer for concurrently fetched pages. Rows of the page at the
+    head of the offset order go straight to `emit`; rows of later pages wait
+    in their own buffer until every page before them has finished.
+    """
+
+    def __init__(self, offsets: List[int], emit: Callable[[List[Dict[str, Any]]], None]):
+        self.order = offsets
+        self.emit = emit
+        self.head = 0
+        self.buffers: Dict[int, List[Dict[str, Any]]] = {o: [] for o in offsets}
+        self.finished: set = set()
+
+    def writer(self, offset: int) -> Callable[[List[Dict[str, Any]]], None]:
+        def write(rows: List[Dict[str, Any]]) -> None:
+            if self.head < len(self.order) and self.order[self.head] == offset:
+                self.emit(rows)
+            else:
+                self.buffers[offset].extend(rows)
+        return write
+
+    def finish(self, offset: int) -> None:
+        self.finished.add(offset)
+        while self.head < len(self.order) and self.order[self.head] in self.finished:
+            self.head += 1
+            if self.head < len(self.order):
+                rows = self.buffers.pop(self.order[self.head])
+                self.buffers[self.order[self.head]] = []
+                if rows:
+                    self.emit(rows)
+
+
 class MindatAPIClient:
-    """Comprehensive client for the Mindat.org API"""
-    def __init__(self, auth : MindatAuth = None):
+    """
+    Comprehensive async client for the Mindat.org API.
+
+    Wraps a single httpx.AsyncClient so every request made through one
+    instance reuses the same keep-alive connection pool (and TLS session).
+    Use get_mindat_client() to obtain the process-wide instance.
+    """
+    def __init__(
+        self,
+        auth : MindatAuth = None,
+        config = settings,
+        cache: Optional[MindatResponseCache] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    ):
         self.auth = auth or MindatAuth()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.single_flight = SingleFlight()
         self.base_url = self.auth.base_url
-        self.session = requests.Session()
-        self.session.headers.update(self.auth.get_headers())
+        self.timeout = config.request_timeout
+        self.connect_timeout = config.connect_timeout
+        self.max_retries = config.max_retries
+        self.backoff_base = config.retry_backoff_base
+        self.backoff_max = config.retry_backoff_max
+        self.circuit_failure_threshold = config.circuit_failure_threshold
+        self.circuit_reset_timeout = config.circuit_reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_stats = {"retries": 0, "retry_after_honoured": 0, "gave_up": 0}
+        self.page_size = config.mindat_page_size
+        self.fetch_workers = config.mindat_fetch_workers
+        self.max_rows = config.mindat_max_rows
+        self.session = httpx.AsyncClient(
+            headers=self.auth.get_headers(),
+            timeout=httpx.Timeout(config.request_timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.mindat_max_connections,
+                max_keepalive_connections=config.mindat_max_keepalive_connections,
+                keepalive_expiry=config.mindat_keepalive_expiry,
+            ),
+            http2=config.mindat_http2,
+        )
         # Available endpoints
         self.endpoints = {
                 "minerals-ima": "https://api.mindat.org/v1/minerals-ima/",
@@ -82,43 +160,394 @@ class MindatAPIClient:
                 "reference-isbn": "https://api.mindat.org/v1/reference-isbn/"
         }
     
-    def get_data_from_api(self, endpoint: str, params: dict = None, timeout: int = 30) -> Dict:
-        """Make GET request to API endpoint"""
-        if endpoint:
-            url  = self.endpoints.get(endpoint)
-            print("Endpoint passed in get_data_from_api: is", endpoint)
-            print("Resolved URL is:", url)
-            print("Using parameters:", params)
-        else : 
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        await self.session.aclose()
+
+    def _endpoint_url(self, endpoint: str) -> str:
+        url = self.endpoints.get(endpoint) if endpoint else None
+        if url is None:
             raise MindatAPIException(
-                message="Mindat API key is missing.",
+                message=f"Unknown Mindat endpoint: {endpoint!r}",
                 status_code=500,
                 severity=ErrorSeverity.CRITICAL,
-                details={
-                    "hint": "Set MINDAT_API_KEY in your environment or .env file.",
-                    "doc": "https://www.mindat.org/a/how_to_get_an_api_key",
-                },
+                details={"endpoint": endpoint, "available": sorted(self.endpoints)},
             )
+        return url
+
+    async def get_data_from_api(
+        self,
+        endpoint: str,
+        params: dict = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> Dict:
+        """Make GET request to API endpoint (use_cache=False bypasses the response cache)"""
+        url = self._endpoint_url(endpoint)
+        print("Endpoint passed in get_data_from_api: is", endpoint)
+        print("Resolved URL is:", url)
         if params is None:
             params = {}
         else:
             print("Parameters being sent:", params)
+
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = await cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+
+        # identical concurrent requests share one upstream call
+        return await self.single_flight.do(
+            make_cache_key(endpoint, params),
+            lambda: self._request(endpoint, url, params, timeout, cache),
+        )
+
+    async def stream_data_from_api(
+        self,
+        endpoint: str,
+        params: dict,
+        on_rows: Callable[[List[Dict[str, Any]]], None],
+        timeout: Optional[float] = None,
+    ) -> Dict:
+        """
+        GET a list endpoint and hand its results to on_rows as they are parsed
+        off the wire, without holding the page in memory. Returns the other
+        top-level fields (count, next, ...) plus "returned". This call neither
+        caches nor coalesces; fetch_all does both for streamed pages.
+        """
+        url = self._endpoint_url(endpoint)
+        return await self._request(endpoint, url, params or {}, timeout, None, on_rows=on_rows)
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(self.circuit_failure_threshold, self.circuit_reset_timeout)
+            self.breakers[endpoint] = breaker
+        return breaker
+
+    async def _request(
+        self,
+        endpoint: str,
+        url: str,
+        params: dict,
+        timeout: Optional[float],
+        cache: Optional[MindatResponseCache],
+        on_rows: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> Dict:
+        """
+        Perform the HTTP GET and populate the cache on success. With on_rows
+        the body is parsed incrementally and results are passed on in batches.
+
+        Transient failures (429, 5xx, connect/read errors) are retried up to
+        max_retries times with jittered exponential backoff, waiting at least
+        as long as any Retry-After header asks. 5xx and transport failures feed
+        the endpoint's circuit breaker, which fails fast while Mindat is down.
+        A streamed body that fails after rows were handed on is not retried.
+        """
+        breaker = self._breaker(endpoint)
+        request_timeout = httpx.Timeout(timeout or self.timeout, connect=self.connect_timeout)
+        attempt = 0
+        parser: Optional[ResultsStreamParser] = None
+        while True:
+            # take the rate-limit slot first: a rejected slot (429) must not
+            # leave a half-open probe admitted and never settled
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+
+            if not breaker.allow_request():
+                raise MindatAPIException(
+                    message="Mindat API is temporarily unavailable (circuit open)",
+                    status_code=503,
+                    severity=ErrorSeverity.WARNING,
+                    details={"endpoint": endpoint, "retry_in_seconds": round(breaker.retry_in(), 1)}
+                )
+            probing = breaker.state == breaker.HALF_OPEN
+
+            retry_after = None
+            try:
+                async with self.session.stream("GET", url, params=params, timeout=request_timeout) as response:
+                    if response.status_code in RETRYABLE_STATUS_CODES:
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        if response.status_code >= 500:
+                            breaker.record_failure()
+                        else:
+                            # throttling says nothing about Mindat's health
+                            breaker.record_success()
+                        error, status_code = f"HTTP {response.status_code} from {url}", response.status_code
+                    else:
+                        breaker.record_success()
+                        response.raise_for_status()
+                        if on_rows is None:
+                            await response.aread()
+                            response.encoding = "utf-8"
+                            data = response.json()
+                        else:
+                            parser = ResultsStreamParser()
+                            async for chunk in response.aiter_bytes():
+                                rows = parser.feed(chunk)
+                                if rows:
+                                    on_rows(rows)
+                            rows = parser.feed(b"", final=True)
+                            if rows:
+                                on_rows(rows)
+                            data = {**parser.meta, "returned": parser.rows_parsed}
+                        break
+            except httpx.HTTPStatusError as http_err:
+                raise MindatAPIException(
+                    message="HTTP error occurred while accessing Mindat API",
+                    status_code=http_err.response.status_code,
+                    severity=ErrorSeverity.CRITICAL,
+                    details={"error": str(http_err), "url": url, "params": params}
+                )
+            except httpx.TransportError as req_err:
+                breaker.record_failure()
+                error, status_code = f"{type(req_err).__name__}: {req_err}", 503
+                if parser is not None and parser.rows_parsed:
+                    # rows already went downstream; a retry would duplicate them
+                    raise MindatAPIException(
+                        message="Mindat response stream was interrupted",
+                        status_code=status_code,
+                        severity=ErrorSeverity.ERROR,
+                        details={"error": error, "url": url, "params": params, "rows_received": parser.rows_parsed}
+                    )
+            except (JSONStreamError, json.JSONDecodeError) as parse_err:
+                # only the body parsers; errors raised by on_rows propagate unchanged
+                raise MindatAPIException(
+                    message="Invalid JSON received from Mindat API",
+                    status_code=502,
+                    severity=ErrorSeverity.ERROR,
+                    details={"error": str(parse_err), "url": url, "params": params}
+                )
+            except httpx.HTTPError as req_err:
+                raise MindatAPIException(
+                    message="Request error occurred while accessing Mindat API",
+                    status_code=500,
+                    severity=ErrorSeverity.CRITICAL,
+                    details={"error": str(req_err), "url": url, "params": params}
+                )
+            finally:
+                if probing:
+                    # a probe that ended without a verdict (cancelled, or an
+                    # unexpected error) must not keep the breaker half-open
+                    breaker.release_probe()
+
+            delay = max(backoff_delay(attempt, self.backoff_base, self.backoff_max), retry_after or 0.0)
+            if attempt >= self.max_retries or delay > self.backoff_max:
+                self.retry_stats["gave_up"] += 1
+                raise MindatAPIException(
+                    message=f"Mindat API request failed after {attempt + 1} attempt(s)",
+                    status_code=status_code,
+                    severity=ErrorSeverity.ERROR,
+                    details={
+                        "error": error,
+                        "url": url,
+                        "params": params,
+                        "retry_after": retry_after,
+                    }
+                )
+            attempt += 1
+            self.retry_stats["retries"] += 1
+            if retry_after is not None:
+                self.retry_stats["retry_after_honoured"] += 1
+            print(f"[Mindat Client] {endpoint}: {error}; retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        if cache is not None:
+            await cache.set(endpoint, params, data)
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache, request-coalescing, retry, circuit-breaker and rate-limit counters"""
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "coalescing": self.single_flight.stats(),
+            "retries": dict(self.retry_stats),
+            "circuit_breakers": {name: b.stats() for name, b in self.breakers.items()},
+            "rate_limiter": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+        }
+
+    async def _fetch_page(
+        self,
+        endpoint: str,
+        params: dict,
+        write: Callable[[List[Dict[str, Any]]], None],
+        use_cache: bool,
+        stream: bool,
+    ) -> Dict:
+        """
+        Fetch one page into `write`; returns the page's count/next/... fields.
+
+        A streamed page with the cache enabled is still parsed incrementally,
+        but its rows are kept until the page completes so the page can be
+        written through to the cache, and identical in-flight pages are
+        coalesced: a caller that joins another's stream gets the finished
+        page's rows. With use_cache=False (the mirror sync) nothing is kept.
+        """
+        if not stream:
+            page = await self.get_data_from_api(endpoint, params, use_cache=use_cache)
+            write(page.get("results") or [])
+            return page
+        cache = self.cache if use_cache else None
+        if cache is None:
+            return await self.stream_data_from_api(endpoint, params, on_rows=write)
+
+        cached = await cache.get(endpoint, params)
+        if cached is not None:
+            write(cached.get("results") or [])
+            return cached
+
+        # the shared stream outlives a cancelled caller, so it must stop
+        # writing into that caller's sink once the caller has gone
+        sink: List[Optional[Callable[[List[Dict[str, Any]]], None]]] = [write]
+        leader = False
+
+        async def stream_page() -> Dict:
+            nonlocal leader
+            leader = True
+            kept: List[Dict[str, Any]] = []
+
+            def tee(rows: List[Dict[str, Any]]) -> None:
+                kept.extend(rows)
+                if sink[0] is not None:
+                    sink[0](rows)
+
+            meta = await self.stream_data_from_api(endpoint, params, on_rows=tee)
+            page = {k: v for k, v in meta.items() if k != "returned"}
+            page["results"] = kept
+            await cache.set(endpoint, params, page)
+            return page
+
         try:
-            response = self.session.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-            response.encoding = "utf-8"
-            return response.json()
-        except requests.HTTPError as http_err:
-            raise MindatAPIException(
-                message="HTTP error occurred while accessing Mindat API",
-                status_code=response.status_code,
-                severity=ErrorSeverity.CRITICAL,
-                details={"error": str(http_err), "url": url, "params": params}
-            )
-        except requests.RequestException as req_err:
-            raise MindatAPIException(
-                message="Request error occurred while accessing Mindat API",
-                status_code=500,
-                severity=ErrorSeverity.CRITICAL,
-                details={"error": str(req_err), "url": url, "params": params}
-            )
+            page = await self.single_flight.do(make_cache_key(endpoint, params), stream_page)
+        finally:
+            sink[0] = None
+        if not leader:
+            write(page.get("results") or [])
+        return page
+
+    async def fetch_all(
+        self,
+        endpoint: str,
+        params: dict = None,
+        max_rows: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        use_cache: bool = True,
+    ) -> Dict:
+        """
+        Fetch every page of a list endpoint, up to max_rows.
+
+        The first page supplies `count`; the remaining offset windows are then
+        requested concurrently, at most max_workers pages from the first
+        unfinished one, so only those pages are ever held back. Rows are
+        passed to on_page in offset order as soon as they are contiguous, so
+        callers can stream rows to disk. When on_page is given each page is
+        also parsed off the wire incrementally (see stream_data_from_api and
+        _fetch_page) and the returned dict carries no rows, only the counts.
+        """
+        params = dict(params or {})
+        max_rows = max_rows or self.max_rows
+        page_size = page_size or self.page_size
+        max_workers = max_workers or self.fetch_workers
+        start = int(params.pop("offset", 0) or 0)
+        params.pop("limit", None)
+        stream = on_page is not None
+
+        collected: List[Dict[str, Any]] = []
+        emitted = 0
+
+        def emit(rows: List[Dict[str, Any]]) -> None:
+            nonlocal emitted
+            rows = rows[: max_rows - emitted]
+            if not rows:
+                return
+            emitted += len(rows)
+            if on_page is not None:
+                on_page(rows)
+            else:
+                collected.extend(rows)
+
+        first_rows = 0
+
+        def write_first(rows: List[Dict[str, Any]]) -> None:
+            nonlocal first_rows
+            first_rows += len(rows)
+            emit(rows)
+
+        first = await self._fetch_page(
+            endpoint, {**params, "limit": min(page_size, max_rows), "offset": start}, write_first, use_cache, stream
+        )
+        count = first.get("count")
+
+        total = min(count - start, max_rows) if isinstance(count, int) else first_rows
+        # The API may cap the page size below what we asked for, so step by
+        # what it actually returned to avoid leaving gaps between windows.
+        step = first_rows
+        offsets = list(range(start + step, start + total, step)) if step else []
+
+        if offsets:
+            pages = _OrderedPages(offsets, emit)
+
+            async def fetch_window(offset: int) -> None:
+                limit = min(step, start + total - offset)
+                await self._fetch_page(
+                    endpoint, {**params, "limit": limit, "offset": offset}, pages.writer(offset), use_cache, stream
+                )
+                pages.finish(offset)
+
+            # a window of max_workers pages from the head page: page
+            # head + max_workers starts only once the head page is done, so
+            # a slow head page holds back at most max_workers - 1 pages
+            window: Dict[int, "asyncio.Task[None]"] = {}
+            launched = 0
+            try:
+                for index in range(len(offsets)):
+                    while launched < min(index + max_workers, len(offsets)):
+                        window[launched] = asyncio.create_task(fetch_window(offsets[launched]))
+                        launched += 1
+                    await window.pop(index)
+            finally:
+                for task in window.values():
+                    task.cancel()
+                await asyncio.gather(*window.values(), return_exceptions=True)
+
+        return {
+            "count": count,
+            "returned": emitted,
+            "pages": len(offsets) + 1,
+            "results": collected,
+        }
+
+#####################################
+# Process-wide shared client
+#####################################
+_client: Optional[MindatAPIClient] = None
+_client_lock = threading.Lock()
+
+
+def get_mindat_client() -> MindatAPIClient:
+    """
+    Return the process-wide MindatAPIClient, creating it on first use.
+    All services share this instance so concurrent tool calls reuse one pool.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                auth = MindatAuth()
+                _client = MindatAPIClient(
+                    auth=auth,
+                    cache=build_mindat_cache(),
+                    rate_limiter=build_mindat_rate_limiter(auth.api_key),
+                )
+    return _client
+
+
+async def close_mindat_client() -> None:
+    """Close the shared client (call on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -2,6 +2,7 @@
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # Mindat API
@@ -24,7 +25,64 @@ class Settings(BaseSettings):
 
     # API limits
     request_timeout: int = Field(30, validation_alias="REQUEST_TIMEOUT")
+    connect_timeout: float = Field(5.0, validation_alias="CONNECT_TIMEOUT")
     max_retries: int = Field(3, validation_alias="MAX_RETRIES")
+    retry_backoff_base: float = Field(0.2, validation_alias="RETRY_BACKOFF_BASE")
+    retry_backoff_max: float = Field(10.0, validation_alias="RETRY_BACKOFF_MAX")
+    circuit_failure_threshold: int = Field(5, validation_alias="CIRCUIT_FAILURE_THRESHOLD")
+    circuit_reset_timeout: float = Field(30.0, validation_alias="CIRCUIT_RESET_TIMEOUT")
+
+    # Mindat HTTP connection pool (shared by every tool call in the process)
+    mindat_http2: bool = Field(False, validation_alias="MINDAT_HTTP2")
+    mindat_max_connections: int = Field(20, validation_alias="MINDAT_MAX_CONNECTIONS")
+    mindat_max_keepalive_connections: int = Field(10, validation_alias="MINDAT_MAX_KEEPALIVE_CONNECTIONS")
+    mindat_keepalive_expiry: float = Field(30.0, validation_alias="MINDAT_KEEPALIVE_EXPIRY")
+
+    # Mindat pagination (fetch_all)
+    mindat_page_size: int = Field(500, validation_alias="MINDAT_PAGE_SIZE")
+    mindat_fetch_workers: int = Field(4, validation_alias="MINDAT_FETCH_WORKERS")
+    mindat_max_rows: int = Field(5000, validation_alias="MINDAT_MAX_ROWS")
+
+    # Mindat response cache (memory -> disk -> optional Redis)
+    mindat_cache_enabled: bool = Field(True, validation_alias="MINDAT_CACHE_ENABLED")
+    mindat_cache_ttl: int = Field(3600, validation_alias="MINDAT_CACHE_TTL")
+    mindat_cache_endpoint_ttls: Dict[str, int] = Field(default_factory=dict, validation_alias="MINDAT_CACHE_ENDPOINT_TTLS")
+    mindat_cache_max_entries: int = Field(256, validation_alias="MINDAT_CACHE_MAX_ENTRIES")
+    mindat_cache_max_rows: int = Field(20_000, validation_alias="MINDAT_CACHE_MAX_ROWS")
+    mindat_cache_dir: Optional[str] = Field(None, validation_alias="MINDAT_CACHE_DIR")
+    mindat_cache_disk_bytes: int = Field(512 * 1024 * 1024, validation_alias="MINDAT_CACHE_DISK_BYTES")
+
+    # Local geomaterials mirror (SQLite under contents/mirror unless overridden)
+    mindat_mirror_enabled: bool = Field(True, validation_alias="MINDAT_MIRROR_ENABLED")
+    mindat_mirror_path: Optional[str] = Field(None, validation_alias="MINDAT_MIRROR_PATH")
+    mindat_mirror_max_rows: int = Field(100000, validation_alias="MINDAT_MIRROR_MAX_ROWS")
+    # seconds between background incremental syncs (0 = CLI only) and the
+    # age after which the mirror is not used (0 = never too old)
+    mindat_mirror_refresh: float = Field(24 * 3600, validation_alias="MINDAT_MIRROR_REFRESH")
+    mindat_mirror_max_age: float = Field(7 * 24 * 3600, validation_alias="MINDAT_MIRROR_MAX_AGE")
+
+    # Saved tool datasets (content-addressed under contents/sample_data);
+    # a repeated query reuses its dataset for this many seconds (<= 0 disables)
+    dataset_reuse_ttl: float = Field(3600, validation_alias="DATASET_REUSE_TTL")
+
+    # contents/ artifact retention: least recently used datasets and plots are
+    # deleted above the quota (pinned ones are kept); sweep interval <= 0 disables
+    artifact_quota_bytes: int = Field(512 * 1024 * 1024, validation_alias="ARTIFACT_QUOTA_BYTES")
+    artifact_sweep_interval: float = Field(600, validation_alias="ARTIFACT_SWEEP_INTERVAL")
+    artifact_index_path: Optional[str] = Field(None, validation_alias="ARTIFACT_INDEX_PATH")
+
+    # Reference/lookup tables (snapshot under contents/reference unless overridden)
+    mindat_reference_enabled: bool = Field(True, validation_alias="MINDAT_REFERENCE_ENABLED")
+    mindat_reference_snapshot: Optional[str] = Field(None, validation_alias="MINDAT_REFERENCE_SNAPSHOT")
+    mindat_reference_refresh: float = Field(24 * 3600, validation_alias="MINDAT_REFERENCE_REFRESH")
+
+    # Client-side Mindat rate limit, per API key (<= 0 disables it)
+    mindat_rate_limit: float = Field(5.0, validation_alias="MINDAT_RATE_LIMIT")
+    mindat_rate_burst: int = Field(10, validation_alias="MINDAT_RATE_BURST")
+    mindat_rate_max_wait: float = Field(15.0, validation_alias="MINDAT_RATE_MAX_WAIT")
+
+    # Shared Redis (cache tier and rate-limit bucket shared by the backend and the MCP server)
+    redis_url: Optional[str] = Field(None, validation_alias="REDIS_URL")
 
     # Pydantic v2 config
     model_config = SettingsConfigDict(
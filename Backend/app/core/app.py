@@ -1,6 +1,7 @@
 # Backend/app/core/app.py
 import os
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 
 from app.routers import( 
@@ -11,9 +12,23 @@ from app.routers import(
     plots_router,
     sessions_router,
     user_router,
-    profile_router
+    profile_router,
+    datasets_router
     )
 from app.utils import MindatAPIException
+from app.config.mindat_config import close_mindat_client
+from app.services import start_reference_data, stop_reference_data, start_artifact_sweeper, stop_artifact_sweeper
+from app.services.artifact_store import get_artifact_manager
+
+
+class ContentsStaticFiles(StaticFiles):
+    """Static /contents mount that records each served file as used, for LRU eviction"""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            await run_in_threadpool(get_artifact_manager().touch, [os.path.join(self.directory, path)])
+        return response
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI app"""
@@ -28,13 +43,17 @@ def create_app() -> FastAPI:
     APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     CONTENTS_DIR = os.path.join(APP_DIR, "contents")
     
+    # Saved datasets are served (and their JSON generated on demand) by a
+    # route that has to be registered before the static mount below
+    app.include_router(datasets_router)
+
     # Mount contents directory to serve plots and data files (if it exists)
     if os.path.exists(CONTENTS_DIR):
-        app.mount("/contents", StaticFiles(directory=CONTENTS_DIR), name="contents")
+        app.mount("/contents", ContentsStaticFiles(directory=CONTENTS_DIR), name="contents")
     else:
         # Create the directory if it doesn't exist
         os.makedirs(CONTENTS_DIR, exist_ok=True)
-        app.mount("/contents", StaticFiles(directory=CONTENTS_DIR), name="contents")
+        app.mount("/contents", ContentsStaticFiles(directory=CONTENTS_DIR), name="contents")
     
     # Include routers
     app.include_router(default_router)
@@ -46,6 +65,16 @@ def create_app() -> FastAPI:
     app.include_router(plots_router, prefix="/api")
     app.include_router(sessions_router)
 
+    # Preload the Mindat lookup tables and keep them fresh in the background
+    app.add_event_handler("startup", start_reference_data)
+    app.add_event_handler("shutdown", stop_reference_data)
+
+    # Keep contents/ under its byte quota (LRU eviction of unpinned artifacts)
+    app.add_event_handler("startup", start_artifact_sweeper)
+    app.add_event_handler("shutdown", stop_artifact_sweeper)
+
+    # Release the shared Mindat connection pool on shutdown
+    app.add_event_handler("shutdown", close_mindat_client)
     
     # Exception handlers
     @app.exception_handler(MindatAPIException)
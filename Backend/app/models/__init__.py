@@ -1,5 +1,6 @@
 from app.models.mindat_query import (
     MindatGeoMaterialQuery, 
+    MindatGeomaterialFilters, 
     MindatGeomaterialInput, 
     MindatLocalityQuery, 
     MindatLocalityInput
@@ -26,6 +27,7 @@ from app.models.agent_models import (
 from app.models.tool_response_models import (
     GeomaterialToolResponse, 
     LocalityToolResponse, 
+    AggregateToolResponse,
     HistogramToolResponse, 
     ProfileToolResponse, 
     ProfileToolArgs
@@ -46,6 +48,7 @@ from app.models.user_models import (
 
 __all__ = [
     "MindatGeoMaterialQuery", 
+    "MindatGeomaterialFilters", 
     "MindatGeomaterialInput", 
     "MindatLocalityQuery", 
     "MindatLocalityInput",
@@ -64,6 +67,7 @@ __all__ = [
     "VegaAgentOutput",
     "GeomaterialToolResponse", 
     "LocalityToolResponse", 
+    "AggregateToolResponse",
     "HistogramToolResponse", 
     "ProfileToolResponse", 
     "ProfileToolArgs",
@@ -25,6 +25,7 @@ class MindatGeoMaterialQuery(BaseModel):
             "el_inc": ["Fe", "O", "Si"],
             "entrytype": [0, 1],
             "expand" : ["locality"]
+            "fields": ["id", "name", "hmin", "hmax"],
             "fracturetype": ["Conchoidal"],
             "hardness_max": 7.0,
             "hardness_min": 5.0,
@@ -175,6 +176,12 @@ class MindatGeoMaterialQuery(BaseModel):
         "malleable", "sectile", "very brittle", "waxy"
     ]]] = Field(None, description="Tenacity: multiple choice (AND).")
 
+    # Projection
+    fields: Optional[List[str]] = Field(
+        None,
+        description="Return only these record fields, comma separated in the API call (e.g. id,name,hmin)."
+    )
+
     # Pagination
     limit: Optional[int] = Field(default=100, description="Maximum number of results to return (default: 100).")
     offset: Optional[int] = Field(default=0, description="Number of results to skip for pagination (default: 0).")
@@ -184,6 +191,14 @@ class MindatGeoMaterialQuery(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class MindatGeomaterialFilters(MindatGeoMaterialQuery):
+    """
+    Filters for aggregate_geomaterials. Unknown keys are rejected rather
+    than silently dropped, since a misspelled filter would change the counts.
+    """
+    model_config = ConfigDict(populate_by_name=True, extra="forbid")
+
+
 class MindatGeomaterialInput(BaseModel):
     query: MindatGeoMaterialQuery = Field(description="""
         Example dictionary including all possible keys (all keys are optional):
@@ -201,6 +216,7 @@ class MindatGeomaterialInput(BaseModel):
             "el_inc": ["Fe", "O", "Si"],
             "entrytype": [0, 1],
             "expand" : ["locality"]
+            "fields": ["id", "name", "hmin", "hmax"],
             "fracturetype": ["Conchoidal"],
             "hardness_max": 7.0,
             "hardness_min": 5.0,
@@ -243,9 +259,9 @@ class MindatLocalityQuery(BaseModel):
     Pydantic model for the query parameters of the Mindat API /v1/localities/ endpoint.
     This model encapsulates the parameters used to filter locality data.
     """
-    country: Optional[str] = Field(
+    country: Optional[Union[str, List[str]]] = Field(
         None, 
-        description="Country or top level parent name (e.g. Brazil). Full list of options available in the API docs."
+        description="Country or top level parent name (e.g. Brazil), or a list of them to query concurrently. Full list of options available in the API docs."
     )
     description: Optional[str] = Field(
         None, 
@@ -260,6 +276,12 @@ class MindatLocalityQuery(BaseModel):
         description="Include chemical elements (e.g. 'Au,Ag'), comma separated string."
     )
     
+    # Projection
+    fields: Optional[List[str]] = Field(
+        None,
+        description="Return only these record fields, comma separated in the API call (e.g. id,txt,country,latitude,longitude)."
+    )
+
     # Pagination
     limit: Optional[int] = Field(default=100, description="Maximum number of results to return (default: 100).")
     offset: Optional[int] = Field(default=0, description="Number of results to skip for pagination (default: 0).")
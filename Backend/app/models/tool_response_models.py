@@ -7,6 +7,7 @@ class GeomaterialToolResponse(BaseModel):
     status: Literal["OK", "ERROR"] = Field(..., description="The status of the operation")
     error: Optional[str] = Field(None, description="Detailed error message if status is ERROR")
     file_path: Optional[str] = Field("", description="The path where the JSON data was saved")
+    dataset_id: Optional[str] = Field(None, description="Content-addressed id of the saved dataset")
 
 
 
@@ -15,7 +16,25 @@ class LocalityToolResponse(BaseModel):
     status: Literal["OK", "ERROR"] = Field(..., description="Operation status. 'OK' if successful, 'ERROR' if something went wrong.")
     error: Optional[str] = Field(None, description="Detailed error message; null if status is OK.")
     file_path: str = Field(default="", description="The local file system path where the locality results are stored as JSON.")
+    dataset_id: Optional[str] = Field(None, description="Content-addressed id of the saved dataset")
     count: int = Field(default=0, description="The number of locality records successfully retrieved.")
+    country_counts: Dict[str, int] = Field(default_factory=dict, description="Records retrieved per queried country.")
+    failed_countries: Dict[str, str] = Field(default_factory=dict, description="Countries whose fetch failed, with the error.")
+    total_count: Optional[int] = Field(None, description="Localities Mindat reports for the query, across all queried countries.")
+    truncated: bool = Field(default=False, description="True if fewer localities were fetched than Mindat has (limit / max_rows reached).")
+    warning: Optional[str] = Field(None, description="Caveat about the result, e.g. a spatial filter that only saw part of the country.")
+
+
+class AggregateToolResponse(BaseModel):
+    """Structured response for the geomaterial aggregation tool"""
+    status: Literal["OK", "ERROR"] = Field(..., description="Operation status")
+    error: Optional[str] = Field(None, description="Detailed error message; null if status is OK.")
+    file_path: str = Field(default="", description="Path of the saved {group_by, count} rows")
+    dataset_id: Optional[str] = Field(None, description="Content-addressed id of the saved dataset")
+    group_by: Optional[str] = Field(None, description="The property the counts are grouped by")
+    total: int = Field(default=0, description="Number of geomaterials matching the filters")
+    counts: Dict[str, int] = Field(default_factory=dict, description="Geomaterial count per group value")
+    source: Optional[str] = Field(None, description="'mirror' or 'api'")
 
 
 class HistogramToolResponse(BaseModel):
@@ -6,5 +6,6 @@ from .plots import router as plots_router
 from .sessions import router as sessions_router
 from .user import router as user_router
 from .profile import router as profile_router
+from .datasets import router as datasets_router
 
-__all__ = ["default_router", "mindat_router", "agent_router", "auth_router", "plots_router", "sessions_router", "user_router", "profile_router"]
\ No newline at end of file
+__all__ = ["default_router", "mindat_router", "agent_router", "auth_router", "plots_router", "sessions_router", "user_router", "profile_router", "datasets_router"]
\ No newline at end of file
@@ -15,7 +15,9 @@ from app.database import get_db
 from app.dependencies import get_current_user
 from app.schema.chat import Session as SessionModel, Message as MessageModel
 from app.schema.user import User
-import json as _json
+from app.services.artifact_store import get_artifact_manager
+from app.utils.dataset_io import read_rows
+from app.utils.serialization import dumps
 
 # Create router instance
 router = APIRouter(prefix="/agent", tags=["agent"])
@@ -94,7 +96,7 @@ async def _build_validation_message(validation: Dict[str, Any]) -> str:
             SystemMessage(content=VALIDATION_RESPONSE_SYSTEM_PROMPT.strip()),
             HumanMessage(content=(
                 "Write the response for this validation result:\n"
-                f"{_json.dumps(prompt_payload, ensure_ascii=False)}"
+                f"{dumps(prompt_payload)}"
             )),
         ])
         content = getattr(msg, "content", "").strip()
@@ -129,7 +131,7 @@ def _build_message_metadata(
         meta["image"] = plot_url
     if not meta:
         return None
-    return _json.dumps(meta, default=str)
+    return dumps(meta, default=str)
 
 
 def _output_type_for_message(
@@ -356,9 +358,8 @@ async def chat_with_agent(
     result_data_rows = []
     try:
         if sample_data_path:
-            with open(sample_data_path, "r", encoding="utf-8") as f:
-                raw = _json.load(f)
-            result_data_rows = raw.get("results", []) if isinstance(raw, dict) else raw
+            result_data_rows = read_rows(sample_data_path)
+            get_artifact_manager().touch([sample_data_path])
             sample_data = result_data_rows[:100]
     except Exception as e:
         print(f"Error reading sample data file at {sample_data_path}: {e}")
@@ -396,6 +397,8 @@ async def chat_with_agent(
         )
     )
     db.commit()
+    # the saved message refers to these files, so they must survive eviction
+    get_artifact_manager().pin([url for url in (data_url, plot_url) if url])
 
     return AgentQueryResponse(
         success=True,
@@ -0,0 +1,31 @@
+# Backend/app/routers/datasets.py
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from app.services.artifact_store import get_artifact_manager
+from app.utils.dataset_io import ensure_json
+from app.utils.helpers import CONTENTS_DIR
+
+
+router = APIRouter(prefix="/contents/sample_data", tags=["datasets"])
+
+
+@router.get("/{file_name}")
+async def download_dataset(file_name: str):
+    """
+    Serve a saved dataset as JSON. Collectors only write the columnar copy;
+    the JSON file is generated here the first time it is downloaded.
+    Registered ahead of the /contents static mount, which it shadows for
+    sample_data.
+    """
+    if Path(file_name).name != file_name or not file_name.endswith(".json"):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    try:
+        path = await run_in_threadpool(ensure_json, CONTENTS_DIR / "sample_data" / file_name)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    await run_in_threadpool(get_artifact_manager().register, path)
+    return FileResponse(path, media_type="application/json", filename=file_name)
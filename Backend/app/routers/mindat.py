@@ -1,6 +1,7 @@
 # Backend/app/routers/mindat.py
 from fastapi import APIRouter, Query, HTTPException
-from app.services import get_geomaterial_api
+from app.services import get_geomaterial_api, get_geomaterial_mirror, get_reference_data
+from app.config.mindat_config import get_mindat_client
 from app.utils.custom_message import MindatAPIException
 from app.models import MindatGeomaterialInput
 
@@ -15,7 +16,7 @@ async def search_geomaterials(
     try:
         geo_api = get_geomaterial_api()
         test_params = {"ima": ima}
-        response = geo_api.search_geomaterials_minerals(test_params)
+        response = await geo_api.search_geomaterials_minerals(test_params)
         
         return {
             "success": True,
@@ -28,3 +29,54 @@ async def search_geomaterials(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+
+
+@router.get("/stats")
+async def mindat_client_stats():
+    """Cache, coalescing, retry, circuit-breaker and rate-limit counters for the shared Mindat client"""
+    return get_mindat_client().stats()
+
+
+@router.get("/cache/stats")
+async def mindat_cache_stats():
+    """Hit/miss/eviction counters for the Mindat response cache"""
+    cache = get_mindat_client().cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/mirror/stats")
+async def mindat_mirror_stats():
+    """Size and local-hit counters of the geomaterials mirror"""
+    return get_geomaterial_mirror().stats()
+
+
+@router.get("/mirror/elements")
+async def mindat_mirror_elements(
+    elements: str = Query(None, description="Comma-separated element symbols to restrict the co-occurrence matrix to"),
+):
+    """Element counts and co-occurrence matrix over the geomaterials mirror"""
+    symbols = [s.strip() for s in elements.split(",") if s.strip()] if elements else None
+    result = get_geomaterial_mirror().element_cooccurrence(elements=symbols)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Geomaterials mirror is empty; run a sync first")
+    return result
+
+
+@router.get("/reference/stats")
+async def mindat_reference_stats():
+    """Loaded lookup tables, their age and refresh counters"""
+    return get_reference_data().stats()
+
+
+@router.get("/reference/{table}/{ref_id}")
+async def mindat_reference_lookup(table: str, ref_id: int):
+    """Resolve one id in a preloaded lookup table (e.g. /reference/spacegroups/12)"""
+    reference = get_reference_data().table(table)
+    if reference is None:
+        raise HTTPException(status_code=404, detail=f"Reference table {table!r} is not loaded")
+    row = reference.get(ref_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"No {table} entry with id {ref_id}")
+    return {"id": ref_id, "label": reference.label(ref_id), "record": row}
@@ -2,7 +2,8 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from fastapi.responses import FileResponse, StreamingResponse
 from app.models.visualization import EmailPlotRequest, PlotActionResponse, DownloadRequest
-from app.services.plots_services import get_plot_path, convert_to_pdf, send_email_with_attachment, PLOTS_DIR
+from app.services.artifact_store import get_artifact_manager
+from app.services.plots_services import get_plot_path, convert_to_pdf, send_email_with_attachment
 
 
 router = APIRouter(prefix="/plots", tags=["plots"])
@@ -23,6 +24,7 @@ async def download_plot(file_name: str, format: str = "png"):
         FileResponse with the requested file
     """
     file_path = get_plot_path(file_name)
+    get_artifact_manager().touch([file_path])
     
     # If requesting PDF conversion
     if format.lower() == "pdf":
@@ -66,6 +68,7 @@ async def email_plot(request: EmailPlotRequest, background_tasks: BackgroundTask
     """
     try:
         file_path = get_plot_path(request.file_name)
+        get_artifact_manager().touch([file_path])
         
         # Add email sending to background tasks
         background_tasks.add_task(
@@ -100,27 +103,24 @@ async def email_plot(request: EmailPlotRequest, background_tasks: BackgroundTask
 async def list_plots():
     """
     List all available plot files.
+    Served from the artifact index, not a directory scan.
     
     Returns:
         List of plot file names with metadata
     """
     try:
-        if not PLOTS_DIR.exists():
-            return {"plots": []}
+        plots = [
+            {
+                "name": entry["name"],
+                "size": entry["size"],
+                "created": entry["created"],
+                "type": entry["name"].rsplit(".", 1)[-1],
+                "url": f"/contents/{entry['path']}"
+            }
+            for entry in get_artifact_manager().list("plots", suffixes=(".png", ".html"))
+        ]
         
-        plots = []
-        for file_path in PLOTS_DIR.glob("*"):
-            if file_path.is_file() and file_path.suffix in ['.png', '.html']:
-                stat = file_path.stat()
-                plots.append({
-                    "name": file_path.name,
-                    "size": stat.st_size,
-                    "created": stat.st_ctime,
-                    "type": file_path.suffix[1:],  # Remove the dot
-                    "url": f"/contents/plots/{file_path.name}"
-                })
-        
-        return {"plots": sorted(plots, key=lambda x: x['created'], reverse=True)}
+        return {"plots": plots}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing plots: {str(e)}")
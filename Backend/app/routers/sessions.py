@@ -11,7 +11,8 @@ from pydantic import BaseModel
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
-import json
+from app.services.artifact_store import get_artifact_manager, message_artifacts
+from app.utils.serialization import dumps, loads
 
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
 
@@ -107,7 +108,7 @@ async def get_messages(
     for msg in messages:
         if msg.meta_data:
             try:
-                msg.meta_data = json.loads(msg.meta_data)
+                msg.meta_data = loads(msg.meta_data)
             except:
                 msg.meta_data = {}
     
@@ -135,7 +136,7 @@ async def save_message(
         )
     
     # Convert meta_data dict to JSON string
-    meta_data_str = json.dumps(request.meta_data) if request.meta_data else None
+    meta_data_str = dumps(request.meta_data) if request.meta_data else None
     
     new_message = Message(
         session_id=session_id,
@@ -149,11 +150,12 @@ async def save_message(
     db.add(new_message)
     db.commit()
     db.refresh(new_message)
+    get_artifact_manager().pin(message_artifacts(request.meta_data))
     
     # Parse meta_data for response
     if new_message.meta_data:
         try:
-            new_message.meta_data = json.loads(new_message.meta_data)
+            new_message.meta_data = loads(new_message.meta_data)
         except:
             new_message.meta_data = {}
     
@@ -178,8 +180,17 @@ async def delete_session(
             detail="Session not found"
         )
     
+    # release the datasets/plots this session's messages kept pinned
+    artifacts = []
+    for msg in db.query(Message).filter(Message.session_id == session_id).all():
+        try:
+            artifacts.extend(message_artifacts(loads(msg.meta_data)) if msg.meta_data else [])
+        except ValueError:
+            continue
+
     db.delete(session)
     db.commit()
+    get_artifact_manager().unpin(artifacts)
     
     return {"message": "Session deleted successfully"}
 
@@ -1,9 +1,38 @@
-from .mindat_endpoints_services import GeomaterialAPI, get_geomaterial_api
+from .mindat_endpoints_services import GeomaterialAPI, get_geomaterial_api, LocalityAPI, get_locality_api
+from .artifact_store import ArtifactManager, get_artifact_manager, start_artifact_sweeper, stop_artifact_sweeper
+from .dataset_store import DatasetStore, get_dataset_store
+from .element_index import ElementIndex
+from .geomaterial_mirror import GeomaterialMirror, get_geomaterial_mirror, start_geomaterial_mirror, stop_geomaterial_mirror
+from .geomaterial_aggregates import count_geomaterials_by
+from .locality_join import join_mineral_localities
+from .spatial_index import GridIndex, spatial_filter
+from .reference_data import ReferenceDataService, get_reference_data, start_reference_data, stop_reference_data
 from .plots_services import PLOTS_DIR, get_plot_path, convert_to_pdf, send_email_with_attachment
 
 __all__ = [
     "GeomaterialAPI", 
     "get_geomaterial_api", 
+    "LocalityAPI",
+    "get_locality_api",
+    "ArtifactManager",
+    "get_artifact_manager",
+    "start_artifact_sweeper",
+    "stop_artifact_sweeper",
+    "DatasetStore",
+    "get_dataset_store",
+    "ElementIndex",
+    "GeomaterialMirror",
+    "get_geomaterial_mirror",
+    "start_geomaterial_mirror",
+    "stop_geomaterial_mirror",
+    "count_geomaterials_by",
+    "join_mineral_localities",
+    "GridIndex",
+    "spatial_filter",
+    "ReferenceDataService",
+    "get_reference_data",
+    "start_reference_data",
+    "stop_reference_data",
     "PLOTS_DIR", 
     "get_plot_path",
     "convert_to_pdf",
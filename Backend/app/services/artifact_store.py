@@ -0,0 +1,372 @@
+# Backend/app/services/artifact_store.py
+# Index, LRU quota and garbage collection for generated files under contents/
+#
+# Run one sweep by hand:  python -m app.services.artifact_store
+import asyncio
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from app.config.settings import settings
+from app.utils.helpers import CONTENTS_DIR
+
+
+# contents/ subdirectories whose entries are managed artifacts
+ARTIFACT_AREAS = ("sample_data", "plots")
+
+# Leftover temp files/dirs from interrupted writes are removed after this long
+TEMP_MAX_AGE = 3600
+
+# Dataset alias files (see dataset_store) live here inside sample_data
+ALIAS_DIR = ".queries"
+
+
+def _size(path: Path) -> int:
+    """Bytes used by a file, or by every file inside a directory artifact"""
+    if path.is_dir():
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return path.stat().st_size
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+class ArtifactManager:
+    """
+    SQLite index of the datasets and plots under contents/.
+
+    Every artifact (a file, or a dataset's .columns directory) has its size,
+    creation and last-access time. Artifacts sharing a stem, e.g. a dataset's
+    .columns and .json, form one group, and a group referenced by a saved
+    chat message is pinned. sweep() deletes leftover temp files, then evicts
+    the least recently used unpinned artifacts until the total fits the byte
+    quota. The index is shared by the API and MCP server processes.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        quota_bytes: int,
+        sweep_interval: float = 600,
+        index_path: Optional[Path] = None,
+        areas: Sequence[str] = ARTIFACT_AREAS,
+    ):
+        self.root = Path(root)
+        self.quota_bytes = quota_bytes
+        self.sweep_interval = sweep_interval
+        self.index_path = Path(index_path) if index_path else self.root / ".artifacts.sqlite"
+        self.areas = tuple(areas)
+        self._task: Optional[asyncio.Task] = None
+        self.sweeps = 0
+        self.evicted = 0
+        self.last_sweep: Optional[Dict[str, Any]] = None
+
+    # ---------- storage ----------
+    def _connect(self) -> sqlite3.Connection:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "path TEXT PRIMARY KEY, area TEXT NOT NULL, grp TEXT NOT NULL, "
+            "size INTEGER NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS artifacts_area ON artifacts (area, created)")
+        conn.execute("CREATE TABLE IF NOT EXISTS pins (grp TEXT PRIMARY KEY, refs INTEGER NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS scans (area TEXT PRIMARY KEY, mtime REAL NOT NULL)")
+        return conn
+
+    def _rel(self, path: Union[str, Path]) -> Optional[str]:
+        """
+        contents-relative path of the artifact an absolute path or a
+        /contents/... URL belongs to; a file inside a directory artifact
+        (e.g. a profile in a dataset's .columns) maps to that directory
+        """
+        text = str(path)
+        if "/contents/" in text:
+            text = text.split("/contents/")[-1]
+        else:
+            try:
+                text = str(Path(text).resolve().relative_to(self.root.resolve()))
+            except ValueError:
+                return None
+        parts = text.split("/")
+        if len(parts) < 2 or parts[0] not in self.areas or not parts[1]:
+            return None
+        return f"{parts[0]}/{parts[1]}"
+
+    @staticmethod
+    def _group(rel: str) -> str:
+        head, _, name = rel.rpartition("/")
+        return f"{head}/{name.split('.', 1)[0]}"
+
+    # ---------- recording ----------
+    def register(self, path: Union[str, Path]) -> None:
+        """Add (or refresh) an artifact that was just written"""
+        rel = self._rel(path)
+        if rel is None:
+            return
+        full = self.root / rel
+        if not full.exists():
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO artifacts (path, area, grp, size, created, last_access) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET size = excluded.size, last_access = excluded.last_access",
+                    (rel, rel.split("/", 1)[0], self._group(rel), _size(full), full.stat().st_ctime, now),
+                )
+        finally:
+            conn.close()
+
+    def touch(self, paths: Iterable[Union[str, Path]]) -> None:
+        """Mark artifacts (and the rest of their groups) as just used"""
+        groups = {self._group(rel) for rel in map(self._rel, paths) if rel}
+        if not groups:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE artifacts SET last_access = ? WHERE grp = ?",
+                    [(time.time(), grp) for grp in groups],
+                )
+        finally:
+            conn.close()
+
+    def pin(self, paths: Iterable[Union[str, Path]], delta: int = 1) -> None:
+        """Add a reference (delta=-1 removes one) to each artifact's group"""
+        groups = [self._group(rel) for rel in map(self._rel, paths) if rel]
+        if not groups:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                for grp in groups:
+                    conn.execute(
+                        "INSERT INTO pins (grp, refs) VALUES (?, ?) "
+                        "ON CONFLICT(grp) DO UPDATE SET refs = refs + excluded.refs",
+                        (grp, delta),
+                    )
+                conn.execute("DELETE FROM pins WHERE refs <= 0")
+        finally:
+            conn.close()
+
+    def unpin(self, paths: Iterable[Union[str, Path]]) -> None:
+        self.pin(paths, delta=-1)
+
+    # ---------- index maintenance ----------
+    def reconcile(self, areas: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Bring the index in line with the directories (new files added, vanished ones dropped)"""
+        added = removed = 0
+        conn = self._connect()
+        try:
+            with conn:
+                for area in areas or self.areas:
+                    directory = self.root / area
+                    if not directory.exists():
+                        removed += conn.execute("DELETE FROM artifacts WHERE area = ?", (area,)).rowcount
+                        continue
+                    mtime = directory.stat().st_mtime
+                    known = {row[0] for row in conn.execute("SELECT path FROM artifacts WHERE area = ?", (area,))}
+                    on_disk = set()
+                    now = time.time()
+                    for entry in os.scandir(directory):
+                        if entry.name.startswith("."):
+                            continue
+                        rel = f"{area}/{entry.name}"
+                        on_disk.add(rel)
+                        if rel not in known:
+                            path = Path(entry.path)
+                            conn.execute(
+                                "INSERT OR IGNORE INTO artifacts (path, area, grp, size, created, last_access) "
+                                "VALUES (?, ?, ?, ?, ?, ?)",
+                                (rel, area, self._group(rel), _size(path), entry.stat().st_ctime, now),
+                            )
+                            added += 1
+                    gone = known - on_disk
+                    conn.executemany("DELETE FROM artifacts WHERE path = ?", [(rel,) for rel in gone])
+                    removed += len(gone)
+                    conn.execute("INSERT OR REPLACE INTO scans (area, mtime) VALUES (?, ?)", (area, mtime))
+        finally:
+            conn.close()
+        return {"added": added, "removed": removed}
+
+    def list(self, area: str, suffixes: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Artifacts in an area, newest first, straight from the index. The
+        directory is only rescanned when its mtime shows files were added or
+        removed since the last scan.
+        """
+        directory = self.root / area
+        conn = self._connect()
+        try:
+            scanned = conn.execute("SELECT mtime FROM scans WHERE area = ?", (area,)).fetchone()
+            current = directory.stat().st_mtime if directory.exists() else 0.0
+            if scanned is None or scanned[0] != current:
+                conn.close()
+                self.reconcile([area])
+                conn = self._connect()
+            rows = conn.execute(
+                "SELECT path, size, created, last_access FROM artifacts WHERE area = ? ORDER BY created DESC",
+                (area,),
+            ).fetchall()
+        finally:
+            conn.close()
+        entries = [
+            {"path": path, "name": path.split("/", 1)[1], "size": size, "created": created, "last_access": last_access}
+            for path, size, created, last_access in rows
+        ]
+        if suffixes:
+            entries = [e for e in entries if Path(e["name"]).suffix in suffixes]
+        return entries
+
+    # ---------- garbage collection ----------
+    def _purge_temp(self) -> int:
+        """Delete abandoned temp files and expired dataset aliases"""
+        removed = 0
+        cutoff = time.time() - TEMP_MAX_AGE
+        for area in self.areas:
+            directory = self.root / area
+            if not directory.exists():
+                continue
+            for entry in os.scandir(directory):
+                if entry.name.startswith(".") and entry.name.endswith((".tmp", ".pending")):
+                    if entry.stat().st_mtime < cutoff:
+                        _remove(Path(entry.path))
+                        removed += 1
+        aliases = self.root / "sample_data" / ALIAS_DIR
+        if aliases.exists() and settings.dataset_reuse_ttl > 0:
+            alias_cutoff = time.time() - settings.dataset_reuse_ttl
+            for entry in os.scandir(aliases):
+                if entry.stat().st_mtime < alias_cutoff:
+                    Path(entry.path).unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+    def evict(self) -> Dict[str, Any]:
+        """Delete least recently used unpinned artifacts until the total fits the quota"""
+        conn = self._connect()
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+            if total <= self.quota_bytes:
+                return {"total_bytes": total, "evicted": 0, "freed_bytes": 0}
+            candidates = conn.execute(
+                "SELECT path, size FROM artifacts WHERE grp NOT IN (SELECT grp FROM pins) "
+                "ORDER BY last_access ASC"
+            ).fetchall()
+            evicted = freed = 0
+            with conn:
+                for rel, size in candidates:
+                    if total <= self.quota_bytes:
+                        break
+                    _remove(self.root / rel)
+                    conn.execute("DELETE FROM artifacts WHERE path = ?", (rel,))
+                    total -= size
+                    freed += size
+                    evicted += 1
+        finally:
+            conn.close()
+        self.evicted += evicted
+        return {"total_bytes": total, "evicted": evicted, "freed_bytes": freed}
+
+    def sweep(self) -> Dict[str, Any]:
+        """One full pass: purge temp files, rescan, evict over quota"""
+        summary = {"temp_removed": self._purge_temp(), **self.reconcile(), **self.evict()}
+        self.sweeps += 1
+        self.last_sweep = {**summary, "at": time.time()}
+        return summary
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                summary = await asyncio.to_thread(self.sweep)
+                if summary["evicted"] or summary["temp_removed"]:
+                    print(f"[Artifacts] Sweep: {summary}")
+            except Exception as e:
+                print(f"[Artifacts] Sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def start(self) -> None:
+        """Start the background sweeper (startup hook)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        """Stop the background sweeper (shutdown hook)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            by_area = {
+                area: {"artifacts": count, "bytes": size}
+                for area, count, size in conn.execute(
+                    "SELECT area, COUNT(*), COALESCE(SUM(size), 0) FROM artifacts GROUP BY area"
+                )
+            }
+            pinned = conn.execute("SELECT COUNT(*) FROM pins").fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            "quota_bytes": self.quota_bytes,
+            "areas": by_area,
+            "pinned_groups": pinned,
+            "sweeps": self.sweeps,
+            "evicted": self.evicted,
+            "last_sweep": self.last_sweep,
+            "background_sweep": self._task is not None and not self._task.done(),
+        }
+
+
+def message_artifacts(meta: Optional[Dict[str, Any]]) -> List[str]:
+    """contents URLs a chat message's metadata refers to"""
+    if not isinstance(meta, dict):
+        return []
+    urls = {meta.get(key) for key in ("data_file_path", "plot_file_path", "image")}
+    return [url for url in urls if isinstance(url, str) and url]
+
+
+_artifact_manager: Optional[ArtifactManager] = None
+
+
+def get_artifact_manager() -> ArtifactManager:
+    """Process-wide artifact manager"""
+    global _artifact_manager
+    if _artifact_manager is None:
+        _artifact_manager = ArtifactManager(
+            CONTENTS_DIR,
+            quota_bytes=settings.artifact_quota_bytes,
+            sweep_interval=settings.artifact_sweep_interval,
+            index_path=settings.artifact_index_path,
+        )
+    return _artifact_manager
+
+
+async def start_artifact_sweeper() -> None:
+    if settings.artifact_sweep_interval > 0:
+        await get_artifact_manager().start()
+
+
+async def stop_artifact_sweeper() -> None:
+    if _artifact_manager is not None:
+        await _artifact_manager.stop()
+
+
+if __name__ == "__main__":
+    print(get_artifact_manager().sweep())
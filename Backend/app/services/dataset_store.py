@@ -0,0 +1,175 @@
+# Backend/app/services/dataset_store.py
+# Content-addressed store for collected datasets (contents/sample_data)
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.config.settings import settings
+from app.services.artifact_store import get_artifact_manager
+from app.utils.columnar import CONTENT_KEY, SCHEMA_FILE, ColumnarWriter, columnar_path
+from app.utils.helpers import CONTENTS_DIR
+from app.utils.projection import project_rows
+from app.utils.serialization import dump_file, dumps_bytes, load_file
+
+
+# hex digits of the content hash kept in a dataset id
+_ID_DIGITS = 24
+
+
+def canonical_query(kind: str, query: Dict[str, Any]) -> bytes:
+    """Stable bytes for a query: keys sorted, list values as given, no None values"""
+    cleaned = {k: v for k, v in sorted(query.items()) if v is not None}
+    return dumps_bytes({"kind": kind, "query": cleaned})
+
+
+class DatasetWriter:
+    """
+    Collects a result as a columnar dataset (see ColumnarWriter) while
+    hashing the canonical query plus the JSON bytes of every row, and on
+    success publishes it as <kind>-<hash>.columns. A dataset already on
+    disk under that id is kept and the new copy dropped.
+
+    `path` is the dataset's JSON name (<kind>-<hash>.json), which the tools
+    hand on as file_path; that file is only generated when it is downloaded
+    (ensure_json), readers go through read_rows / ColumnarDataset.
+    `enrich` runs on each batch after projection (e.g. reference labels).
+    """
+
+    def __init__(
+        self,
+        store: "DatasetStore",
+        kind: str,
+        query_bytes: bytes,
+        fields: Optional[Sequence[str]] = None,
+        enrich: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+    ):
+        self.store = store
+        self.kind = kind
+        self.query_bytes = query_bytes
+        self.fields = fields
+        self.enrich = enrich
+        self.rows_written = 0
+        self.count: Optional[int] = None
+        # extra summary saved with the dataset and returned again on reuse
+        self.meta: Dict[str, Any] = {}
+        self.path: Optional[Path] = None
+        self.dataset_id: Optional[str] = None
+        self._hash = hashlib.sha256(query_bytes)
+        self._columns = ColumnarWriter(store.root / f".{kind}-{uuid.uuid4().hex}.pending")
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        rows = project_rows(rows, self.fields)
+        if self.enrich is not None:
+            rows = self.enrich(rows)
+        for row in rows:
+            self._hash.update(dumps_bytes(row))
+        self._columns.write_rows(rows)
+        self.rows_written += len(rows)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._columns.abort()
+            return
+        self._hash.update(dumps_bytes({"count": self.count}))
+        content_key = self._hash.hexdigest()
+        self.dataset_id = f"{self.kind}-{content_key[:_ID_DIGITS]}"
+        self.path = self.store.path(self.dataset_id)
+        directory = columnar_path(self.path)
+        if (directory / SCHEMA_FILE).exists():
+            # identical query and response: reuse the published dataset
+            self._columns.abort()
+            os.utime(directory)
+        else:
+            count = self.count if self.count is not None else self.rows_written
+            self._columns.directory = directory
+            self._columns.close({**self.meta, "count": count, "returned": self.rows_written, CONTENT_KEY: content_key})
+        get_artifact_manager().register(directory)
+        self.store.remember(self.query_bytes, self.dataset_id, self.rows_written, self.count, self.meta)
+
+
+class DatasetStore:
+    """
+    Saved tool results, one immutable columnar dataset per dataset id.
+
+    A dataset id is the kind plus a hash of the canonical query and the
+    response bytes, so concurrent sessions never overwrite each other's
+    files and identical results share one file. Each query also gets a small
+    alias file pointing at its latest dataset, which lets a repeated query
+    reuse the file on disk for `reuse_ttl` seconds without refetching.
+    """
+
+    def __init__(self, root: Path, reuse_ttl: float = 3600):
+        self.root = Path(root)
+        self.reuse_ttl = reuse_ttl
+        self._aliases = self.root / ".queries"
+
+    def path(self, dataset_id: str) -> Path:
+        return self.root / f"{dataset_id}.json"
+
+    def writer(
+        self,
+        kind: str,
+        query: Dict[str, Any],
+        fields: Optional[Sequence[str]] = None,
+        enrich: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+    ) -> DatasetWriter:
+        """Writer that publishes its rows as a new (or deduplicated) dataset"""
+        return DatasetWriter(self, kind, canonical_query(kind, query), fields=fields, enrich=enrich)
+
+    def _alias_path(self, query_bytes: bytes) -> Path:
+        return self._aliases / f"{hashlib.sha256(query_bytes).hexdigest()}.json"
+
+    def remember(
+        self,
+        query_bytes: bytes,
+        dataset_id: str,
+        rows: int,
+        count: Optional[int],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Point the query's alias at dataset_id (atomic replace)"""
+        alias = self._alias_path(query_bytes)
+        alias.parent.mkdir(parents=True, exist_ok=True)
+        tmp = alias.with_name(f".{alias.name}.{uuid.uuid4().hex}.tmp")
+        dump_file(tmp, {"dataset_id": dataset_id, "rows": rows, "count": count, "meta": meta or {}, "saved_at": time.time()})
+        os.replace(tmp, alias)
+
+    def lookup(self, kind: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        The dataset saved for this exact query within reuse_ttl, as
+        {"dataset_id", "path", "rows", "count", "meta"}, or None.
+        """
+        if self.reuse_ttl <= 0:
+            return None
+        alias = self._alias_path(canonical_query(kind, query))
+        try:
+            entry = load_file(alias)
+            path = self.path(entry["dataset_id"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not entry.get("rows") or time.time() - entry.get("saved_at", 0) >= self.reuse_ttl:
+            return None
+        if not path.exists() and not (columnar_path(path) / SCHEMA_FILE).exists():
+            return None
+        get_artifact_manager().touch([columnar_path(path)])
+        return {**entry, "path": path}
+
+
+_dataset_store: Optional[DatasetStore] = None
+
+
+def get_dataset_store() -> DatasetStore:
+    """Process-wide dataset store"""
+    global _dataset_store
+    if _dataset_store is None:
+        _dataset_store = DatasetStore(
+            CONTENTS_DIR / "sample_data",
+            reuse_ttl=settings.dataset_reuse_ttl,
+        )
+    return _dataset_store
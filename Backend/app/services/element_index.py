@@ -0,0 +1,170 @@
+# Backend/app/services/element_index.py
+# Element -> row bitset inverted index for chemistry filters and co-occurrence counts
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from app.utils.serialization import dump_file, load_file
+
+
+# Localities return elements as one "-Ag-As-Au-" style string, geomaterials as a list
+_SYMBOL_RE = re.compile(r"[A-Z][a-z]?")
+
+
+def parse_elements(value: Any) -> Set[str]:
+    """Element symbols from a list or a Mindat element string"""
+    if not value:
+        return set()
+    if isinstance(value, str):
+        return set(_SYMBOL_RE.findall(value))
+    return {str(v).strip() for v in value if str(v).strip()}
+
+
+class ElementIndex:
+    """
+    One packed bitset of rows per element symbol.
+
+    `essential` holds each row's essential elements, `all` additionally its
+    significant (non-essential) ones. Rows are in the order the index was
+    built from and identified by `ids`. "Contains Fe and O but not S" is
+    bitwise AND / AND-NOT over a few rows of uint8 words, unpacked into a
+    row mask only at the end. The arrays are saved as .npy files and
+    memory-mapped on load, so opening a persisted index costs nothing until
+    a bitset is touched.
+    """
+
+    def __init__(self, symbols: List[str], ids: np.ndarray, essential: np.ndarray, all_: np.ndarray):
+        self.symbols = list(symbols)
+        self._pos: Dict[str, int] = {s.lower(): i for i, s in enumerate(self.symbols)}
+        self.ids = ids
+        self.size = int(ids.shape[0])
+        self.essential = essential
+        self.all = all_
+
+    # ---------- build / persist ----------
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Dict[str, Any]],
+        essential_field: str = "elements",
+        extra_field: Optional[str] = "sigelements",
+    ) -> "ElementIndex":
+        essential_sets = [parse_elements(r.get(essential_field)) for r in records]
+        extra_sets = [parse_elements(r.get(extra_field)) if extra_field else set() for r in records]
+        symbols = sorted(set().union(*essential_sets, *extra_sets)) if records else []
+        pos = {s: i for i, s in enumerate(symbols)}
+
+        essential = np.zeros((len(symbols), len(records)), dtype=bool)
+        every = np.zeros((len(symbols), len(records)), dtype=bool)
+        for row, (ess, extra) in enumerate(zip(essential_sets, extra_sets)):
+            essential[[pos[s] for s in ess], row] = True
+            every[[pos[s] for s in ess | extra], row] = True
+
+        ids = np.array([r.get("id") or 0 for r in records], dtype=np.int64)
+        return cls(symbols, ids, np.packbits(essential, axis=1), np.packbits(every, axis=1))
+
+    def save(self, directory: Path) -> None:
+        """Write the index as .npy files (temp file + rename, so readers never see a partial index)"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, array in (("ids", self.ids), ("essential", self.essential), ("all", self.all)):
+            tmp = directory / f"{name}.tmp.npy"
+            np.save(tmp, array)
+            os.replace(tmp, directory / f"{name}.npy")
+        tmp = directory / "symbols.tmp.json"
+        dump_file(tmp, self.symbols)
+        os.replace(tmp, directory / "symbols.json")
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["ElementIndex"]:
+        """Memory-map a saved index (None if it is missing or unreadable)"""
+        directory = Path(directory)
+        try:
+            symbols = load_file(directory / "symbols.json")
+            return cls(
+                symbols,
+                np.load(directory / "ids.npy", mmap_mode="r"),
+                np.load(directory / "essential.npy", mmap_mode="r"),
+                np.load(directory / "all.npy", mmap_mode="r"),
+            )
+        except (OSError, ValueError) as e:
+            print(f"[Element Index] Could not load {directory}: {e}")
+            return None
+
+    # ---------- queries ----------
+    def _bits(self, essential_only: bool) -> np.ndarray:
+        return self.essential if essential_only else self.all
+
+    def _rows(self, symbols: Iterable[str]) -> Optional[List[int]]:
+        """Bitset rows of the symbols, or None if one never occurs"""
+        rows = []
+        for symbol in symbols:
+            i = self._pos.get(str(symbol).strip().lower())
+            if i is None:
+                return None
+            rows.append(i)
+        return rows
+
+    def _known(self, symbols: Optional[Iterable[str]]) -> List[int]:
+        """Bitset rows of the symbols that occur, skipping the rest"""
+        return [i for i in (self._pos.get(str(s).strip().lower()) for s in symbols or []) if i is not None]
+
+    def mask(
+        self,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        essential_only: bool = True,
+        any_of: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """
+        Row mask of records containing every `include` element, at least
+        one `any_of` element (when given) and none of `exclude`
+        """
+        bits = self._bits(essential_only)
+        words = np.full(bits.shape[1], 0xFF, dtype=np.uint8)
+        if include:
+            rows = self._rows(include)
+            if rows is None:
+                return np.zeros(self.size, dtype=bool)
+            words &= np.bitwise_and.reduce(bits[rows], axis=0)
+        if any_of:
+            rows = self._known(any_of)
+            if not rows:
+                return np.zeros(self.size, dtype=bool)
+            words &= np.bitwise_or.reduce(bits[rows], axis=0)
+        excluded = self._known(exclude)
+        if excluded:
+            words &= ~np.bitwise_or.reduce(bits[excluded], axis=0)
+        return np.unpackbits(words, count=self.size).astype(bool)
+
+    def counts(self, rows: Optional[np.ndarray] = None, essential_only: bool = True) -> Dict[str, int]:
+        """Number of (optionally masked) records containing each element"""
+        matrix = np.unpackbits(self._bits(essential_only), axis=1, count=self.size)
+        if rows is not None:
+            matrix = matrix[:, rows]
+        totals = matrix.sum(axis=1)
+        return {s: int(n) for s, n in zip(self.symbols, totals) if n}
+
+    def cooccurrence(
+        self,
+        rows: Optional[np.ndarray] = None,
+        elements: Optional[Sequence[str]] = None,
+        essential_only: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Element x element co-occurrence counts over the (optionally masked)
+        records: cell [a][b] is the number of records containing both a and b.
+        """
+        picked = list(range(len(self.symbols))) if not elements else self._known(elements)
+        matrix = np.unpackbits(self._bits(essential_only)[picked], axis=1, count=self.size)
+        if rows is not None:
+            matrix = matrix[:, rows]
+        matrix = matrix.astype(np.float32)
+        counts = (matrix @ matrix.T).astype(np.int64)
+        return {
+            "elements": [self.symbols[i] for i in picked],
+            "matrix": counts.tolist(),
+        }
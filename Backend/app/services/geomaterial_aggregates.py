@@ -0,0 +1,134 @@
+# Backend/app/services/geomaterial_aggregates.py
+# Grouped counts for geomaterial queries without downloading the rows
+import asyncio
+import typing
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.config.mindat_config import MindatAPIClient, get_mindat_client
+from app.models.mindat_query import MindatGeoMaterialQuery
+from app.services.geomaterial_mirror import GeomaterialMirror, get_geomaterial_mirror
+from app.utils.custom_message import MindatAPIException, ErrorSeverity
+from app.utils.helpers import to_params
+
+
+# Facets users can group by: tool/API name -> MindatGeoMaterialQuery field.
+# Facets with a Literal-typed field default to all of its values; entrytype
+# and el_inc have no fixed value list and need explicit values.
+FACETS: Dict[str, str] = {
+    "csystem": "crystal_system",
+    "diapheny": "diapheny",
+    "lustretype": "lustretype",
+    "cleavagetype": "cleavagetype",
+    "fracturetype": "fracturetype",
+    "tenacity": "tenacity",
+    "opticaltype": "opticaltype",
+    "opticalsign": "opticalsign",
+    "entrytype": "entrytype",
+    "el_inc": "el_inc",
+}
+
+# Facets that cannot default to "every allowed value"
+VALUES_REQUIRED = {"entrytype", "el_inc"}
+
+# Facets whose query field takes a single value rather than a list
+SINGLE_VALUE_FIELDS = {"opticaltype", "opticalsign"}
+
+# Multiple-choice fields Mindat combines with AND (the rest are OR)
+AND_FIELDS = {"diapheny", "lustretype", "cleavagetype", "fracturetype", "tenacity", "el_inc"}
+
+
+def facet_values(field: str) -> List[Any]:
+    """The allowed values of a Literal-typed query field ([] if it has none)"""
+    annotation = MindatGeoMaterialQuery.model_fields[field].annotation
+    for arg in typing.get_args(annotation) or (annotation,):
+        # Optional[List[Literal[...]]] or Optional[Literal[...]]
+        inner = typing.get_args(arg)[0] if typing.get_origin(arg) in (list, List) else arg
+        if typing.get_origin(inner) is typing.Literal:
+            return list(typing.get_args(inner))
+    return []
+
+
+def _facet_query(base: Dict[str, Any], field: str, value: Any) -> MindatGeoMaterialQuery:
+    """
+    The base filters narrowed to one facet value. For AND fields the value
+    is added to any filter already present; OR and single-value fields are
+    replaced by it.
+    """
+    if field in SINGLE_VALUE_FIELDS:
+        narrowed: Any = value
+    elif field in AND_FIELDS:
+        narrowed = sorted(set(base.get(field) or []) | {value})
+    else:
+        narrowed = [value]
+    return MindatGeoMaterialQuery(**{**base, field: narrowed})
+
+
+async def count_geomaterials_by(
+    query: MindatGeoMaterialQuery,
+    facet: str,
+    values: Optional[Sequence[Any]] = None,
+    max_workers: Optional[int] = None,
+    client: Optional[MindatAPIClient] = None,
+    mirror: Optional[GeomaterialMirror] = None,
+) -> Dict[str, Any]:
+    """
+    Number of geomaterials matching `query` for each value of `facet`.
+
+    Answered from the local mirror's columnar catalogue when it covers the
+    filters; otherwise one count-only request (limit=1, id field only) per
+    facet value is issued concurrently through the shared client, so
+    repeated facets come from the response cache.
+    """
+    field = FACETS.get(facet, facet)
+    if field not in MindatGeoMaterialQuery.model_fields or field not in FACETS.values():
+        raise MindatAPIException(
+            message=f"Cannot group geomaterials by {facet!r}",
+            status_code=400,
+            severity=ErrorSeverity.WARNING,
+            details={"supported": sorted(FACETS)},
+        )
+    values = list(values or facet_values(field))
+    if not values:
+        raise MindatAPIException(
+            message=f"Grouping by {facet!r} needs an explicit list of values (required for {', '.join(sorted(VALUES_REQUIRED))})",
+            status_code=400,
+            severity=ErrorSeverity.WARNING,
+            details={"facet": facet},
+        )
+
+    base = query.model_dump(exclude_none=True, exclude={"limit", "offset", "fields", "expand"})
+    current = base.get(field)
+    if current is not None and field not in AND_FIELDS:
+        # grouping an OR / single-value filter only makes sense within it
+        allowed = current if isinstance(current, list) else [current]
+        values = [v for v in values if v in allowed]
+    queries = [_facet_query(base, field, value) for value in values]
+    base_query = MindatGeoMaterialQuery(**base)
+
+    mirror = mirror or get_geomaterial_mirror()
+    if all(mirror.can_answer(q) for q in queries) and mirror.can_answer(base_query):
+        counts = mirror.count([base_query, *queries])
+        if counts is not None:
+            return {
+                "facet": facet,
+                "total": counts[0],
+                "counts": dict(zip(values, counts[1:])),
+                "source": "mirror",
+            }
+
+    client = client or get_mindat_client()
+    semaphore = asyncio.Semaphore(max_workers or client.fetch_workers)
+
+    async def count(q: MindatGeoMaterialQuery) -> int:
+        params = {**to_params(q), "limit": 1, "offset": 0, "fields": "id"}
+        async with semaphore:
+            page = await client.get_data_from_api("geomaterials", params)
+        return int(page.get("count") or 0)
+
+    totals = await asyncio.gather(count(base_query), *(count(q) for q in queries))
+    return {
+        "facet": facet,
+        "total": totals[0],
+        "counts": dict(zip(values, totals[1:])),
+        "source": "api",
+    }
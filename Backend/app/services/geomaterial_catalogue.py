@@ -0,0 +1,266 @@
+# Backend/app/services/geomaterial_catalogue.py
+# Column-oriented view of geomaterial records with vectorised query evaluation
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+from app.models.mindat_query import MindatGeoMaterialQuery
+from app.services.element_index import ElementIndex
+
+
+# Numeric record columns, kept as float64 with NaN for missing values
+NUMERIC_FIELDS = ("hmin", "hmax", "dmeas", "dmeas2", "rimin", "rimax")
+
+# Single-valued categorical columns: query field -> record field
+SINGLE_CHOICE_FIELDS: Dict[str, str] = {
+    "crystal_system": "csystem",
+    "opticaltype": "opticaltype",
+    "opticalsign": "opticalsign",
+}
+
+# Multiple-choice (AND) columns stored as bitmasks of their vocabulary
+MULTI_CHOICE_FIELDS = ("diapheny", "lustretype", "cleavagetype", "fracturetype", "tenacity")
+
+# Free-text columns searched by substring
+TEXT_FIELDS = ("colour", "streak")
+
+_MAX_BITMASK_VOCAB = 64
+
+
+#####################################
+# Column builders
+#####################################
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _as_set(value: Any) -> Set[str]:
+    """Normalise list or comma-separated string record values to a lower-case set"""
+    if value is None:
+        return set()
+    if isinstance(value, str):
+        value = value.split(",")
+    return {str(v).strip().lower() for v in value if str(v).strip()}
+
+
+def _text_column(values: Sequence[Any]) -> np.ndarray:
+    """Lower-cased fixed-width unicode column (np.char operations run in C)"""
+    return np.array([str(v or "").lower() for v in values], dtype=str)
+
+
+class _CodeColumn:
+    """Single-valued categorical column as int32 codes (-1 = missing)"""
+
+    def __init__(self, values: Sequence[Any]):
+        self.vocab: Dict[str, int] = {}
+        codes = np.full(len(values), -1, dtype=np.int32)
+        for i, value in enumerate(values):
+            if value is None or value == "":
+                continue
+            codes[i] = self.vocab.setdefault(str(value), len(self.vocab))
+        self.codes = codes
+
+    def isin(self, wanted: Sequence[Any]) -> np.ndarray:
+        ids = [self.vocab[str(v)] for v in wanted if str(v) in self.vocab]
+        if not ids:
+            return np.zeros(len(self.codes), dtype=bool)
+        return np.isin(self.codes, np.asarray(ids, dtype=np.int32))
+
+
+class _SetColumn:
+    """
+    Multi-valued categorical column. Each distinct value gets one bit of a
+    uint64 per row when the vocabulary fits, otherwise a column of a bool
+    matrix; "contains all of" and "contains any of" are then a single
+    vectorised comparison.
+    """
+
+    def __init__(self, values: Sequence[Set[str]]):
+        vocab = sorted(set().union(*values)) if values else []
+        self.vocab: Dict[str, int] = {v: i for i, v in enumerate(vocab)}
+        self.packed = len(vocab) <= _MAX_BITMASK_VOCAB
+        if self.packed:
+            bits = np.zeros(len(values), dtype=np.uint64)
+            for i, row in enumerate(values):
+                word = 0
+                for v in row:
+                    word |= 1 << self.vocab[v]
+                bits[i] = word
+            self.bits = bits
+        else:
+            matrix = np.zeros((len(values), len(vocab)), dtype=bool)
+            for i, row in enumerate(values):
+                matrix[i, [self.vocab[v] for v in row]] = True
+            self.matrix = matrix
+        self.size = len(values)
+
+    def _ids(self, wanted: Sequence[Any]) -> Optional[List[int]]:
+        """Vocabulary ids, or None if a wanted value never occurs"""
+        ids = []
+        for v in wanted:
+            key = str(v).strip().lower()
+            if key not in self.vocab:
+                return None
+            ids.append(self.vocab[key])
+        return ids
+
+    def contains_all(self, wanted: Sequence[Any]) -> np.ndarray:
+        ids = self._ids(wanted)
+        if ids is None:
+            return np.zeros(self.size, dtype=bool)
+        if self.packed:
+            need = np.uint64(sum(1 << i for i in ids))
+            return (self.bits & need) == need
+        return self.matrix[:, ids].all(axis=1)
+
+    def contains_any(self, wanted: Sequence[Any]) -> np.ndarray:
+        ids = [self.vocab[k] for k in (str(v).strip().lower() for v in wanted) if k in self.vocab]
+        if not ids:
+            return np.zeros(self.size, dtype=bool)
+        if self.packed:
+            return (self.bits & np.uint64(sum(1 << i for i in ids))) != 0
+        return self.matrix[:, ids].any(axis=1)
+
+
+#####################################
+# Catalogue
+#####################################
+class GeomaterialCatalogue:
+    """
+    Columnar copy of a list of geomaterial records.
+
+    Columns are built once; filter() evaluates a MindatGeoMaterialQuery as
+    boolean mask operations over them and returns the matching row indices
+    (in record order), which rows() turns back into records. Filters listed
+    in `implied` are already guaranteed by how the records were collected
+    (e.g. {"ima": True} for the mirror) and are skipped. Chemistry filters
+    use an ElementIndex over the same rows; a persisted one can be passed
+    in, otherwise it is built from the records.
+    """
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        implied: Optional[Dict[str, Any]] = None,
+        element_index: Optional[ElementIndex] = None,
+    ):
+        self.records = records
+        self.implied = dict(implied or {})
+        self.size = len(records)
+
+        self.ids = np.array([r.get("id") or 0 for r in records], dtype=np.int64)
+        self.numeric: Dict[str, np.ndarray] = {
+            field: np.array([_as_float(r.get(field)) for r in records], dtype=np.float64)
+            for field in NUMERIC_FIELDS
+        }
+        self.single: Dict[str, _CodeColumn] = {
+            field: _CodeColumn([r.get(source) for r in records])
+            for field, source in SINGLE_CHOICE_FIELDS.items()
+        }
+        self.multi: Dict[str, _SetColumn] = {
+            field: _SetColumn([_as_set(r.get(field)) for r in records])
+            for field in MULTI_CHOICE_FIELDS
+        }
+        self.ima_status = _SetColumn([_as_set(r.get("ima_status")) for r in records])
+        self.entrytype = np.array(
+            [r.get("entrytype") if isinstance(r.get("entrytype"), int) else -1 for r in records],
+            dtype=np.int64,
+        )
+        if element_index is None or not np.array_equal(element_index.ids, self.ids):
+            element_index = ElementIndex.from_records(records)
+        self.element_index = element_index
+        self.names = _text_column([r.get("name") for r in records])
+        self.text: Dict[str, np.ndarray] = {field: _text_column([r.get(field) for r in records]) for field in TEXT_FIELDS}
+
+    # ---------- masks ----------
+    def _range_mask(self, lo_field: str, hi_field: str, q_min: Optional[float], q_max: Optional[float]) -> np.ndarray:
+        """Mindat range semantics: the record's [lo, hi] range overlaps the query range"""
+        lo, hi = self.numeric[lo_field], self.numeric[hi_field]
+        lo, hi = np.where(np.isnan(lo), hi, lo), np.where(np.isnan(hi), lo, hi)
+        mask = ~np.isnan(lo)
+        if q_min is not None:
+            mask &= hi >= float(q_min)
+        if q_max is not None:
+            mask &= lo <= float(q_max)
+        return mask
+
+    def _name_mask(self, pattern: str) -> np.ndarray:
+        """Name search with * and _ wildcards, substring match when there are none"""
+        pattern = pattern.lower()
+        if "*" not in pattern and "_" not in pattern:
+            return np.char.find(self.names, pattern) >= 0
+        parts = pattern.split("*")
+        if "_" not in pattern and len(parts) == 2:
+            # the common 'prefix*' / '*suffix' / 'a*b' forms
+            head, tail = parts
+            mask = np.char.startswith(self.names, head) & np.char.endswith(self.names, tail)
+            return mask & (np.char.str_len(self.names) >= len(head) + len(tail))
+        regex = re.compile("".join(".*" if c == "*" else "." if c == "_" else re.escape(c) for c in pattern) + r"\Z")
+        return np.fromiter((regex.match(n) is not None for n in self.names), dtype=bool, count=self.size)
+
+    def mask(self, query: MindatGeoMaterialQuery) -> np.ndarray:
+        """Boolean row mask for every filter in the query"""
+        q = {
+            k: v for k, v in query.model_dump(exclude_none=True).items()
+            if k not in ("limit", "offset", "expand", "fields") and self.implied.get(k, object()) != v
+        }
+        mask = np.ones(self.size, dtype=bool)
+
+        if "name" in q:
+            mask &= self._name_mask(q["name"])
+
+        if "hardness_min" in q or "hardness_max" in q:
+            mask &= self._range_mask("hmin", "hmax", q.get("hardness_min"), q.get("hardness_max"))
+        if "density_min" in q or "density_max" in q:
+            mask &= self._range_mask("dmeas", "dmeas2", q.get("density_min"), q.get("density_max"))
+        if "ri_min" in q or "ri_max" in q:
+            mask &= self._range_mask("rimin", "rimax", q.get("ri_min"), q.get("ri_max"))
+        if "bi_min" in q or "bi_max" in q:
+            bi = self.numeric["rimax"] - self.numeric["rimin"]
+            with np.errstate(invalid="ignore"):
+                if "bi_min" in q:
+                    mask &= bi >= float(q["bi_min"])
+                if "bi_max" in q:
+                    mask &= bi <= float(q["bi_max"])
+            mask &= ~np.isnan(bi)
+
+        for field, column in self.single.items():
+            if field in q:
+                wanted = q[field] if isinstance(q[field], list) else [q[field]]
+                mask &= column.isin(wanted)
+
+        for field, column in self.multi.items():
+            if field in q:
+                mask &= column.contains_all(q[field])
+
+        if "entrytype" in q:
+            mask &= np.isin(self.entrytype, np.asarray(q["entrytype"], dtype=np.int64))
+
+        if "ima" in q:
+            approved = self.ima_status.contains_any(["approved"])
+            mask &= approved if q["ima"] else ~approved
+        if "ima_status" in q:
+            mask &= self.ima_status.contains_any(q["ima_status"])
+
+        if "el_inc" in q or "el_exc" in q:
+            mask &= self.element_index.mask(
+                q.get("el_inc"), q.get("el_exc"), essential_only=q.get("el_essential", True) is not False
+            )
+
+        for field, column in self.text.items():
+            if field in q:
+                mask &= np.char.find(column, q[field].lower()) >= 0
+
+        return mask
+
+    def filter(self, query: MindatGeoMaterialQuery) -> np.ndarray:
+        """Indices (in record order) of the rows matching the query"""
+        return np.flatnonzero(self.mask(query))
+
+    def rows(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Records at the given row indices"""
+        return [self.records[i] for i in indices.tolist()]
@@ -0,0 +1,348 @@
+# Backend/app/services/geomaterial_mirror.py
+# Local mirror of the IMA-approved /v1/geomaterials catalogue.
+#
+# Sync (full or incremental):  python -m app.services.geomaterial_mirror [--full]
+# The MCP server also syncs incrementally every MINDAT_MIRROR_REFRESH seconds.
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.config.mindat_config import MindatAPIClient, get_mindat_client
+from app.config.settings import settings
+from app.models.mindat_query import MindatGeoMaterialQuery
+from app.services.element_index import ElementIndex
+from app.services.geomaterial_catalogue import GeomaterialCatalogue
+from app.utils.helpers import CONTENTS_DIR, to_params
+from app.utils.serialization import dumps, loads
+
+
+# What the mirror holds. A query is only answered locally when it asks for
+# (a subset of) this scope, i.e. IMA-approved geomaterials.
+MIRROR_SCOPE_PARAMS: Dict[str, Any] = {"ima": True}
+
+# Mindat's "last updated" filter and the matching record field
+UPDATED_SINCE_PARAM = "updated_at"
+UPDATED_FIELD = "updttime"
+
+# format of the sync timestamps kept in mirror_meta (UTC)
+SYNC_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Query fields (python names) the mirror can evaluate; anything else goes to the API
+LOCAL_FIELDS: Set[str] = {
+    "ima",
+    "name",
+    "hardness_min", "hardness_max",
+    "density_min", "density_max",
+    "ri_min", "ri_max",
+    "bi_min", "bi_max",
+    "crystal_system",
+    "diapheny", "lustretype", "cleavagetype", "fracturetype", "tenacity",
+    "opticaltype", "opticalsign",
+    "el_inc", "el_exc", "el_essential",
+    "entrytype",
+    "colour", "streak",
+    "limit", "offset", "fields",
+}
+
+
+#####################################
+# Mirror
+#####################################
+class GeomaterialMirror:
+    """
+    SQLite-backed copy of the geomaterials catalogue.
+
+    sync() bulk-pulls the catalogue (or only rows updated since the last
+    sync) through the shared client, and start() repeats it every
+    refresh_interval seconds in the background; query() answers a
+    MindatGeoMaterialQuery from the in-memory catalogue, or returns None
+    when the query needs fields or scope the mirror does not have, or the
+    last sync is older than max_age, so the caller can use the API.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        refresh_interval: float = 24 * 3600,
+        max_age: float = 7 * 24 * 3600,
+        client: Optional[MindatAPIClient] = None,
+    ):
+        self.db_path = Path(db_path)
+        self._client = client
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        # element bitsets saved next to the database at sync time
+        self.index_dir = self.db_path.with_suffix(".elements")
+        self._records: List[Dict[str, Any]] = []
+        self._catalogue = GeomaterialCatalogue([], implied=MIRROR_SCOPE_PARAMS)
+        self._loaded_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.last_sync: Optional[float] = None
+        self.local_hits = 0
+        self.fallbacks = 0
+        self.sync_errors = 0
+        self.last_error: Optional[str] = None
+
+    # ---------- storage ----------
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS geomaterials ("
+            "id INTEGER PRIMARY KEY, name TEXT, updttime TEXT, record TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS mirror_meta (key TEXT PRIMARY KEY, value TEXT)")
+        return conn
+
+    def _get_meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO mirror_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _upsert(self, conn: sqlite3.Connection, rows: Iterable[Dict[str, Any]]) -> int:
+        batch = [
+            (row["id"], row.get("name"), row.get(UPDATED_FIELD), dumps(row))
+            for row in rows
+            if row.get("id") is not None
+        ]
+        conn.executemany(
+            "INSERT OR REPLACE INTO geomaterials (id, name, updttime, record) VALUES (?, ?, ?, ?)",
+            batch,
+        )
+        return len(batch)
+
+    # ---------- sync ----------
+    async def sync(self, client: Optional[MindatAPIClient] = None, full: bool = False) -> Dict[str, Any]:
+        """Pull the catalogue into the mirror; incremental unless full=True or first run"""
+        client = client or self._client or get_mindat_client()
+        conn = self._connect()
+        try:
+            since = None if full else self._get_meta(conn, "last_updated")
+            params = to_params(MIRROR_SCOPE_PARAMS)
+            if since:
+                params[UPDATED_SINCE_PARAM] = since
+            if full:
+                conn.execute("DELETE FROM geomaterials")
+
+            upserted = 0
+
+            def on_page(rows: List[Dict[str, Any]]) -> None:
+                nonlocal upserted
+                upserted += self._upsert(conn, rows)
+
+            started = datetime.now(timezone.utc).strftime(SYNC_TIME_FORMAT)
+            summary = await client.fetch_all(
+                "geomaterials",
+                params,
+                max_rows=settings.mindat_mirror_max_rows,
+                on_page=on_page,
+                use_cache=False,
+            )
+            # newest updttime we hold, falling back to the sync start time
+            newest = conn.execute("SELECT MAX(updttime) FROM geomaterials").fetchone()[0]
+            self._set_meta(conn, "last_updated", newest or started)
+            self._set_meta(conn, "last_sync", started)
+            conn.commit()
+            total = conn.execute("SELECT COUNT(*) FROM geomaterials").fetchone()[0]
+            records = [loads(r[0]) for r in conn.execute("SELECT record FROM geomaterials ORDER BY id")]
+        finally:
+            conn.close()
+
+        ElementIndex.from_records(records).save(self.index_dir)
+
+        self._loaded_mtime = None  # force reload
+        return {
+            "mode": "incremental" if since else "full",
+            "since": since,
+            "upserted": upserted,
+            "upstream_count": summary.get("count"),
+            "total_records": total,
+        }
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            self._ensure_loaded()
+            due = (self.last_sync or 0.0) + self.refresh_interval - time.time()
+            if due > 0:
+                await asyncio.sleep(due)
+            try:
+                result = await self.sync()
+                print(f"[Mirror] {result['mode']} sync: {result['upserted']} rows upserted")
+            except Exception as e:
+                self.sync_errors += 1
+                self.last_error = str(e)
+                print(f"[Mirror] Sync failed: {e}")
+                # retry after a short pause rather than a full interval
+                await asyncio.sleep(min(self.refresh_interval, 600.0))
+
+    async def start(self) -> None:
+        """Start background incremental syncs (startup hook)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background syncs (shutdown hook)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---------- query ----------
+    def stale(self) -> bool:
+        """True when the mirror has never synced or its last sync is older than max_age"""
+        if not self.max_age:
+            return False
+        return self.last_sync is None or time.time() - self.last_sync > self.max_age
+
+    def _usable(self) -> List[Dict[str, Any]]:
+        """The loaded records, or [] when the mirror is off, empty or stale"""
+        if not settings.mindat_mirror_enabled:
+            return []
+        records = self._ensure_loaded()
+        return records if records and not self.stale() else []
+
+    def _ensure_loaded(self) -> List[Dict[str, Any]]:
+        """Load (or reload after a sync by another process) the catalogue into memory"""
+        if not self.db_path.exists():
+            return []
+        mtime = self.db_path.stat().st_mtime
+        if self._loaded_mtime != mtime:
+            with self._lock:
+                if self._loaded_mtime != mtime:
+                    conn = self._connect()
+                    try:
+                        rows = conn.execute("SELECT record FROM geomaterials ORDER BY id").fetchall()
+                        synced = self._get_meta(conn, "last_sync")
+                    finally:
+                        conn.close()
+                    self.last_sync = (
+                        datetime.strptime(synced, SYNC_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+                        if synced else None
+                    )
+                    self._records = [loads(r[0]) for r in rows]
+                    self._catalogue = GeomaterialCatalogue(
+                        self._records,
+                        implied=MIRROR_SCOPE_PARAMS,
+                        element_index=ElementIndex.load(self.index_dir),
+                    )
+                    self._loaded_mtime = mtime
+        return self._records
+
+    def can_answer(self, query: MindatGeoMaterialQuery) -> bool:
+        """True when every filter in the query is in the mirror's scope and fields"""
+        fields = query.model_dump(exclude_none=True)
+        if any(f not in LOCAL_FIELDS for f in fields):
+            return False
+        # the mirror only holds the scope it was synced with
+        return all(fields.get(k) == v for k, v in MIRROR_SCOPE_PARAMS.items())
+
+    def query(self, query: MindatGeoMaterialQuery, max_rows: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Answer a query from the mirror in the shape of an API response,
+        or None if the API must be used instead.
+        """
+        records = self._usable()
+        if not records or not self.can_answer(query):
+            self.fallbacks += 1
+            return None
+
+        catalogue = self._catalogue
+        matched = catalogue.filter(query)
+        offset = query.offset or 0
+        window = max_rows if max_rows is not None else (query.limit or 100)
+        self.local_hits += 1
+        return {
+            "count": int(matched.size),
+            "next": None,
+            "previous": None,
+            "results": catalogue.rows(matched[offset:offset + window]),
+            "source": "mirror",
+        }
+
+    def count(self, queries: List[MindatGeoMaterialQuery]) -> Optional[List[int]]:
+        """Matching-row counts for several queries (None when the mirror is empty)"""
+        records = self._usable()
+        if not records:
+            return None
+        self.local_hits += 1
+        return [int(self._catalogue.mask(q).sum()) for q in queries]
+
+    def element_cooccurrence(
+        self,
+        query: Optional[MindatGeoMaterialQuery] = None,
+        elements: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Per-element record counts and the element co-occurrence matrix over the
+        mirror rows matching `query` (all rows when None), for element charts.
+        None when the mirror is empty or cannot evaluate the query.
+        """
+        records = self._usable()
+        if not records or (query is not None and not self.can_answer(query)):
+            return None
+        catalogue = self._catalogue
+        rows = catalogue.filter(query) if query is not None else None
+        essential_only = query is None or query.el_essential is not False
+        index = catalogue.element_index
+        return {
+            "records": int(rows.size) if rows is not None else catalogue.size,
+            "counts": index.counts(rows, essential_only=essential_only),
+            **index.cooccurrence(rows, elements=elements, essential_only=essential_only),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": len(self._records),
+            "db_path": str(self.db_path),
+            "last_sync": self.last_sync,
+            "stale": self.stale(),
+            "local_hits": self.local_hits,
+            "fallbacks": self.fallbacks,
+            "sync_errors": self.sync_errors,
+            "last_error": self.last_error,
+            "background_refresh": self._task is not None and not self._task.done(),
+        }
+
+
+_mirror: Optional[GeomaterialMirror] = None
+
+
+def get_geomaterial_mirror() -> GeomaterialMirror:
+    """Process-wide geomaterial mirror"""
+    global _mirror
+    if _mirror is None:
+        path = settings.mindat_mirror_path or CONTENTS_DIR / "mirror" / "geomaterials.sqlite3"
+        _mirror = GeomaterialMirror(
+            Path(path),
+            refresh_interval=settings.mindat_mirror_refresh,
+            max_age=settings.mindat_mirror_max_age,
+        )
+    return _mirror
+
+
+async def start_geomaterial_mirror() -> None:
+    if settings.mindat_mirror_enabled and settings.mindat_mirror_refresh > 0:
+        await get_geomaterial_mirror().start()
+
+
+async def stop_geomaterial_mirror() -> None:
+    if _mirror is not None:
+        await _mirror.stop()
+
+
+if __name__ == "__main__":
+    import sys
+
+    result = asyncio.run(get_geomaterial_mirror().sync(full="--full" in sys.argv))
+    print(json.dumps(result, indent=2))
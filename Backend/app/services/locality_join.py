@@ -0,0 +1,83 @@
+# Backend/app/services/locality_join.py
+# Fan-out join: geomaterial result set -> localities where each mineral occurs
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from app.config.mindat_config import MindatAPIClient, get_mindat_client
+from app.config.settings import settings
+from app.services.dataset_store import DatasetWriter
+from app.utils.dataset_io import ResultsWriter
+
+
+# /v1/loc-by-min filter selecting the occurrences of one geomaterial id
+LOC_BY_MIN_MINERAL_PARAM = "min_id"
+
+# Mineral columns copied onto every joined locality row, as mineral_<field>
+DEFAULT_MINERAL_FIELDS = ("id", "name")
+
+
+async def join_mineral_localities(
+    minerals: Sequence[Dict[str, Any]],
+    writer: Union[ResultsWriter, DatasetWriter],
+    max_localities_per_mineral: int = 100,
+    max_workers: Optional[int] = None,
+    mineral_fields: Sequence[str] = DEFAULT_MINERAL_FIELDS,
+    client: Optional[MindatAPIClient] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch loc-by-min for every mineral concurrently (each page through the
+    shared client's cache and rate limiter) and append the merged rows to an
+    open ResultsWriter / DatasetWriter.
+
+    Fetches run in a window of max_workers minerals starting at the first
+    one not yet written; rows are written in the minerals' order and the
+    window only moves on once its first mineral is written, so at most
+    max_workers minerals' rows are held in memory. A slow mineral therefore
+    holds back the ones after it. Each locality row gains mineral_<field>
+    columns from its mineral.
+    """
+    client = client or get_mindat_client()
+    max_workers = max_workers or settings.mindat_fetch_workers
+    minerals = [m for m in minerals if m.get("id") is not None]
+
+    per_mineral: Dict[int, int] = {}
+    failed: Dict[Any, str] = {}
+
+    async def fetch(mineral: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            page = await client.fetch_all(
+                "loc-by-min",
+                {LOC_BY_MIN_MINERAL_PARAM: mineral["id"]},
+                max_rows=max_localities_per_mineral,
+                page_size=max_localities_per_mineral,
+                max_workers=1,
+            )
+        except Exception as e:
+            # one failing mineral should not sink the whole join
+            failed[mineral["id"]] = str(e)
+            return []
+        tag = {f"mineral_{field}": mineral.get(field) for field in mineral_fields}
+        return [{**row, **tag} for row in page["results"]]
+
+    rows_before = writer.rows_written
+    window: Dict[int, "asyncio.Task[List[Dict[str, Any]]]"] = {}
+    launched = 0
+    try:
+        for index, mineral in enumerate(minerals):
+            while launched < len(minerals) and launched < index + max_workers:
+                window[launched] = asyncio.create_task(fetch(minerals[launched]))
+                launched += 1
+            rows = await window.pop(index)
+            per_mineral[mineral["id"]] = len(rows)
+            writer.write_rows(rows)
+    finally:
+        for task in window.values():
+            task.cancel()
+        await asyncio.gather(*window.values(), return_exceptions=True)
+
+    return {
+        "minerals": len(minerals),
+        "rows": writer.rows_written - rows_before,
+        "localities_per_mineral": per_mineral,
+        "failed": failed,
+    }
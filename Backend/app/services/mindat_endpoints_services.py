@@ -1,8 +1,12 @@
 # Backend/app/services/mindat_endpoints_services.py
 # this module will help us collect the data from different endpoints of mindat.org
-from typing import Dict, Optional
-from app.config.mindat_config import MindatAPIClient
+import asyncio
+import tempfile
+from typing import IO, Dict, Optional, Callable, List, Any, Sequence
+from app.config.mindat_config import MindatAPIClient, get_mindat_client
+from app.config.settings import settings
 from app.utils.custom_message import MindatAPIException, ErrorSeverity
+from app.utils.serialization import dumps_bytes, loads
 from langsmith import traceable
 
 
@@ -13,11 +17,11 @@ class GeomaterialAPI:
     """Geomaterial API Client for interacting with Mindat's geomaterial endpoint"""
     
     def __init__(self, client: Optional[MindatAPIClient] = None):
-        self.client = client or MindatAPIClient()
+        self.client = client or get_mindat_client()
         self.endpoint = "geomaterials"
     
     @traceable(run_type="retriever", name="mindat_api_geomaterial_search")
-    def search_geomaterials_minerals(self, query_params: Dict) -> Dict:
+    async def search_geomaterials_minerals(self, query_params: Dict) -> Dict:
         """Search geomaterials/minerals with given query parameters"""
         params = query_params if query_params else {}
         print("the query params are", params)
@@ -31,7 +35,7 @@ class GeomaterialAPI:
             )
         
         try:
-            return self.client.get_data_from_api(self.endpoint, params)
+            return await self.client.get_data_from_api(self.endpoint, params)
         except Exception as e:
             raise MindatAPIException(
                 message=f"Failed to search geomaterials: {str(e)}",
@@ -40,9 +44,27 @@ class GeomaterialAPI:
                 details={"query_params": params}
             )
 
+    @traceable(run_type="retriever", name="mindat_api_geomaterial_fetch_all")
+    async def fetch_all_geomaterials(
+        self,
+        query_params: Dict,
+        max_rows: Optional[int] = None,
+        on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> Dict:
+        """Fetch every page of a geomaterial search (up to max_rows)"""
+        try:
+            return await self.client.fetch_all(self.endpoint, query_params, max_rows=max_rows, on_page=on_page)
+        except Exception as e:
+            raise MindatAPIException(
+                message=f"Failed to fetch all geomaterials: {str(e)}",
+                status_code=500,
+                severity=ErrorSeverity.ERROR,
+                details={"query_params": query_params, "max_rows": max_rows}
+            )
+
 # Factory function
 def get_geomaterial_api() -> GeomaterialAPI:
-    """Get a configured GeomaterialAPI instance"""
+    """Get a GeomaterialAPI bound to the shared, pooled Mindat client"""
     return GeomaterialAPI()
 
 
@@ -57,11 +79,11 @@ class LocalityAPI:
     """Locality API Client for interacting with Mindat's locality endpoint"""
     
     def __init__(self, client: Optional[MindatAPIClient] = None):
-        self.client = client or MindatAPIClient()
+        self.client = client or get_mindat_client()
         self.endpoint = "localities"
     
     @traceable(run_type="retriever", name="mindat_api_locality_search")
-    def search_localities(self, query_params: Dict) -> Dict:
+    async def search_localities(self, query_params: Dict) -> Dict:
         """Search localities with given query parameters"""
         params = query_params if query_params else {}
         print("the query params are", params)
@@ -75,7 +97,7 @@ class LocalityAPI:
             )
         
         try:
-            return self.client.get_data_from_api(self.endpoint, params)
+            return await self.client.get_data_from_api(self.endpoint, params)
         except Exception as e:
             raise MindatAPIException(
                 message=f"Failed to search localities: {str(e)}",
@@ -84,7 +106,109 @@ class LocalityAPI:
                 details={"query_params": params}
             )   
         
+    @traceable(run_type="retriever", name="mindat_api_locality_fetch_all")
+    async def fetch_all_localities(
+        self,
+        query_params: Dict,
+        max_rows: Optional[int] = None,
+        on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> Dict:
+        """Fetch every page of a locality search (up to max_rows)"""
+        try:
+            return await self.client.fetch_all(self.endpoint, query_params, max_rows=max_rows, on_page=on_page)
+        except Exception as e:
+            raise MindatAPIException(
+                message=f"Failed to fetch all localities: {str(e)}",
+                status_code=500,
+                severity=ErrorSeverity.ERROR,
+                details={"query_params": query_params, "max_rows": max_rows}
+            )
+
+    async def fetch_localities_by_country(
+        self,
+        query_params: Dict,
+        countries: Sequence[str],
+        on_page: Callable[[List[Dict[str, Any]]], None],
+        max_rows: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict:
+        """
+        fetch_all_localities for several countries concurrently (max_rows each),
+        every row tagged with the country it was queried for. A country named
+        twice is fetched once.
+
+        Rows reach on_page grouped by country in the given order: the earliest
+        unfinished country streams straight through, later ones are spilled
+        page by page to their own temporary file and replayed once every
+        country before them has completed, so memory stays at about a page
+        per country in flight. A failing country is reported in "failed"
+        without stopping the others.
+        """
+        countries = list(dict.fromkeys(countries))
+        semaphore = asyncio.Semaphore(max_workers or settings.mindat_fetch_workers)
+        segments: List[Optional[IO[bytes]]] = [None] * len(countries)
+        done = [False] * len(countries)
+        rows_per_country = {country: 0 for country in countries}
+        counts: Dict[str, Optional[int]] = {}
+        failed: Dict[str, str] = {}
+        next_index = 0
+
+        def emit(index: int, rows: List[Dict[str, Any]]) -> None:
+            country = countries[index]
+            rows = [{**row, "country": country} for row in rows]
+            rows_per_country[country] += len(rows)
+            if index == next_index:
+                on_page(rows)
+                return
+            if segments[index] is None:
+                segments[index] = tempfile.TemporaryFile(prefix="localities-")
+            segments[index].write(dumps_bytes(rows) + b"\n")
+
+        def replay(index: int) -> None:
+            segment, segments[index] = segments[index], None
+            if segment is None:
+                return
+            with segment:
+                segment.seek(0)
+                for line in segment:
+                    on_page(loads(line))
+
+        def advance() -> None:
+            nonlocal next_index
+            while next_index < len(countries) and done[next_index]:
+                next_index += 1
+                if next_index < len(countries):
+                    replay(next_index)
+
+        async def fetch(index: int, country: str) -> None:
+            try:
+                async with semaphore:
+                    summary = await self.fetch_all_localities(
+                        {**query_params, "country": country},
+                        max_rows=max_rows,
+                        on_page=lambda rows: emit(index, rows),
+                    )
+                counts[country] = summary.get("count")
+            except Exception as e:
+                failed[country] = str(e)
+            finally:
+                done[index] = True
+                advance()
+
+        try:
+            await asyncio.gather(*(fetch(i, c) for i, c in enumerate(countries)))
+        finally:
+            for segment in segments:
+                if segment is not None:
+                    segment.close()
+        return {
+            "count": sum(c or 0 for c in counts.values()),
+            "returned": sum(rows_per_country.values()),
+            "per_country": rows_per_country,
+            "failed": failed,
+        }
+
 def get_locality_api() -> LocalityAPI:
-    """Get a configured LocalityAPI instance"""
+    """Get a LocalityAPI bound to the shared, pooled Mindat client"""
     return LocalityAPI()
 
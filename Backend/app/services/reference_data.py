@@ -0,0 +1,309 @@
+# Backend/app/services/reference_data.py
+# Preloaded Mindat lookup tables (space groups, Strunz/Dana classes, locality types, ...)
+#
+# Refresh the snapshot by hand:  python -m app.services.reference_data
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from app.config.mindat_config import MindatAPIClient, get_mindat_client
+from app.config.settings import settings
+from app.utils.helpers import CONTENTS_DIR
+from app.utils.serialization import dump_file, load_file
+
+
+# Small, slowly changing endpoints that are worth holding in memory
+REFERENCE_ENDPOINTS = (
+    "crystalclasses",
+    "spacegroups",
+    "spacegroupsets",
+    "nickel-strunz-10",
+    "dana-8",
+    "locality-type",
+    "locality-status",
+    "locality-age",
+    "reference-types",
+)
+
+# Record fields tried, in order, for an entry's display label
+DEFAULT_LABEL_FIELDS = ("name", "txt", "text", "title", "description", "code", "symbol")
+LABEL_FIELDS: Dict[str, Sequence[str]] = {
+    "spacegroups": ("spacegroup", "name", "symbol"),
+    "nickel-strunz-10": ("code", "name"),
+    "dana-8": ("code", "name"),
+}
+
+# Record field -> reference table, for enrich()
+GEOMATERIAL_REFERENCE_FIELDS: Dict[str, str] = {
+    "spacegroup": "spacegroups",
+    "spacegroupset": "spacegroupsets",
+}
+
+# ids denser than this are also kept in a plain list indexed by id
+_DENSE_ID_FACTOR = 4
+
+
+def _label(row: Dict[str, Any], fields: Sequence[str]) -> Optional[str]:
+    for field in fields:
+        value = row.get(field)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+class ReferenceTable:
+    """One lookup endpoint held as id -> row and id -> label maps"""
+
+    def __init__(self, endpoint: str, rows: List[Dict[str, Any]], fetched_at: float):
+        self.endpoint = endpoint
+        self.rows = rows
+        self.fetched_at = fetched_at
+        fields = LABEL_FIELDS.get(endpoint, DEFAULT_LABEL_FIELDS)
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+        self.labels: Dict[int, Optional[str]] = {}
+        for row in rows:
+            try:
+                ref_id = int(row["id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.by_id[ref_id] = row
+            self.labels[ref_id] = _label(row, fields)
+
+        # small, dense id ranges (the common case) also get an array lookup
+        max_id = max(self.labels, default=-1)
+        self.label_array: Optional[List[Optional[str]]] = None
+        if 0 <= max_id < _DENSE_ID_FACTOR * len(self.labels) + 1024:
+            self.label_array = [None] * (max_id + 1)
+            for ref_id, label in self.labels.items():
+                if ref_id >= 0:
+                    self.label_array[ref_id] = label
+
+    def label(self, ref_id: Any) -> Optional[str]:
+        try:
+            ref_id = int(ref_id)
+        except (TypeError, ValueError):
+            return None
+        if self.label_array is not None:
+            return self.label_array[ref_id] if 0 <= ref_id < len(self.label_array) else None
+        return self.labels.get(ref_id)
+
+    def get(self, ref_id: Any) -> Optional[Dict[str, Any]]:
+        try:
+            return self.by_id.get(int(ref_id))
+        except (TypeError, ValueError):
+            return None
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+class ReferenceDataService:
+    """
+    Process-wide reference tables.
+
+    start() loads the JSON snapshot (if any) so lookups work immediately,
+    then a background task refreshes stale tables from the API and keeps
+    refreshing every `refresh_interval` seconds. Each refresh builds new
+    tables and swaps them in whole, so readers never see a half-built table,
+    and rewrites the snapshot for the next start.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        refresh_interval: float = 24 * 3600,
+        endpoints: Sequence[str] = REFERENCE_ENDPOINTS,
+        client: Optional[MindatAPIClient] = None,
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.refresh_interval = refresh_interval
+        self.endpoints = tuple(endpoints)
+        self._client = client
+        self.tables: Dict[str, ReferenceTable] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error: Optional[str] = None
+
+    # ---------- snapshot ----------
+    def load_snapshot(self) -> int:
+        """Load tables from the snapshot file; returns how many were loaded"""
+        if not self.snapshot_path.exists():
+            return 0
+        try:
+            snapshot = load_file(self.snapshot_path)
+        except Exception as e:
+            print(f"[Reference Data] Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return 0
+        tables = dict(self.tables)
+        for endpoint in self.endpoints:
+            entry = snapshot.get(endpoint)
+            if isinstance(entry, dict) and isinstance(entry.get("rows"), list):
+                tables[endpoint] = ReferenceTable(endpoint, entry["rows"], entry.get("fetched_at") or 0.0)
+        self.tables = tables
+        return len(tables)
+
+    def _write_snapshot(self) -> None:
+        snapshot = {
+            name: {"fetched_at": table.fetched_at, "rows": table.rows}
+            for name, table in self.tables.items()
+        }
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        dump_file(tmp, snapshot)
+        os.replace(tmp, self.snapshot_path)
+
+    # ---------- refresh ----------
+    def stale(self) -> List[str]:
+        """Endpoints that are missing or older than the refresh interval"""
+        now = time.time()
+        return [
+            name for name in self.endpoints
+            if name not in self.tables or now - self.tables[name].fetched_at >= self.refresh_interval
+        ]
+
+    async def refresh(self, endpoints: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Re-fetch the given (default: all) tables concurrently and swap them in"""
+        client = self._client or get_mindat_client()
+        names = list(endpoints or self.endpoints)
+        results = await asyncio.gather(
+            *(client.fetch_all(name, {}, use_cache=False) for name in names),
+            return_exceptions=True,
+        )
+        tables = dict(self.tables)
+        summary: Dict[str, Any] = {}
+        now = time.time()
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                # keep serving the previous copy of this table
+                self.refresh_errors += 1
+                self.last_error = f"{name}: {result}"
+                summary[name] = {"error": str(result)}
+                continue
+            tables[name] = ReferenceTable(name, result["results"], now)
+            summary[name] = {"rows": len(tables[name])}
+        self.tables = tables
+        self.refreshes += 1
+        self._write_snapshot()
+        return summary
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            stale = self.stale()
+            if stale:
+                try:
+                    await self.refresh(stale)
+                except Exception as e:
+                    self.refresh_errors += 1
+                    self.last_error = str(e)
+                    print(f"[Reference Data] Refresh failed: {e}")
+            oldest = min((t.fetched_at for t in self.tables.values()), default=0.0)
+            wait = oldest + self.refresh_interval - time.time() if len(self.tables) == len(self.endpoints) else 0
+            # retry missing tables after a short pause, otherwise sleep until the oldest goes stale
+            await asyncio.sleep(max(60.0, wait))
+
+    async def start(self) -> None:
+        """Load the snapshot and start background refreshing (startup hook)"""
+        self.load_snapshot()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refreshing (shutdown hook)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---------- lookups ----------
+    def table(self, endpoint: str) -> Optional[ReferenceTable]:
+        return self.tables.get(endpoint)
+
+    def label(self, endpoint: str, ref_id: Any) -> Optional[str]:
+        """O(1) id -> label (None if the table or id is unknown)"""
+        table = self.tables.get(endpoint)
+        return table.label(ref_id) if table is not None else None
+
+    def enrich(
+        self,
+        rows: List[Dict[str, Any]],
+        fields: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Add a "<field>_name" label column next to every reference id column
+        in `fields` (record field -> reference table). Labelled rows are
+        copies, so rows shared with the response cache are left untouched.
+        """
+        for field, endpoint in (fields or GEOMATERIAL_REFERENCE_FIELDS).items():
+            table = self.tables.get(endpoint)
+            if table is None:
+                continue
+            rows = [
+                {**row, f"{field}_name": table.label(row[field])} if field in row else row
+                for row in rows
+            ]
+        return rows
+
+    def enricher(
+        self,
+        fields: Optional[Sequence[str]],
+        reference_fields: Optional[Dict[str, str]] = None,
+    ) -> Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]]:
+        """
+        enrich() limited to the reference id columns a projection keeps
+        (fields=None keeps them all), or None when it keeps none of them
+        """
+        reference_fields = reference_fields or GEOMATERIAL_REFERENCE_FIELDS
+        if fields is not None:
+            reference_fields = {f: e for f, e in reference_fields.items() if f in fields}
+        if not reference_fields:
+            return None
+        return lambda rows: self.enrich(rows, reference_fields)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "snapshot_path": str(self.snapshot_path),
+            "tables": {
+                name: {"rows": len(table), "fetched_at": table.fetched_at}
+                for name, table in self.tables.items()
+            },
+            "stale": self.stale(),
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "last_error": self.last_error,
+            "background_refresh": self._task is not None and not self._task.done(),
+        }
+
+
+_reference_data: Optional[ReferenceDataService] = None
+
+
+def get_reference_data() -> ReferenceDataService:
+    """Process-wide reference data service"""
+    global _reference_data
+    if _reference_data is None:
+        path = settings.mindat_reference_snapshot or CONTENTS_DIR / "reference" / "mindat_reference.json"
+        _reference_data = ReferenceDataService(Path(path), refresh_interval=settings.mindat_reference_refresh)
+    return _reference_data
+
+
+async def start_reference_data() -> None:
+    if settings.mindat_reference_enabled:
+        await get_reference_data().start()
+
+
+async def stop_reference_data() -> None:
+    if _reference_data is not None:
+        await _reference_data.stop()
+
+
+if __name__ == "__main__":
+    import json
+
+    result = asyncio.run(get_reference_data().refresh())
+    print(json.dumps(result, indent=2))
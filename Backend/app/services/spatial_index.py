@@ -0,0 +1,212 @@
+# Backend/app/services/spatial_index.py
+# Uniform-grid index over locality coordinates for bbox / radius filters
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.utils.columnar import ColumnarDataset
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = np.pi * EARTH_RADIUS_KM / 180.0
+
+# Grid cell size in degrees (~111 km of latitude)
+DEFAULT_CELL_DEG = 1.0
+
+# Indexes kept in memory, keyed by the dataset directory
+_CACHE_SIZE = 16
+
+
+def _coordinates(dataset: ColumnarDataset, field: str) -> np.ndarray:
+    """A coordinate column as float64 (NaN where missing or unparsable)"""
+    if field not in dataset.columns:
+        return np.full(dataset.rows, np.nan)
+    if dataset.kind(field) in ("int", "float"):
+        values = np.asarray(dataset.array(field), dtype=np.float64)
+        valid = dataset.valid(field)
+        return values if valid.all() else np.where(valid, values, np.nan)
+    out = np.full(dataset.rows, np.nan)
+    for i, value in enumerate(dataset.values(field)):
+        try:
+            out[i] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def haversine_km(lat1: float, lon1: float, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from one point to arrays of points"""
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dlat = p2 - p1
+    dlon = np.radians(lon2 - lon1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """
+    Rows bucketed into cell_deg x cell_deg latitude/longitude cells.
+
+    Cell keys are row-major (lat band, then lon), and rows are sorted by
+    key, so the cells of one latitude band inside a bounding box are a
+    single contiguous slice found with two binary searches. A bbox query
+    touches one slice per latitude band; radius queries take the circle's
+    bounding box and refine the candidates with the haversine distance.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_deg: float = DEFAULT_CELL_DEG):
+        self.lat = lat
+        self.lon = lon
+        self.cell_deg = cell_deg
+        self.n_rows = int(np.ceil(180.0 / cell_deg))
+        self.n_cols = int(np.ceil(360.0 / cell_deg))
+        valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        keys = self._key(lat[valid], lon[valid])
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.order = valid[order]
+
+    def _band(self, lat: np.ndarray) -> np.ndarray:
+        return np.clip(((np.asarray(lat) + 90.0) // self.cell_deg).astype(np.int64), 0, self.n_rows - 1)
+
+    def _column(self, lon: np.ndarray) -> np.ndarray:
+        return np.clip(((np.asarray(lon) + 180.0) // self.cell_deg).astype(np.int64), 0, self.n_cols - 1)
+
+    def _key(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        return self._band(lat) * self.n_cols + self._column(lon)
+
+    def _candidates(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Rows in every cell overlapping the box (west > east wraps the antimeridian)"""
+        spans = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+        parts = []
+        for band in range(int(self._band(south)), int(self._band(north)) + 1):
+            for lo, hi in spans:
+                first = band * self.n_cols + int(self._column(lo))
+                last = band * self.n_cols + int(self._column(hi))
+                a, b = np.searchsorted(self.keys, [first, last + 1])
+                if b > a:
+                    parts.append(self.order[a:b])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def bbox(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """Row indices inside [west, south, east, north] (GeoJSON bbox order)"""
+        rows = self._candidates(south, west, north, east)
+        lat, lon = self.lat[rows], self.lon[rows]
+        inside = (lat >= south) & (lat <= north)
+        inside &= (lon >= west) & (lon <= east) if west <= east else (lon >= west) | (lon <= east)
+        return np.sort(rows[inside])
+
+    def radius(self, lat: float, lon: float, km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices within km of (lat, lon), nearest first, and their distances"""
+        dlat = km / KM_PER_DEGREE_LAT
+        south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        cos_lat = np.cos(np.radians(max(abs(south), abs(north))))
+        dlon = km / (KM_PER_DEGREE_LAT * cos_lat) if cos_lat > 1e-9 else 360.0
+        if dlon >= 180.0:
+            west, east = -180.0, 180.0
+        else:
+            west = (lon - dlon + 180.0) % 360.0 - 180.0
+            east = (lon + dlon + 180.0) % 360.0 - 180.0
+        rows = self._candidates(south, west, north, east)
+        distance = haversine_km(lat, lon, self.lat[rows], self.lon[rows])
+        keep = distance <= km
+        rows, distance = rows[keep], distance[keep]
+        nearest = np.argsort(distance, kind="stable")
+        return rows[nearest], distance[nearest]
+
+
+_indexes: "OrderedDict[str, GridIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_grid_index(dataset: ColumnarDataset, lat_field: str = "latitude", lon_field: str = "longitude") -> GridIndex:
+    """Grid index for a saved dataset, built on first use and kept in a small LRU"""
+    key = f"{dataset.directory}:{lat_field}:{lon_field}"
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = GridIndex(_coordinates(dataset, lat_field), _coordinates(dataset, lon_field))
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > _CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def _select(
+    index: GridIndex,
+    n_rows: int,
+    bbox: Optional[Sequence[float]],
+    center: Optional[Sequence[float]],
+    radius_km: Optional[float],
+    limit: Optional[int],
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Matching row indices (nearest first for radius queries) and their distances"""
+    rows = None
+    distance = None
+    if center is not None and radius_km is not None:
+        rows, distance = index.radius(float(center[0]), float(center[1]), float(radius_km))
+    if bbox is not None:
+        in_box = index.bbox(*map(float, bbox))
+        if rows is None:
+            rows = in_box
+        else:
+            keep = np.isin(rows, in_box)
+            rows, distance = rows[keep], distance[keep]
+    if rows is None:
+        rows = np.arange(n_rows)
+    if limit is not None:
+        rows = rows[:limit]
+        distance = distance[:limit] if distance is not None else None
+    return rows, distance
+
+
+def _row_coordinates(rows: Sequence[Dict[str, Any]], field: str) -> np.ndarray:
+    out = np.full(len(rows), np.nan)
+    for i, row in enumerate(rows):
+        try:
+            out[i] = float(row.get(field))
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def spatial_filter(
+    dataset: Union[ColumnarDataset, Sequence[Dict[str, Any]]],
+    on_rows: Callable[[List[Dict[str, Any]]], None],
+    bbox: Optional[Sequence[float]] = None,
+    center: Optional[Sequence[float]] = None,
+    radius_km: Optional[float] = None,
+    limit: Optional[int] = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Pass the dataset's rows inside `bbox` ([west, south, east, north]) and/or
+    within `radius_km` of `center` ([lat, lon]) to on_rows, in batches.
+    Radius results come nearest first with a distance_km column. Returns
+    the number of rows passed. `dataset` may also be a plain list of rows
+    (a dataset only available as JSON); its index is not cached.
+    """
+    if isinstance(dataset, ColumnarDataset):
+        index = get_grid_index(dataset)
+        n_rows = dataset.rows
+        take = dataset.take
+    else:
+        index = GridIndex(_row_coordinates(dataset, "latitude"), _row_coordinates(dataset, "longitude"))
+        n_rows = len(dataset)
+
+        def take(indices: np.ndarray) -> List[Dict[str, Any]]:
+            return [dict(dataset[i]) for i in indices.tolist()]
+    rows, distance = _select(index, n_rows, bbox, center, radius_km, limit)
+
+    for start in range(0, len(rows), batch_size):
+        batch = take(rows[start:start + batch_size])
+        if distance is not None:
+            for row, km in zip(batch, distance[start:start + batch_size].tolist()):
+                row["distance_km"] = round(km, 3)
+        on_rows(batch)
+    return int(len(rows))
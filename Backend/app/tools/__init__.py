@@ -1,5 +1,7 @@
 from .geomaterial import collect_geomaterials
 from .locality import collect_localities
+from .mineral_localities import collect_mineral_localities
+from .geomaterial_aggregate import aggregate_geomaterials
 # from .visualizing import (
 #     histogram_plot,
 #     network_plot,
@@ -10,6 +12,8 @@ from .data_profile import profile_sample_data
 __all__ = [
     "collect_geomaterials",
     "collect_localities",
+    "collect_mineral_localities",
+    "aggregate_geomaterials",
     # "histogram_plot",
     # "network_plot",
     # "heatmap_plot",
@@ -1,43 +1,10 @@
 # Backend/app/tools/data_profile.py
-import json
 from pathlib import Path
-from typing import Any, Dict, List
-from collections import Counter
 
 from app.models.tool_response_models import ProfileToolResponse, ProfileToolArgs
-
-
-def _rows_data_profile(rows: List[Dict[str, Any]], max_keys: int = 50, sample_n: int = 5) -> Dict[str, Any]:
-    if not rows:
-        return {"ok": False, "error": "No rows to profile"}
-
-    keys = list({k for r in rows for k in r.keys()})[:max_keys]
-
-    def infer_type(values):
-        vals = [v for v in values if v is not None]
-        if not vals:
-            return "unknown"
-        if all(isinstance(v, (int, float)) for v in vals):
-            return "quantitative"
-        if all(isinstance(v, str) and len(v) >= 8 and "-" in v for v in vals[:20]):
-            return "temporal"
-        return "nominal"
-
-    summary = {}
-    for k in keys:
-        col = [r.get(k) for r in rows]
-        t = infer_type(col)
-        non_null = [v for v in col if v is not None]
-        uniq = len(set(map(str, non_null[:2000])))
-        top = Counter(map(str, non_null[:2000])).most_common(5)
-        summary[k] = {
-            "type": t,
-            "unique_approx": uniq,
-            "top_values": top,
-            "sample": [r.get(k) for r in rows[:sample_n]],
-        }
-
-    return {"ok": True, "columns": summary, "row_count": len(rows)}
+from app.services.artifact_store import get_artifact_manager
+from app.utils.column_profile import cached_profile
+from app.utils.columnar import ColumnarDataset
 
 
 def profile_sample_data(args: ProfileToolArgs) -> ProfileToolResponse:
@@ -49,6 +16,10 @@ def profile_sample_data(args: ProfileToolArgs) -> ProfileToolResponse:
     Vega-Lite chart generation.
 
     The profile is intentionally compact and avoids loading full datasets into LLM state.
+    Column statistics come from fixed-size sketches, so memory use does not grow with the
+    dataset and every row is counted. The profile is saved next to the dataset, so asking
+    again for the same file (e.g. for a second chart) is a single small file read; it is
+    recomputed automatically when the dataset changes.
     It is designed to support downstream visualization planning (e.g., by the
     `vega_plot_planner` agent) without exposing raw data values.
 
@@ -56,13 +27,20 @@ def profile_sample_data(args: ProfileToolArgs) -> ProfileToolResponse:
     - JSON object with a top-level key `results`
     - `results` must be a list of dictionaries (rows)
 
-    For each column (up to `max_keys`):
+    All columns are profiled together in a single streaming pass, in the
+    dataset's own column order. For each column (up to `max_keys`):
     - Infers semantic data type:
         - "quantitative"  → numeric values
         - "temporal"      → date-like strings
         - "nominal"       → categorical / string values
-    - Estimates cardinality
-    - Extracts the most frequent values
+        - "list"          → list values (e.g. `elements`); exploded so that the
+                            unique count and top values are per item, with the
+                            items' type and the list-length distribution
+        - "object"        → nested objects; their fields are profiled as
+                            dotted-path columns ("parent.field"), listed in `fields`
+    - Counts missing values and, for numbers, min / max / mean and quantiles
+    - Estimates cardinality (HyperLogLog)
+    - Extracts the most frequent values (Space-Saving)
     - Provides a small sample of example values
 
     Args:
@@ -85,8 +63,10 @@ def profile_sample_data(args: ProfileToolArgs) -> ProfileToolResponse:
                 - row_count: total number of rows
                 - columns: per-column summaries including:
                     - inferred type
+                    - null count, min / max / mean and p05..p95 quantiles (numeric columns)
                     - approximate unique count
-                    - top values
+                    - top values (list columns: top items)
+                    - items / length summaries (list columns)
                     - example samples
 
     Usage Notes:
@@ -118,19 +98,16 @@ def profile_sample_data(args: ProfileToolArgs) -> ProfileToolResponse:
             }
     """
     p = Path(args.sample_data_path)
-    if not p.exists():
+    if not p.exists() and ColumnarDataset.open(p) is None:
         return ProfileToolResponse(status="ERROR", error=f"File not found: {args.sample_data_path}", profile=None)
 
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
+        profile = cached_profile(
+            p, max_keys=args.max_keys, sample_n=args.sample_n, on_saved=get_artifact_manager().register
+        )
     except Exception as e:
         return ProfileToolResponse(status="ERROR", error=f"Failed to parse JSON: {e}", profile=None)
 
-    rows = data.get("results") if isinstance(data, dict) else None
-    if not isinstance(rows, list):
-        return ProfileToolResponse(status="ERROR", error="Invalid format: expected dict with 'results' list", profile=None)
-
-    profile = _rows_data_profile(rows, max_keys=args.max_keys, sample_n=args.sample_n)
     if not profile.get("ok"):
         return ProfileToolResponse(status="ERROR", error=profile.get("error", "Unknown error"), profile=profile)
 
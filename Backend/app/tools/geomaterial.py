@@ -1,14 +1,15 @@
 # Backend/app/tools/geomaterial.py
-import json
 from typing import Optional, List, Dict, Any
 
 from app.models import MindatGeoMaterialQuery
-from app.services import get_geomaterial_api
-from app.utils import to_params, CONTENTS_DIR
+from app.services import get_geomaterial_api, get_geomaterial_mirror, get_dataset_store, get_reference_data
+from app.utils import to_params
+from app.utils.projection import GEOMATERIAL_VISUALISATION_FIELDS, resolve_fields
+from app.config.settings import settings
 from app.models import GeomaterialToolResponse
 
 
-def collect_geomaterials(
+async def collect_geomaterials(
     # ── IMA status ──────────────────────────────────────────
     ima: Optional[bool] = None,
     ima_status: Optional[List[int]] = None,
@@ -46,8 +47,11 @@ def collect_geomaterials(
     # ── Misc ────────────────────────────────────────────────
     entrytype: Optional[List[int]] = None,
     expand: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
     limit: int = 100,
     offset: int = 0,
+    fetch_all: bool = False,
+    max_rows: Optional[int] = None,
 ) -> GeomaterialToolResponse:
     """
     Query Mindat /v1/geomaterials using flat filter parameters.
@@ -66,9 +70,19 @@ def collect_geomaterials(
     density_min   : minimum density g/cm³
     density_max   : maximum density g/cm³
     opticaltype   : "Biaxial", "Isotropic", or "Uniaxial"
+    expand        : fields to expand, e.g. ["locality"]; expanded fields are
+                    always kept in the saved records
+    fields        : record fields to keep, e.g. ["name", "hmin", "csystem"];
+                    default is the visualisation column set, ["*"] = full records;
+                    spacegroup (kept by default) / spacegroupset also get a *_name label column
     limit         : max records (default 100)
+    fetch_all     : True = fetch every matching record across all pages
+                    (use for "all ..." questions instead of paging manually)
+    max_rows      : cap on records when fetch_all is True (default 5000)
     """
     try:
+        fields = resolve_fields(fields, GEOMATERIAL_VISUALISATION_FIELDS, expand)
+
         # Build the Pydantic query using Python field names (aliases map to API params)
         query = MindatGeoMaterialQuery(
             ima=ima,
@@ -100,6 +114,7 @@ def collect_geomaterials(
             bi_max=bi_max,
             entrytype=entrytype,
             expand=expand,
+            fields=fields,
             limit=limit,
             offset=offset,
         )
@@ -107,26 +122,58 @@ def collect_geomaterials(
         query_dict = to_params(query)
         print("query dict for API call:", query_dict)
         geomaterial_api = get_geomaterial_api()
-        response = geomaterial_api.search_geomaterials_minerals(query_dict)
 
-        if not isinstance(response, dict) or not response.get("results"):
+        # each result is saved under its own content-addressed dataset id;
+        # an identical recent query reuses the dataset already on disk
+        store = get_dataset_store()
+        dataset_key = {"params": query_dict, "fetch_all": fetch_all, "max_rows": max_rows}
+        saved = store.lookup("mindat_geomaterial", dataset_key)
+        if saved is not None:
             return GeomaterialToolResponse(
-                status="ERROR",
-                error=f"No results found or invalid response. Details: {response}",
-                file_path="",
+                status="OK",
+                error=None,
+                file_path=str(saved["path"]),
+                dataset_id=saved["dataset_id"],
             )
 
-        sample_dir = CONTENTS_DIR / "sample_data"
-        sample_dir.mkdir(parents=True, exist_ok=True)
-        output_file_path = sample_dir / "mindat_geomaterial_response.json"
+        # kept space group ids get a readable label column as rows are written
+        enrich = get_reference_data().enricher(fields)
 
-        with open(output_file_path, "w", encoding="utf-8") as f:
-            json.dump(response, f, indent=4, ensure_ascii=False)
+        # answer from the local mirror when it covers every filter in the query
+        local_rows = (max_rows or settings.mindat_max_rows) if fetch_all else None
+        local = get_geomaterial_mirror().query(query, max_rows=local_rows)
+        if local is not None and local["results"]:
+            with store.writer("mindat_geomaterial", dataset_key, fields=fields, enrich=enrich) as writer:
+                writer.write_rows(local["results"])
+                writer.count = local["count"]
+            return GeomaterialToolResponse(
+                status="OK",
+                error=None,
+                file_path=str(writer.path),
+                dataset_id=writer.dataset_id,
+            )
 
+        # stream rows straight to disk as they come off the wire; a plain
+        # search is the same fetch capped at its limit
+        with store.writer("mindat_geomaterial", dataset_key, fields=fields, enrich=enrich) as writer:
+            summary = await geomaterial_api.fetch_all_geomaterials(
+                query_dict,
+                max_rows=max_rows if fetch_all else query_dict["limit"],
+                on_page=writer.write_rows,
+            )
+            writer.count = summary.get("count")
+
+        if not writer.rows_written:
+            return GeomaterialToolResponse(
+                status="ERROR",
+                error=f"No results found for the given filters. Details: {summary}",
+                file_path="",
+            )
         return GeomaterialToolResponse(
             status="OK",
             error=None,
-            file_path=str(output_file_path),
+            file_path=str(writer.path),
+            dataset_id=writer.dataset_id,
         )
 
     except Exception as e:
@@ -0,0 +1,55 @@
+# Backend/app/tools/geomaterial_aggregate.py
+from typing import Optional, List, Dict, Any
+
+from app.models import MindatGeomaterialFilters, AggregateToolResponse
+from app.services.dataset_store import get_dataset_store
+from app.services.geomaterial_aggregates import count_geomaterials_by
+
+
+async def aggregate_geomaterials(
+    group_by: str,
+    values: Optional[List[Any]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> AggregateToolResponse:
+    """
+    Count Mindat geomaterials per value of one property WITHOUT downloading
+    the records. Use it for "how many ..." / "distribution of ..." questions.
+
+    Parameters
+    ----------
+    group_by : one of csystem, diapheny, lustretype, cleavagetype, fracturetype,
+               tenacity, opticaltype, opticalsign, entrytype, el_inc
+    values   : values to count. Required for entrytype (e.g. [0, 1, 7]) and
+               el_inc (e.g. ["Fe", "Cu"]); the other facets default to every
+               allowed value
+    filters  : the same filters collect_geomaterials accepts,
+               e.g. {"hmin": 7} or {"el_inc": ["Fe"], "ima": True};
+               unknown keys are an error
+    """
+    try:
+        query = MindatGeomaterialFilters(**(filters or {}))
+        result = await count_geomaterials_by(query, group_by, values=values)
+
+        dataset_key = {"group_by": group_by, "values": values, "filters": query.model_dump(exclude_none=True)}
+        with get_dataset_store().writer("mindat_geomaterial_counts", dataset_key) as writer:
+            writer.write_rows([{group_by: value, "count": n} for value, n in result["counts"].items()])
+            writer.count = result["total"]
+        print(f"[Geomaterial Aggregate] {group_by}: {len(result['counts'])} groups from {result['source']}")
+
+        return AggregateToolResponse(
+            status="OK",
+            error=None,
+            file_path=str(writer.path),
+            dataset_id=writer.dataset_id,
+            group_by=group_by,
+            total=result["total"],
+            counts={str(k): v for k, v in result["counts"].items()},
+            source=result["source"],
+        )
+
+    except Exception as e:
+        return AggregateToolResponse(
+            status="ERROR",
+            error=f"Critical Error in aggregate_geomaterials: {str(e)}",
+            file_path="",
+        )
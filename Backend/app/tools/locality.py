@@ -1,49 +1,161 @@
 # Backend/app/tools/locality.py
-import json
-from typing import Optional, List
+from typing import Optional, List, Union
 
 from app.models import MindatLocalityQuery
+from collections import Counter
+
+from app.services.dataset_store import DatasetStore, get_dataset_store
 from app.services.mindat_endpoints_services import get_locality_api
-from app.utils import to_params, CONTENTS_DIR
+from app.services.spatial_index import spatial_filter
+from app.utils import to_params
+from app.utils.columnar import ColumnarDataset
+from app.utils.dataset_io import read_rows
+from app.utils.projection import LOCALITY_VISUALISATION_FIELDS, resolve_fields
 from app.models import LocalityToolResponse
 
 
-def collect_localities(
-    country: Optional[str] = None,
+def _spatial_subset(
+    store: DatasetStore,
+    base: LocalityToolResponse,
+    bbox: Optional[List[float]],
+    center: Optional[List[float]],
+    radius_km: Optional[float],
+    limit: Optional[int],
+) -> LocalityToolResponse:
+    """
+    Save the localities of a collected dataset that fall inside bbox / the
+    radius. Filters the columnar copy, or the JSON file when eviction left
+    only that. When the collected dataset was capped below Mindat's count,
+    only the fetched localities were searched and the response says so.
+    """
+    source = ColumnarDataset.open(base.file_path)
+    if source is None:
+        source = read_rows(base.file_path)
+    spatial_key = {"base": base.dataset_id, "bbox": bbox, "center": center, "radius_km": radius_km, "limit": limit}
+    countries: Counter = Counter()
+
+    def write(rows):
+        countries.update(row.get("country") for row in rows)
+        writer.write_rows(rows)
+
+    with store.writer("mindat_locality", spatial_key) as writer:
+        spatial_filter(source, write, bbox=bbox, center=center, radius_km=radius_km, limit=limit)
+        writer.meta = {"per_country": dict(countries)}
+
+    warning = None
+    if base.truncated:
+        warning = (
+            f"Only the first {base.count} of {base.total_count} localities were searched; "
+            "raise max_rows or narrow the query (e.g. elements_inc) to cover the whole area."
+        )
+    if not writer.rows_written:
+        return LocalityToolResponse(
+            status="ERROR",
+            error=f"None of the {base.count} localities fetched lie inside the requested area." + (f" {warning}" if warning else ""),
+            file_path="",
+            total_count=base.total_count,
+            truncated=base.truncated,
+        )
+    return LocalityToolResponse(
+        status="OK",
+        error=None,
+        file_path=str(writer.path),
+        dataset_id=writer.dataset_id,
+        count=writer.rows_written,
+        country_counts=dict(countries),
+        failed_countries=base.failed_countries,
+        total_count=base.total_count,
+        truncated=base.truncated,
+        warning=warning,
+    )
+
+
+async def collect_localities(
+    country: Optional[Union[str, List[str]]] = None,
     description: Optional[str] = None,
     elements_inc: Optional[List[str]] = None,
     elements_exc: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
     limit: int = 100,
     offset: int = 0,
+    fetch_all: bool = False,
+    max_rows: Optional[int] = None,
+    bbox: Optional[List[float]] = None,
+    center: Optional[List[float]] = None,
+    radius_km: Optional[float] = None,
 ) -> LocalityToolResponse:
     """
     Query Mindat /v1/localities using individual filter parameters.
     Use this when the user asks to find mineral localities by country or elements.
 
-    A country name is required for useful results.
+    A country name is required for useful results. Several countries are
+    fetched concurrently in ONE call and merged into one dataset with a
+    `country` column.
 
     Parameters
     ----------
-    country       : full English country name, e.g. "Brazil", "Japan", "USA"
+    country       : full English country name, e.g. "Brazil", "Japan", "USA",
+                    or a list of them, e.g. ["Canada", "Australia", "Peru"]
     description   : locality description contains this string
     elements_inc  : elements that MUST be present at the locality, e.g. ["Au","Ag"]
     elements_exc  : elements that must NOT be present, e.g. ["Pb","Zn"]
+    fields        : record fields to keep, e.g. ["txt", "latitude", "longitude"];
+                    default is the visualisation column set, ["*"] = full records
     limit         : max records to return (default 100)
     offset        : pagination offset (default 0)
+    fetch_all     : True = fetch every matching locality across all pages
+    max_rows      : cap on records when fetch_all is True (default 5000);
+                    limit / max_rows apply per country
+    bbox          : only localities inside [west, south, east, north] degrees,
+                    e.g. [-109.05, 36.99, -102.04, 41.0] for Colorado
+    center        : [latitude, longitude] for a radius search, e.g. [39.74, -104.99]
+    radius_km     : only localities within this many km of center (nearest first,
+                    with a distance_km column)
+
+    With bbox / radius, the country's localities (up to max_rows) are
+    fetched once and filtered locally through a spatial grid index; limit
+    then caps the matches returned. If the country has more than max_rows
+    localities only the first max_rows are searched: the response then has
+    truncated=True and a warning.
     """
     try:
-        if not country:
+        countries = [country] if isinstance(country, str) else list(dict.fromkeys(c for c in country or [] if c))
+        if not countries:
             return LocalityToolResponse(
                 status="ERROR",
                 error="A country name is required to fetch locality data.",
                 file_path="",
             )
 
+        spatial = bbox is not None or radius_km is not None
+        if radius_km is not None and (not center or len(center) != 2):
+            return LocalityToolResponse(
+                status="ERROR",
+                error="radius_km needs center=[latitude, longitude].",
+                file_path="",
+            )
+        if bbox is not None and len(bbox) != 4:
+            return LocalityToolResponse(
+                status="ERROR",
+                error="bbox must be [west, south, east, north].",
+                file_path="",
+            )
+        # spatial filters run over the whole (capped) country, then cap the matches
+        output_limit = (max_rows if fetch_all else limit) if spatial else None
+        fetch_all = fetch_all or spatial
+
+        fields = resolve_fields(fields, LOCALITY_VISUALISATION_FIELDS)
+        if fields is not None:
+            # the merged dataset is grouped by the queried country, and
+            # spatial filters need the coordinates
+            required = ["country", "latitude", "longitude"] if spatial else ["country"]
+            fields = [*fields, *(f for f in required if f not in fields)]
         query = MindatLocalityQuery(
-            country=country,
+            country=countries if len(countries) > 1 else countries[0],
             description=description,
             elements_inc=elements_inc,
             elements_exc=elements_exc,
+            fields=fields,
             limit=limit,
             offset=offset,
         )
@@ -51,27 +163,58 @@ def collect_localities(
         print(f"Locality Tool called with: {query}")
         query_dict = to_params(query)
         locality_api = get_locality_api()
-        response = locality_api.search_localities(query_dict)
 
-        if not isinstance(response, dict) or not response.get("results"):
+        # each result is saved under its own content-addressed dataset id;
+        # an identical recent query reuses the dataset already on disk
+        store = get_dataset_store()
+        dataset_key = {"params": query_dict, "fetch_all": fetch_all, "max_rows": max_rows}
+        saved = store.lookup("mindat_locality", dataset_key)
+        if saved is not None:
+            base = LocalityToolResponse(
+                status="OK",
+                error=None,
+                file_path=str(saved["path"]),
+                dataset_id=saved["dataset_id"],
+                count=saved["rows"],
+                country_counts=saved["meta"].get("per_country", {}),
+                total_count=saved.get("count"),
+                truncated=(saved.get("count") or 0) > saved["rows"],
+            )
+            return _spatial_subset(store, base, bbox, center, radius_km, output_limit) if spatial else base
+
+        # stream rows straight to disk as they come off the wire (countries
+        # are fetched concurrently); a plain search is the same fetch capped
+        # at its limit
+        with store.writer("mindat_locality", dataset_key, fields=fields) as writer:
+            summary = await locality_api.fetch_localities_by_country(
+                query_dict,
+                countries,
+                on_page=writer.write_rows,
+                max_rows=max_rows if fetch_all else query_dict["limit"],
+            )
+            writer.count = summary.get("count")
+            writer.meta = {"per_country": summary["per_country"]}
+
+        if not writer.rows_written:
             return LocalityToolResponse(
                 status="ERROR",
-                error=f"No results found for the given query. Response: {response}",
+                error=f"No results found for the given query. Response: {summary}",
                 file_path="",
             )
-
-        sample_dir = CONTENTS_DIR / "sample_data"
-        sample_dir.mkdir(parents=True, exist_ok=True)
-        output_file_path = sample_dir / "mindat_locality_response.json"
-
-        with open(output_file_path, "w", encoding="utf-8") as f:
-            json.dump(response, f, indent=4, ensure_ascii=False)
-
-        return LocalityToolResponse(
+        if summary["failed"]:
+            print(f"[Locality Tool] Countries that failed: {summary['failed']}")
+        base = LocalityToolResponse(
             status="OK",
             error=None,
-            file_path=str(output_file_path),
+            file_path=str(writer.path),
+            dataset_id=writer.dataset_id,
+            count=writer.rows_written,
+            country_counts=summary["per_country"],
+            failed_countries=summary["failed"],
+            total_count=summary.get("count"),
+            truncated=(summary.get("count") or 0) > writer.rows_written,
         )
+        return _spatial_subset(store, base, bbox, center, radius_km, output_limit) if spatial else base
 
     except Exception as e:
         return LocalityToolResponse(
@@ -0,0 +1,84 @@
+# Backend/app/tools/mineral_localities.py
+from typing import Optional, List
+
+from app.models import LocalityToolResponse
+from app.services.dataset_store import get_dataset_store
+from app.services.locality_join import join_mineral_localities
+from app.utils.dataset_io import read_rows
+
+
+async def collect_mineral_localities(
+    sample_data_path: Optional[str] = None,
+    mineral_ids: Optional[List[int]] = None,
+    max_minerals: int = 50,
+    max_localities_per_mineral: int = 100,
+) -> LocalityToolResponse:
+    """
+    Find where minerals occur: fetch the localities of every mineral in a
+    geomaterial result (or an explicit id list) concurrently and save them
+    as ONE merged dataset. Use it right after collect_geomaterials for
+    "where are ... minerals found?" questions.
+
+    Parameters
+    ----------
+    sample_data_path           : file_path returned by collect_geomaterials
+    mineral_ids                : Mindat geomaterial ids (instead of a file)
+    max_minerals               : cap on minerals joined (default 50)
+    max_localities_per_mineral : cap on localities per mineral (default 100)
+    """
+    try:
+        if mineral_ids:
+            minerals = [{"id": i} for i in mineral_ids]
+        elif sample_data_path:
+            minerals = read_rows(sample_data_path, columns=["id", "name"], limit=max_minerals)
+        else:
+            return LocalityToolResponse(
+                status="ERROR",
+                error="Pass the geomaterial sample_data_path or a list of mineral_ids.",
+                file_path="",
+            )
+
+        minerals = minerals[:max_minerals]
+        store = get_dataset_store()
+        dataset_key = {
+            "mineral_ids": [m.get("id") for m in minerals],
+            "max_localities_per_mineral": max_localities_per_mineral,
+        }
+        saved = store.lookup("mindat_mineral_localities", dataset_key)
+        if saved is not None:
+            return LocalityToolResponse(
+                status="OK",
+                error=None,
+                file_path=str(saved["path"]),
+                dataset_id=saved["dataset_id"],
+                count=saved["rows"],
+            )
+
+        with store.writer("mindat_mineral_localities", dataset_key) as writer:
+            summary = await join_mineral_localities(
+                minerals,
+                writer,
+                max_localities_per_mineral=max_localities_per_mineral,
+            )
+        print(f"[Locality Join] {summary['minerals']} minerals -> {summary['rows']} rows, failed: {summary['failed']}")
+
+        if not summary["rows"]:
+            return LocalityToolResponse(
+                status="ERROR",
+                error=f"No localities found for the given minerals. Details: {summary['failed'] or 'no occurrences'}",
+                file_path="",
+            )
+        return LocalityToolResponse(
+            status="OK",
+            error=None,
+            file_path=str(writer.path),
+            dataset_id=writer.dataset_id,
+            count=summary["rows"],
+        )
+
+    except Exception as e:
+        return LocalityToolResponse(
+            status="ERROR",
+            error=f"Critical Error in collect_mineral_localities: {str(e)}",
+            file_path="",
+        )
@@ -8,7 +8,7 @@ from app.utils.custom_prompts import (
     vega_plot_generator_prompt
 )
 from app.utils.helpers import to_params, extract_file_paths, convert_path_to_url, CONTENTS_DIR   
-from app.utils.plot_sepcs import build_histogram_vega_spec
+from app.utils.plot_sepcs import build_chart_spec, build_histogram_vega_spec, resolve_chart
 
 __all__ = [
     "AlchemistException", 
@@ -25,4 +25,6 @@ __all__ = [
     "convert_path_to_url",
     "CONTENTS_DIR", 
     "build_histogram_vega_spec", 
+    "build_chart_spec",
+    "resolve_chart",
     ]
\ No newline at end of file
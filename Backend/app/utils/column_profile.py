@@ -0,0 +1,602 @@
+# Backend/app/utils/column_profile.py
+# Single-pass, bounded-memory column profiler for saved datasets
+import hashlib
+import os
+import uuid
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.utils.columnar import CONTENT_KEY, SCHEMA_FILE, ColumnarDataset, columnar_path
+from app.utils.json_stream import ResultsStreamParser
+from app.utils.serialization import dump_file, dumps, dumps_bytes, load_file
+from app.utils.sketches import (
+    SEED_JSON,
+    SEED_TEXT,
+    HyperLogLog,
+    KLLSketch,
+    SpaceSaving,
+    hash_bytes,
+    hash_numbers,
+    hash_texts,
+)
+
+
+# rows handed to the accumulators at a time
+BATCH_SIZE = 5000
+
+# JSON datasets at least this large are streamed rather than parsed whole
+_STREAM_MIN_BYTES = 32 << 20
+
+# bytes read from a JSON dataset per parser feed
+_CHUNK_BYTES = 1 << 20
+
+# bump when the profile format changes, so saved profiles are recomputed
+PROFILE_VERSION = 2
+
+# leading values checked for date-like strings
+_TEMPORAL_HEAD = 20
+
+# nesting levels of dict fields profiled as dotted-path columns
+_MAX_DEPTH = 3
+
+# list lengths reported in a list column's length distribution
+_LENGTH_TOP_K = 10
+
+# numeric quantiles reported by the profile
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+QUANTILE_NAMES = ("p05", "p25", "p50", "p75", "p95")
+
+_NUMBER_TYPES = {int, float}
+_SCALAR_TYPES = {int, float, str}
+_NESTED_TYPES = {list, dict}
+_NONE_TYPE = type(None)
+
+
+def _is_temporal(value: Any) -> bool:
+    return isinstance(value, str) and len(value) >= 8 and "-" in value
+
+
+def _as_numbers(values: Sequence[Any], types: set) -> np.ndarray:
+    if types == {int}:
+        try:
+            return np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    return np.asarray(values, dtype=np.float64)
+
+
+# hashes of booleans: their JSON text, as in a mixed column
+_BOOL_HASHES = hash_texts(["false", "true"], SEED_JSON)
+
+
+class ColumnProfile:
+    """
+    Running summary of one column in bounded memory: value / null counts,
+    numeric min, max and mean, plus mergeable sketches of the distinct
+    count (HyperLogLog), the most frequent values (Space-Saving) and
+    numeric quantiles (KLL). Values are fed in batches: Python lists
+    (update), typed arrays (update_array) or raw text from a columnar
+    dataset (update_text). Every value is reduced to a 64-bit hash once
+    and all sketches work on the hashes.
+
+    List values are exploded: their items feed an `items` profile and
+    their lengths a `lengths` profile. Dict values are only counted; the
+    DatasetProfiler profiles their fields as dotted-path columns.
+    """
+
+    def __init__(self, sample_n: int = 5, top_k: int = 5, capacity: int = 64):
+        self.sample_n = sample_n
+        self.top_k = top_k
+        self.count = 0
+        self.nulls = 0
+        self.numeric = 0
+        self.lists = 0
+        self.objects = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.total = 0.0
+        self.distinct = HyperLogLog()
+        self.heavy = SpaceSaving(capacity)
+        self.quantiles = KLLSketch()
+        self.items: Optional[ColumnProfile] = None
+        self.lengths: Optional[ColumnProfile] = None
+        self.sample: List[Any] = []
+        self._head = 0
+        self._temporal = True
+
+    def add_missing(self, n: int) -> None:
+        """n rows without this column (e.g. rows seen before it first appeared)"""
+        self._add_sample([None] * min(n, self.sample_n - len(self.sample)))
+        self.count += n
+        self.nulls += n
+
+    def _add_sample(self, values: Sequence[Any]) -> None:
+        if len(self.sample) < self.sample_n:
+            self.sample.extend(values[:self.sample_n - len(self.sample)])
+
+    def _add_numbers(self, numbers: np.ndarray) -> None:
+        if not numbers.size:
+            return
+        self.numeric += int(numbers.size)
+        low, high = numbers.min().item(), numbers.max().item()
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self.total += float(numbers.sum(dtype=np.float64))
+        self.quantiles.add(numbers)
+
+    def _add_hashes(self, hashes: np.ndarray, value_at: Callable[[int], Any]) -> None:
+        self.distinct.add(hashes)
+        self.heavy.add(hashes, value_at)
+
+    def _check_temporal(self, present: Sequence[Any]) -> None:
+        if self._temporal and self._head < _TEMPORAL_HEAD:
+            head = present[:_TEMPORAL_HEAD - self._head]
+            self._head += len(head)
+            self._temporal = all(map(_is_temporal, head))
+
+    def _list_profiles(self) -> None:
+        if self.items is None:
+            self.items = ColumnProfile(0, self.top_k)
+            self.lengths = ColumnProfile(0, _LENGTH_TOP_K)
+
+    def _add_nested(self, present: Sequence[Any], types: set) -> None:
+        """Count the dicts of a batch and explode its lists into items and lengths"""
+        if dict in types:
+            self.objects += len(present) if types == {dict} else sum(type(v) is dict for v in present)
+        if list in types:
+            lists = present if types == {list} else [v for v in present if type(v) is list]
+            self.lists += len(lists)
+            self._list_profiles()
+            self.lengths.update(list(map(len, lists)))
+            self.items.update(list(chain.from_iterable(lists)))
+
+    def update(self, values: Sequence[Any]) -> None:
+        self._add_sample(values)
+        self.count += len(values)
+        types = set(map(type, values))
+        if _NONE_TYPE in types:
+            types.discard(_NONE_TYPE)
+            present = [v for v in values if v is not None]
+        else:
+            present = values
+        self.nulls += len(values) - len(present)
+        if not present:
+            return
+        if types & _NESTED_TYPES:
+            self._add_nested(present, types)
+            types -= _NESTED_TYPES
+            if not types:
+                return
+            present = [v for v in present if type(v) not in _NESTED_TYPES]
+        self._check_temporal(present)
+        if types <= _NUMBER_TYPES:
+            numbers = _as_numbers(present, types)
+            self._add_numbers(numbers)
+            self._add_hashes(hash_numbers(numbers), present.__getitem__)
+        elif types == {str}:
+            # strings repeat a lot (systems, statuses): hash each distinct one once
+            counted = Counter(present)
+            texts = list(counted)
+            hashes = hash_texts(texts)
+            self.distinct.add(hashes)
+            self.heavy.add_counts(hashes, np.fromiter(counted.values(), np.int64, len(texts)), texts.__getitem__)
+        elif not types & _SCALAR_TYPES:
+            self._add_hashes(hash_texts(list(map(dumps, present)), SEED_JSON), present.__getitem__)
+        else:
+            self._add_hashes(self._mixed_hashes(present), present.__getitem__)
+
+    def _mixed_hashes(self, present: Sequence[Any]) -> np.ndarray:
+        """Hashes of a batch mixing numbers, strings and other values (by JSON text)"""
+        groups: Dict[str, List[int]] = {"number": [], "str": [], "json": []}
+        for i, value in enumerate(present):
+            kind = type(value)
+            groups["number" if kind in _NUMBER_TYPES else "str" if kind is str else "json"].append(i)
+        hashes = np.empty(len(present), dtype=np.uint64)
+        if groups["number"]:
+            numbers = np.asarray([present[i] for i in groups["number"]], dtype=np.float64)
+            self._add_numbers(numbers)
+            hashes[groups["number"]] = hash_numbers(numbers)
+        if groups["str"]:
+            hashes[groups["str"]] = hash_texts([present[i] for i in groups["str"]])
+        if groups["json"]:
+            hashes[groups["json"]] = hash_texts([dumps(present[i]) for i in groups["json"]], SEED_JSON)
+        return hashes
+
+    def update_array(self, values: np.ndarray, valid: Optional[np.ndarray]) -> None:
+        """A numeric or bool column slice; valid is its non-missing mask (None: all present)"""
+        if len(self.sample) < self.sample_n:
+            head = values[:self.sample_n - len(self.sample)].tolist()
+            ok = valid[:len(head)].tolist() if valid is not None else [True] * len(head)
+            self._add_sample([v if k else None for v, k in zip(head, ok)])
+        self.count += len(values)
+        present = values[valid] if valid is not None else values
+        self.nulls += len(values) - len(present)
+        if not len(present):
+            return
+        self._temporal = False
+        if present.dtype == np.bool_:
+            self._add_hashes(_BOOL_HASHES[present.astype(np.intp)], lambda i: bool(present[i]))
+        else:
+            self._add_numbers(present)
+            self._add_hashes(hash_numbers(present), lambda i: present[i].item())
+
+    def update_text(self, data: np.ndarray, offsets: np.ndarray, valid: Optional[np.ndarray], head: List[Any]) -> None:
+        """
+        A str column slice as raw UTF-8 bytes and offsets
+        (ColumnarDataset.text); only the values that make it into the
+        sample or the top values are decoded. head holds the slice's
+        leading decoded values, for the sample and the temporal check.
+        """
+        self._add_sample(head)
+        self._check_temporal([v for v in head if v is not None])
+        rows = len(offsets) - 1
+        self.count += rows
+        hashes = hash_bytes(data, offsets, SEED_TEXT)
+        present = np.flatnonzero(valid) if valid is not None else None
+        if present is not None:
+            hashes = hashes[present]
+        self.nulls += rows - len(hashes)
+
+        def value_at(i: int) -> Any:
+            j = int(present[i]) if present is not None else i
+            return data[offsets[j]:offsets[j + 1]].tobytes().decode("utf-8")
+
+        self._add_hashes(hashes, value_at)
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """Fold in the profile of the same column over later rows"""
+        self._add_sample(other.sample)
+        self.count += other.count
+        self.nulls += other.nulls
+        self.numeric += other.numeric
+        self.lists += other.lists
+        self.objects += other.objects
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.total += other.total
+        if self._head < _TEMPORAL_HEAD and other._head:
+            self._temporal = self._temporal and other._temporal
+            self._head = min(self._head + other._head, _TEMPORAL_HEAD)
+        elif self._head < _TEMPORAL_HEAD and not other._temporal:
+            self._temporal = False
+        self.distinct.merge(other.distinct)
+        self.heavy.merge(other.heavy)
+        self.quantiles.merge(other.quantiles)
+        if other.items is not None:
+            self._list_profiles()
+            self.items.merge(other.items)
+            self.lengths.merge(other.lengths)
+
+    def result(self) -> Dict[str, Any]:
+        present = self.count - self.nulls
+        if not present:
+            kind = "unknown"
+        elif self.lists == present:
+            kind = "list"
+        elif self.objects == present:
+            kind = "object"
+        elif self.numeric == present:
+            kind = "quantitative"
+        elif self._temporal and not self.lists + self.objects:
+            kind = "temporal"
+        else:
+            kind = "nominal"
+        # a list column is summarised by its items
+        values = self.items if kind == "list" else self
+        summary: Dict[str, Any] = {
+            "type": kind,
+            "null_count": self.nulls,
+            "unique_approx": min(values.distinct.estimate(), values.count - values.nulls),
+            "top_values": values.heavy.top(self.top_k),
+            "sample": self.sample,
+        }
+        if kind == "object":
+            # described by its dotted-path field columns instead
+            del summary["unique_approx"], summary["top_values"]
+        if self.numeric:
+            summary.update(min=self.min, max=self.max, mean=self.total / self.numeric)
+            summary["quantiles"] = dict(zip(QUANTILE_NAMES, self.quantiles.quantiles(QUANTILES)))
+        if self.lists:
+            items = self.items.result()
+            summary["items"] = {"type": items["type"], "count": self.items.count - self.items.nulls}
+            for key in ("min", "max", "mean", "quantiles"):
+                if key in items:
+                    summary["items"][key] = items[key]
+            lengths = self.lengths
+            summary["length"] = {
+                "min": lengths.min,
+                "max": lengths.max,
+                "mean": lengths.total / lengths.numeric,
+                "distribution": sorted(lengths.heavy.top(_LENGTH_TOP_K)),
+            }
+        return summary
+
+
+class DatasetProfiler:
+    """
+    Profiles a dataset in one pass: each batch of rows updates every
+    column's ColumnProfile. Columns are profiled in first-seen order (the
+    dataset's own column order), up to max_keys of them. The fields of
+    dict values become dotted-path columns ("parent.field", up to
+    _MAX_DEPTH levels deep), fed from the same batch and listed right
+    after their parent. Top-level columns take slots first: a dotted
+    column only gets a slot none of them needs, and the newest one gives
+    its slot up to a top-level column first seen in a later batch.
+    """
+
+    def __init__(self, max_keys: int = 50, sample_n: int = 5, top_k: int = 5):
+        self.max_keys = max_keys
+        self.sample_n = sample_n
+        self.top_k = top_k
+        self.rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        # parent column -> its dotted child columns; None -> top-level columns
+        self._children: Dict[Optional[str], List[str]] = {None: []}
+
+    def _column(self, name: str, parent: Optional[str] = None) -> Optional[ColumnProfile]:
+        column = self.columns.get(name)
+        if column is None and len(self.columns) >= self.max_keys and parent is None:
+            self._evict_child()
+        if column is None and len(self.columns) < self.max_keys:
+            column = self.columns[name] = ColumnProfile(self.sample_n, self.top_k)
+            column.add_missing(self.rows)
+            self._children.setdefault(parent, []).append(name)
+        return column
+
+    def _evict_child(self) -> None:
+        """Free the slot of the newest dotted column for a top-level one"""
+        top = set(self._children[None])
+        name = next((name for name in reversed(self.columns) if name not in top), None)
+        if name is None:
+            return
+        # the newest column was added after its own children, so it has none
+        del self.columns[name]
+        for children in self._children.values():
+            if name in children:
+                children.remove(name)
+                break
+
+    def _ordered(self, parent: Optional[str] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """(name, parent) of every column, each parent followed by its children"""
+        for name in self._children.get(parent, ()):
+            yield name, parent
+            yield from self._ordered(name)
+
+    def _add_columns(self, rows: List[Dict[str, Any]]) -> None:
+        if len(self._children[None]) >= self.max_keys:
+            return
+        last = None
+        for row in rows:
+            keys = row.keys()
+            if keys != last:
+                for name in keys:
+                    self._column(name)
+                last = keys
+
+    def _update_column(self, name: str, values: Sequence[Any], depth: int = 1) -> None:
+        """Feed one column's batch, then the fields of its dict values as child columns"""
+        column = self.columns[name]
+        objects = column.objects
+        column.update(values)
+        known = self._children.get(name, [])
+        if depth >= _MAX_DEPTH or (column.objects == objects and not known):
+            return
+        fields = dict.fromkeys(child[len(name) + 1:] for child in known)
+        if column.objects > objects:
+            for value in values:
+                if type(value) is dict:
+                    for key in value:
+                        fields.setdefault(key)
+        for field in fields:
+            child = f"{name}.{field}"
+            # skip a field whose dotted name is taken by another column
+            if child not in known and (child in self.columns or self._column(child, name) is None):
+                continue
+            self._update_column(child, [v.get(field) if type(v) is dict else None for v in values], depth + 1)
+
+    def update_rows(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        names = self._children[None]
+        if sum(map(len, rows)) != len(names) * len(rows):
+            self._add_columns(rows)
+        # transpose the batch: one tuple of values per top-level column
+        values = None
+        if len(names) > 1:
+            # every row holds (at least) the profiled columns
+            try:
+                values = zip(*map(itemgetter(*names), rows))
+            except KeyError:
+                pass
+        if values is None:
+            values = zip(*[tuple(map(row.get, names)) for row in rows])
+        for name, column_values in zip(list(names), values):
+            self._update_column(name, column_values)
+        self.rows += len(rows)
+
+    def update_columnar(self, dataset: ColumnarDataset, start: int, stop: int) -> None:
+        """Rows start:stop of a columnar dataset, read column by column"""
+        stop = min(stop, dataset.rows)
+        # claim the top-level slots before any dotted column, as update_rows does
+        for name in dataset.columns:
+            self._column(name)
+        for name in dataset.columns:
+            column = self.columns.get(name)
+            if column is None:
+                continue
+            kind = dataset.kind(name)
+            if kind in ("int", "float", "bool"):
+                valid = dataset.valid(name)[start:stop]
+                column.update_array(dataset.array(name)[start:stop], None if valid.all() else valid)
+            elif kind == "str":
+                data, offsets = map(np.asarray, dataset.text(name, start, stop))
+                valid = dataset.valid(name)[start:stop]
+                need = max(column.sample_n - len(column.sample), _TEMPORAL_HEAD - column._head)
+                head = dataset.values(name, start, min(stop, start + need)) if need > 0 else []
+                column.update_text(data, offsets, None if valid.all() else valid, head)
+            elif kind == "json":
+                # lists and objects: decoded in bulk to explode items and flatten fields
+                self._update_column(name, dataset.values(name, start, stop))
+            else:
+                column.add_missing(stop - start)
+        self.rows += max(stop - start, 0)
+
+    def merge(self, other: "DatasetProfiler") -> None:
+        """
+        Fold in the profile of the rows that follow this one's (the next
+        page or partition), as if they had been fed to this profiler
+        """
+        for name in other._children[None]:
+            self._column(name)
+        for name, parent in other._ordered():
+            if parent is not None and parent in self.columns:
+                self._column(name, parent)
+        for name, column in self.columns.items():
+            theirs = other.columns.get(name)
+            if theirs is None:
+                column.add_missing(other.rows)
+            else:
+                column.merge(theirs)
+        self.rows += other.rows
+
+    def result(self) -> Dict[str, Any]:
+        if not self.rows:
+            return {"ok": False, "error": "No rows to profile"}
+        columns = {}
+        for name, _ in self._ordered():
+            columns[name] = self.columns[name].result()
+            if self._children.get(name):
+                columns[name]["fields"] = self._children[name]
+        return {"ok": True, "columns": columns, "row_count": self.rows}
+
+
+def profile_dataset(
+    path: Union[str, Path],
+    max_keys: int = 50,
+    sample_n: int = 5,
+    top_k: int = 5,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Profile a saved dataset: its columnar copy when there is one (read in
+    row batches, numeric columns straight from the memory map), otherwise
+    the JSON file's `results` array, streamed through ResultsStreamParser
+    once the file is large. Raises FileNotFoundError / ValueError for a
+    missing or malformed file.
+    """
+    profiler = DatasetProfiler(max_keys=max_keys, sample_n=sample_n, top_k=top_k)
+    dataset = ColumnarDataset.open(path)
+    if dataset is not None:
+        for start in range(0, dataset.rows, batch_size):
+            profiler.update_columnar(dataset, start, start + batch_size)
+        return profiler.result()
+
+    if os.path.getsize(path) < _STREAM_MIN_BYTES:
+        data = load_file(path)
+        rows = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(rows, list) or any(not isinstance(row, dict) for row in rows):
+            raise ValueError("Invalid format: expected dict with 'results' list of objects")
+        for start in range(0, len(rows), batch_size):
+            profiler.update_rows(rows[start:start + batch_size])
+        return profiler.result()
+
+    parser = ResultsStreamParser()
+    pending: List[Dict[str, Any]] = []
+    with open(path, "rb") as f:
+        while not parser.done:
+            chunk = f.read(_CHUNK_BYTES)
+            rows = parser.feed(chunk, final=not chunk)
+            if any(not isinstance(row, dict) for row in rows):
+                raise ValueError("Invalid format: expected dict with 'results' list of objects")
+            pending.extend(rows)
+            if len(pending) >= batch_size or (parser.done and pending):
+                profiler.update_rows(pending)
+                pending = []
+            if not chunk:
+                break
+    return profiler.result()
+
+
+def _dataset_file(path: Path) -> Path:
+    """The columnar copy's schema when there is one, else the JSON file"""
+    schema = columnar_path(path) / SCHEMA_FILE
+    return schema if schema.exists() else path
+
+
+def _fingerprint(path: Path) -> str:
+    """
+    Content identity of a dataset: the content key DatasetStore records in
+    a published columnar copy, otherwise a hash of the dataset's bytes (the
+    JSON file, or the columnar copy's schema and column files), so a
+    rewrite is seen whatever its size and mtime
+    """
+    dataset = ColumnarDataset.open(path)
+    if dataset is not None:
+        key = dataset.meta.get(CONTENT_KEY)
+        if isinstance(key, str) and key:
+            return f"content:{key}"
+        files = sorted(dataset.directory.glob("*.npy"))
+        files.insert(0, dataset.directory / SCHEMA_FILE)
+    else:
+        files = [path]
+    digest = hashlib.sha256()
+    for file in files:
+        digest.update(file.name.encode("utf-8"))
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def _profile_path(path: Path, args: Dict[str, Any]) -> Path:
+    """Where a profile with these arguments is saved: inside the .columns directory, else beside the JSON file"""
+    key = hashlib.sha256(dumps_bytes({"version": PROFILE_VERSION, **args})).hexdigest()[:16]
+    target = _dataset_file(path)
+    if target.name == SCHEMA_FILE:
+        return target.parent / f"profile-{key}.json"
+    return path.with_name(f"{path.name.split('.', 1)[0]}.profile-{key}.json")
+
+
+def cached_profile(
+    path: Union[str, Path],
+    max_keys: int = 50,
+    sample_n: int = 5,
+    top_k: int = 5,
+    on_saved: Optional[Callable[[Path], None]] = None,
+) -> Dict[str, Any]:
+    """
+    profile_dataset, saved next to the dataset keyed by the profiler
+    arguments and reused (one small file read) for as long as the
+    dataset's fingerprint is unchanged. on_saved gets the path of a newly
+    written profile (e.g. to re-register the dataset's size).
+    """
+    path = Path(path)
+    args = {"max_keys": max_keys, "sample_n": sample_n, "top_k": top_k}
+    fingerprint = _fingerprint(path)
+    saved = _profile_path(path, args)
+    try:
+        entry = load_file(saved)
+        if entry["fingerprint"] == fingerprint:
+            return entry["profile"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    profile = profile_dataset(path, **args)
+    if profile.get("ok"):
+        tmp = saved.with_name(f".{saved.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            dump_file(tmp, {"fingerprint": fingerprint, "args": args, "profile": profile})
+            os.replace(tmp, saved)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            print(f"[Profile] Could not save profile for {path.name}: {e}")
+        else:
+            if on_saved is not None:
+                on_saved(saved)
+    return profile
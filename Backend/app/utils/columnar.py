@@ -0,0 +1,429 @@
+# Backend/app/utils/columnar.py
+# Column-per-file (.npy) copy of a saved dataset, memory-mapped on read
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.utils.serialization import dump_file, dumps, load_file, loads
+
+
+SCHEMA_FILE = "schema.json"
+
+# schema meta key holding a content hash of the dataset (set by DatasetStore)
+CONTENT_KEY = "content_key"
+
+
+def columnar_path(json_path: Union[str, Path]) -> Path:
+    """Directory holding the columnar copy of a dataset saved as json_path"""
+    return Path(json_path).with_suffix(".columns")
+
+
+def _kind(values: List[Any]) -> str:
+    """Storage kind of a column: int, float, bool, str, json or null"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return "null"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float"
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    return "json"
+
+
+def _encode_text(values: List[Any], kind: str) -> Dict[str, np.ndarray]:
+    """UTF-8 bytes of every value back to back plus an offsets array"""
+    encoded = [
+        b"" if v is None else (v if kind == "str" else dumps(v)).encode("utf-8")
+        for v in values
+    ]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        "data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "offsets": offsets,
+    }
+
+
+def _merge_kinds(kinds: Sequence[str]) -> str:
+    """Kind of a column whose chunks have the given kinds (same rules as _kind)"""
+    present = {k for k in kinds if k != "null"}
+    if not present:
+        return "null"
+    if len(present) == 1:
+        return present.pop()
+    if present <= {"int", "float"}:
+        return "float"
+    return "json"
+
+
+def _restore_ints(values: List[Any], is_int: List[bool]) -> List[Any]:
+    """Float column values back to int where the writer saw an int"""
+    return [int(v) if flag else v for v, flag in zip(values, is_int)]
+
+
+class ColumnarWriter:
+    """
+    Collect rows column by column and write them as one .npy file per column.
+
+    Numbers and booleans become typed arrays (readable zero-copy through a
+    memory map); strings and nested values become a UTF-8 byte array plus
+    offsets. Columns with missing values also get a `valid` mask, and a
+    float column holding some ints an `isint` mask so they read back as ints.
+
+    Rows are buffered only until `chunk_rows` have arrived; each chunk is
+    then encoded and spilled to .npy parts in a temporary directory, and
+    close() concatenates the parts of one column at a time into the final
+    files, so memory is bounded by a chunk rather than the whole dataset.
+    The directory is renamed into place once complete; abort() drops it.
+    """
+
+    def __init__(self, directory: Union[str, Path], chunk_rows: int = 4096):
+        self.directory = Path(directory)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        # column name -> index, in order of first appearance
+        self._names: Dict[str, int] = {}
+        # per spilled chunk: its row count and column index -> (kind, parts)
+        # for the columns that have a value in it
+        self._chunks: List[Tuple[int, Dict[int, Tuple[str, List[str]]]]] = []
+        self._buffer: Dict[str, List[Any]] = {}
+        self._buffered = 0
+        self._tmp: Optional[Path] = None
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            for key in row:
+                if key not in self._buffer:
+                    # a column first seen now is missing from the chunk's earlier rows
+                    self._buffer[key] = [None] * self._buffered
+                    self._names.setdefault(key, len(self._names))
+            for key, values in self._buffer.items():
+                values.append(row.get(key))
+            self._buffered += 1
+            self.rows += 1
+            if self._buffered >= self.chunk_rows:
+                self._spill()
+
+    def _tmp_dir(self) -> Path:
+        if self._tmp is None:
+            self._tmp = self.directory.with_name(f".{self.directory.name}.{uuid.uuid4().hex}.tmp")
+            self._tmp.mkdir(parents=True)
+        return self._tmp
+
+    def _spill(self) -> None:
+        """Encode the buffered rows and write them as chunk parts"""
+        if not self._buffered:
+            return
+        tmp = self._tmp_dir()
+        j = len(self._chunks)
+        columns: Dict[int, Tuple[str, List[str]]] = {}
+        for name, values in self._buffer.items():
+            i = self._names[name]
+            column = self._arrays(values)
+            if column["kind"] == "null":
+                # all missing in this chunk: the same as not being there
+                continue
+            for part, array in column["arrays"].items():
+                np.save(tmp / f"k{j}.c{i}.{part}.npy", array)
+            columns[i] = (column["kind"], sorted(column["arrays"]))
+        self._chunks.append((self._buffered, columns))
+        self._buffer = {}
+        self._buffered = 0
+
+    def _arrays(self, values: List[Any], kind: Optional[str] = None) -> Dict[str, Any]:
+        kind = kind or _kind(values)
+        valid = np.array([v is not None for v in values], dtype=bool)
+        arrays: Dict[str, np.ndarray] = {}
+        if kind == "int":
+            try:
+                arrays["values"] = np.array([0 if v is None else v for v in values], dtype=np.int64)
+            except OverflowError:
+                kind = "json"
+        if kind == "float":
+            arrays["values"] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            # ints stored in a float column are marked so they read back as ints
+            is_int = np.array([type(v) is int for v in values], dtype=bool)
+            if is_int.any():
+                arrays["isint"] = is_int
+        elif kind == "bool":
+            arrays["values"] = np.array([bool(v) for v in values], dtype=bool)
+        elif kind in ("str", "json"):
+            arrays.update(_encode_text(values, kind))
+        if kind != "null" and not valid.all():
+            arrays["valid"] = valid
+        return {"kind": kind, "arrays": arrays}
+
+    def _chunk_part(self, j: int, i: int, part: str) -> np.ndarray:
+        return np.load(self._tmp / f"k{j}.c{i}.{part}.npy")
+
+    def _chunk_values(self, j: int, i: int, kind: str, n: int) -> List[Any]:
+        """A spilled chunk column back as Python values (for a kind change)"""
+        parts = self._chunks[j][1][i][1]
+        valid = self._chunk_part(j, i, "valid").tolist() if "valid" in parts else [True] * n
+        if kind in ("int", "float", "bool"):
+            out = self._chunk_part(j, i, "values").tolist()
+            if "isint" in parts:
+                out = _restore_ints(out, self._chunk_part(j, i, "isint").tolist())
+        else:
+            data = self._chunk_part(j, i, "data").tobytes()
+            bounds = self._chunk_part(j, i, "offsets").tolist()
+            out = [data[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+            if kind == "json":
+                out = [loads(v) if ok else None for v, ok in zip(out, valid)]
+        return [v if ok else None for v, ok in zip(out, valid)]
+
+    def _write_mask(self, i: int, part: str, default: bool) -> None:
+        """Concatenate column i's bool `part` chunks (False where the column is absent, default where the part is)"""
+        mask = np.lib.format.open_memmap(self._tmp / f"c{i}.{part}.npy", mode="w+", dtype=bool, shape=(self.rows,))
+        start = 0
+        for j, (n, columns) in enumerate(self._chunks):
+            if i not in columns:
+                mask[start:start + n] = False
+            elif part in columns[i][1]:
+                mask[start:start + n] = self._chunk_part(j, i, part)
+            else:
+                mask[start:start + n] = default
+            start += n
+        mask.flush()
+        del mask
+
+    def _write_column(self, i: int) -> Dict[str, Any]:
+        """Concatenate column i's chunks into c{i}.<part>.npy; returns its kind and parts"""
+        tmp = self._tmp
+        kinds = [columns[i][0] if i in columns else "null" for _, columns in self._chunks]
+        kind = _merge_kinds(kinds)
+        if kind == "null":
+            return {"kind": kind, "parts": []}
+
+        # re-encode the chunks whose own kind differs from the column's
+        for j, ((n, columns), chunk_kind) in enumerate(zip(self._chunks, kinds)):
+            if chunk_kind not in (kind, "null"):
+                arrays = self._arrays(self._chunk_values(j, i, chunk_kind, n), kind)["arrays"]
+                for part in columns[i][1]:
+                    (tmp / f"k{j}.c{i}.{part}.npy").unlink()
+                for part, array in arrays.items():
+                    np.save(tmp / f"k{j}.c{i}.{part}.npy", array)
+                columns[i] = (kind, sorted(arrays))
+
+        parts = []
+        if any(i not in columns or "valid" in columns[i][1] for _, columns in self._chunks):
+            self._write_mask(i, "valid", default=True)
+            parts.append("valid")
+        if kind == "float" and any(i in columns and "isint" in columns[i][1] for _, columns in self._chunks):
+            self._write_mask(i, "isint", default=False)
+            parts.append("isint")
+
+        if kind in ("int", "float", "bool"):
+            dtype = {"int": np.int64, "float": np.float64, "bool": bool}[kind]
+            fill = np.nan if kind == "float" else 0
+            out = np.lib.format.open_memmap(tmp / f"c{i}.values.npy", mode="w+", dtype=dtype, shape=(self.rows,))
+            start = 0
+            for j, (n, columns) in enumerate(self._chunks):
+                out[start:start + n] = self._chunk_part(j, i, "values") if i in columns else fill
+                start += n
+            out.flush()
+            del out
+            return {"kind": kind, "parts": sorted(["values", *parts])}
+
+        lengths = [
+            int(self._chunk_part(j, i, "offsets")[-1]) if i in columns else 0
+            for j, (_, columns) in enumerate(self._chunks)
+        ]
+        data = np.lib.format.open_memmap(tmp / f"c{i}.data.npy", mode="w+", dtype=np.uint8, shape=(sum(lengths),))
+        offsets = np.lib.format.open_memmap(tmp / f"c{i}.offsets.npy", mode="w+", dtype=np.int64, shape=(self.rows + 1,))
+        offsets[0] = 0
+        start = byte = 0
+        for j, ((n, columns), length) in enumerate(zip(self._chunks, lengths)):
+            if i in columns:
+                data[byte:byte + length] = self._chunk_part(j, i, "data")
+                offsets[start + 1:start + n + 1] = self._chunk_part(j, i, "offsets")[1:] + byte
+            else:
+                offsets[start + 1:start + n + 1] = byte
+            start += n
+            byte += length
+        data.flush()
+        offsets.flush()
+        del data, offsets
+        return {"kind": kind, "parts": sorted(["data", "offsets", *parts])}
+
+    def close(self, meta: Optional[Dict[str, Any]] = None) -> Path:
+        """Write every column and the schema; returns the published directory"""
+        try:
+            self._spill()
+            tmp = self._tmp_dir()
+            schema_columns = []
+            for name, i in self._names.items():
+                column = self._write_column(i)
+                schema_columns.append({"name": name, **column})
+            for chunk_part in tmp.glob("k*.npy"):
+                chunk_part.unlink()
+            dump_file(tmp / SCHEMA_FILE, {"rows": self.rows, "meta": meta or {}, "columns": schema_columns})
+            try:
+                os.replace(tmp, self.directory)
+            except OSError:
+                # a concurrent writer already published this dataset
+                if not (self.directory / SCHEMA_FILE).exists():
+                    raise
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            self.abort()
+            raise
+        self._tmp = None
+        self._chunks = []
+        return self.directory
+
+    def abort(self) -> None:
+        """Drop everything spilled so far"""
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+            self._tmp = None
+        self._chunks = []
+        self._buffer = {}
+        self._buffered = 0
+
+
+class ColumnarDataset:
+    """
+    Read side of ColumnarWriter. Opening reads only the schema; each column's
+    arrays are memory-mapped the first time that column is used.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        schema = load_file(self.directory / SCHEMA_FILE)
+        self.rows: int = schema["rows"]
+        self.meta: Dict[str, Any] = schema.get("meta") or {}
+        self._schema = {c["name"]: (i, c) for i, c in enumerate(schema["columns"])}
+        self.columns: List[str] = list(self._schema)
+        self._maps: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> Optional["ColumnarDataset"]:
+        """The columnar copy for a dataset path (.json or .columns), or None"""
+        directory = Path(path)
+        if directory.suffix != ".columns":
+            directory = columnar_path(directory)
+        if not (directory / SCHEMA_FILE).exists():
+            return None
+        return cls(directory)
+
+    def kind(self, name: str) -> str:
+        return self._schema[name][1]["kind"]
+
+    def _part(self, name: str, part: str) -> Optional[np.ndarray]:
+        i, column = self._schema[name]
+        if part not in column["parts"]:
+            return None
+        file_name = f"c{i}.{part}.npy"
+        array = self._maps.get(file_name)
+        if array is None:
+            array = self._maps[file_name] = np.load(self.directory / file_name, mmap_mode="r")
+        return array
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Numeric/bool column as a read-only memory-mapped array (no copy).
+        Missing ints read as 0 and missing floats as NaN; see valid().
+        """
+        kind = self.kind(name)
+        if kind not in ("int", "float", "bool"):
+            raise TypeError(f"Column {name!r} is {kind}, not numeric")
+        return self._part(name, "values")
+
+    def valid(self, name: str) -> np.ndarray:
+        """Row mask of non-missing values"""
+        mask = self._part(name, "valid")
+        if mask is not None:
+            return mask
+        return np.full(self.rows, self.kind(name) != "null", dtype=bool)
+
+    def values(self, name: str, start: int = 0, stop: Optional[int] = None) -> List[Any]:
+        """Column values (rows start:stop) as Python objects, None where missing"""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        kind = self.kind(name)
+        if kind == "null" or start >= stop:
+            return [None] * max(stop - start, 0)
+        valid = self._part(name, "valid")
+        valid = valid[start:stop].tolist() if valid is not None else None
+        if kind in ("int", "float", "bool"):
+            out = self._part(name, "values")[start:stop].tolist()
+            is_int = self._part(name, "isint")
+            if is_int is not None:
+                out = _restore_ints(out, is_int[start:stop].tolist())
+        else:
+            data, offsets = self.text(name, start, stop)
+            data = data.tobytes()
+            bounds = offsets.tolist()
+            if kind == "json":
+                # one parse for the slice: the texts joined into a JSON array, missing rows as null
+                return loads(b"[" + b",".join([data[a:b] or b"null" for a, b in zip(bounds, bounds[1:])]) + b"]")
+            text = data.decode("utf-8")
+            # byte offsets index the decoded text directly when it is ASCII
+            source = text if len(text) == len(data) else data
+            out = [source[a:b] for a, b in zip(bounds, bounds[1:])]
+            if source is data:
+                out = [v.decode("utf-8") for v in out]
+        if valid is None:
+            return out
+        return [v if ok else None for v, ok in zip(out, valid)]
+
+    def text(self, name: str, start: int = 0, stop: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Raw UTF-8 bytes of a str/json column's rows start:stop and each row's
+        offsets into them (missing rows are empty), without decoding
+        """
+        stop = self.rows if stop is None else min(stop, self.rows)
+        offsets = self._part(name, "offsets")[start:stop + 1]
+        return self._part(name, "data")[offsets[0]:offsets[-1]], offsets - offsets[0]
+
+    def to_rows(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rows start:stop as dicts, restricted to `columns` (unknown names are skipped)"""
+        names = [c for c in (columns if columns is not None else self.columns) if c in self._schema]
+        stop = self.rows if stop is None else min(stop, self.rows)
+        cols = [self.values(name, start, stop) for name in names]
+        return [dict(zip(names, values)) for values in zip(*cols)] if names else [{} for _ in range(start, stop)]
+
+    def take(self, indices: np.ndarray, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Rows at arbitrary positions (e.g. an index lookup result) as dicts"""
+        indices = np.asarray(indices, dtype=np.int64)
+        names = [c for c in (columns if columns is not None else self.columns) if c in self._schema]
+        cols = []
+        for name in names:
+            kind = self.kind(name)
+            if kind == "null":
+                cols.append([None] * len(indices))
+                continue
+            valid = self._part(name, "valid")
+            valid = valid[indices].tolist() if valid is not None else [True] * len(indices)
+            if kind in ("int", "float", "bool"):
+                out = self._part(name, "values")[indices].tolist()
+                is_int = self._part(name, "isint")
+                if is_int is not None:
+                    out = _restore_ints(out, is_int[indices].tolist())
+            else:
+                offsets, data = self._part(name, "offsets"), self._part(name, "data")
+                out = [
+                    data[a:b].tobytes().decode("utf-8")
+                    for a, b in zip(offsets[indices].tolist(), offsets[indices + 1].tolist())
+                ]
+                if kind == "json":
+                    out = [loads(v) if ok else None for v, ok in zip(out, valid)]
+            cols.append([v if ok else None for v, ok in zip(out, valid)])
+        return [dict(zip(names, values)) for values in zip(*cols)] if names else [{} for _ in indices]
+
+    def iter_batches(self, batch_size: int = 1000, columns: Optional[Sequence[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        for start in range(0, self.rows, batch_size):
+            yield self.to_rows(columns, start, start + batch_size)
@@ -0,0 +1,103 @@
+# Backend/app/utils/dataset_io.py
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from app.utils.columnar import ColumnarDataset
+from app.utils.projection import project_rows
+from app.utils.serialization import dumps_bytes, load_file
+
+
+class ResultsWriter:
+    """
+    Incrementally write a Mindat-style {"results": [...], "count": N} JSON file.
+
+    Rows are appended page by page so a multi-page fetch never has to hold the
+    whole result set in memory. Readers only rely on the top-level "results"
+    list, which matches the shape of a single API response. With `fields`,
+    rows are projected to those columns before they are written.
+
+    The file is written under a temporary name and renamed into place on
+    success, so readers never see a partial dataset.
+    """
+
+    def __init__(self, path: Union[str, Path], fields: Optional[Sequence[str]] = None):
+        self.path = Path(path)
+        self.fields = fields
+        self.rows_written = 0
+        self.count: Optional[int] = None
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp")
+        self._fh = None
+
+    def __enter__(self) -> "ResultsWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self._tmp_path, "wb")
+        self._write(b'{"results":[')
+        return self
+
+    def _write(self, data: bytes) -> None:
+        self._fh.write(data)
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Append a batch of rows to the results array"""
+        rows = project_rows(rows, self.fields)
+        if not rows:
+            return
+        if self.rows_written:
+            self._write(b",")
+        self._write(b",".join(dumps_bytes(row) for row in rows))
+        self.rows_written += len(rows)
+
+    def _publish(self) -> None:
+        """Move the finished temporary file into place"""
+        os.replace(self._tmp_path, self.path)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            # never leave a truncated file behind for downstream readers
+            self._fh.close()
+            self._fh = None
+            self._tmp_path.unlink(missing_ok=True)
+            return
+        count = self.count if self.count is not None else self.rows_written
+        self._write(b'],"count":' + dumps_bytes(count) + b',"returned":' + dumps_bytes(self.rows_written) + b"}")
+        self._fh.close()
+        self._fh = None
+        self._publish()
+
+
+def read_rows(
+    path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rows of a saved dataset, from its columnar copy when there is one (only
+    the requested columns are read) and from the JSON file otherwise.
+    """
+    dataset = ColumnarDataset.open(path)
+    if dataset is not None:
+        return dataset.to_rows(columns, stop=limit)
+    data = load_file(path)
+    rows = data.get("results", []) if isinstance(data, dict) else data
+    rows = rows[:limit] if limit is not None else rows
+    return project_rows(rows, columns) if columns is not None else rows
+
+
+def ensure_json(path: Union[str, Path]) -> Path:
+    """
+    Make sure the JSON form of a dataset exists, generating it from the
+    columnar copy on first request. Returns the JSON path.
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    dataset = ColumnarDataset.open(path)
+    if dataset is None:
+        raise FileNotFoundError(path)
+    with ResultsWriter(path) as writer:
+        for rows in dataset.iter_batches():
+            writer.write_rows(rows)
+        writer.count = dataset.meta.get("count")
+    return path
@@ -136,7 +136,8 @@ def extract_file_paths(messages: List[BaseMessage]) -> Dict[str, Optional[str]]:
         content = getattr(msg, "content", "")
         
         # Look for JSON data files
-        if "mindat_geomaterial_response.json" in content or "mindat_locality_response.json" in content or "mindat_locality.json" in content:
+        # (saved datasets are named mindat_<kind>-<content hash>.json)
+        if re.search(r'mindat_[\w\-]+\.json', content):
             json_match = re.search(r'([/\w\-. ]+\.json)', content)
             if json_match:
                 data_path = json_match.group(1)
@@ -0,0 +1,142 @@
+# Backend/app/utils/json_stream.py
+# Incremental parser for paginated {"count": ..., "results": [...]} JSON bodies
+import codecs
+import json
+from typing import Any, Dict, List
+
+# parser states
+# (_NEXT_KEY / _NEXT_ITEM follow a comma, where a closing bracket is an error)
+_START, _KEY, _NEXT_KEY, _COLON, _VALUE, _AFTER_VALUE, _ARRAY_START, _ITEM, _NEXT_ITEM, _AFTER_ITEM, _DONE = range(11)
+_WHITESPACE = " \t\r\n"
+
+
+class JSONStreamError(ValueError):
+    """A truncated or malformed body fed to ResultsStreamParser"""
+
+
+class ResultsStreamParser:
+    """
+    Parse a top-level JSON object chunk by chunk, yielding the items of its
+    `array_key` list as soon as each one is complete.
+
+    Only the unparsed tail of the body is kept in memory (at most one
+    record plus the latest chunk), so a page costs the same regardless of
+    how many rows it holds. The object's other top-level values (count,
+    next, previous, ...) are collected in `meta`.
+    """
+
+    def __init__(self, array_key: str = "results"):
+        self.array_key = array_key
+        self.meta: Dict[str, Any] = {}
+        self.rows_parsed = 0
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._key = None
+        # a value that failed to parse is retried only once the buffer has
+        # doubled, so one huge record costs linear rather than quadratic time
+        self._min_available = 0
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Consume the next chunk of the body; returns the records it completed"""
+        try:
+            text = self._utf8.decode(chunk, final=final)
+        except UnicodeDecodeError as e:
+            raise JSONStreamError(f"Invalid UTF-8 in JSON body: {e}") from e
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        rows: List[Any] = []
+        if final or len(self._buf) >= self._min_available:
+            while self._step(rows, final):
+                pass
+        if final and (self._state != _DONE or self._buf[self._pos:].strip(_WHITESPACE)):
+            raise JSONStreamError("Truncated or malformed JSON response body")
+        self.rows_parsed += len(rows)
+        return rows
+
+    def _decode(self, final: bool):
+        """Decode one complete JSON value at the cursor, or return (None, False) if more input is needed"""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise JSONStreamError(str(e)) from e
+            self._min_available = 2 * (len(self._buf) - self._pos)
+            return None, False
+        # a number at the very end of the buffer may still continue
+        if end >= len(self._buf) and not final:
+            return None, False
+        self._min_available = 0
+        self._pos = end
+        return value, True
+
+    def _step(self, rows: List[Any], final: bool) -> bool:
+        buf = self._buf
+        while self._pos < len(buf) and buf[self._pos] in _WHITESPACE:
+            self._pos += 1
+        if self._pos >= len(buf):
+            return False
+        char = buf[self._pos]
+        state = self._state
+
+        if state == _START:
+            self._expect(char, "{")
+            self._state = _KEY
+        elif state in (_KEY, _NEXT_KEY):
+            if char == "}":
+                if state == _NEXT_KEY:
+                    raise JSONStreamError("Trailing comma in JSON object")
+                self._pos += 1
+                self._state = _DONE
+                return True
+            key, ok = self._decode(final)
+            if not ok:
+                return False
+            self._key = key
+            self._state = _COLON
+            return True
+        elif state == _COLON:
+            self._expect(char, ":")
+            self._state = _ARRAY_START if self._key == self.array_key else _VALUE
+        elif state == _ARRAY_START:
+            self._expect(char, "[")
+            self._state = _ITEM
+        elif state in (_VALUE, _ITEM, _NEXT_ITEM):
+            if state != _VALUE and char == "]":
+                if state == _NEXT_ITEM:
+                    raise JSONStreamError("Trailing comma in JSON array")
+                self._pos += 1
+                self._state = _AFTER_VALUE
+                return True
+            value, ok = self._decode(final)
+            if not ok:
+                return False
+            if state != _VALUE:
+                rows.append(value)
+                self._state = _AFTER_ITEM
+            else:
+                self.meta[self._key] = value
+                self._state = _AFTER_VALUE
+            return True
+        elif state == _AFTER_ITEM:
+            if char not in ",]":
+                raise JSONStreamError(f"Unexpected {char!r} in JSON array")
+            self._state = _NEXT_ITEM if char == "," else _AFTER_VALUE
+        elif state == _AFTER_VALUE:
+            if char not in ",}":
+                raise JSONStreamError(f"Unexpected {char!r} in JSON object")
+            self._state = _NEXT_KEY if char == "," else _DONE
+        else:
+            raise JSONStreamError(f"Unexpected {char!r} after JSON object")
+        self._pos += 1
+        return True
+
+    def _expect(self, char: str, wanted: str) -> None:
+        if char != wanted:
+            raise JSONStreamError(f"Expected {wanted!r} in JSON body, got {char!r}")
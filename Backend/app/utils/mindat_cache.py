@@ -0,0 +1,294 @@
+# Backend/app/utils/mindat_cache.py
+# Tiered response cache that sits in front of MindatAPIClient.get_data_from_api
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.helpers import CONTENTS_DIR
+from app.utils.redis_client import get_redis_client
+from app.utils.serialization import dumps_bytes, loads
+
+
+# Reference/lookup endpoints change rarely, so they can live much longer than
+# searches; search endpoints keep the configured MINDAT_CACHE_TTL
+DEFAULT_ENDPOINT_TTLS: Dict[str, int] = {
+    "crystalclasses": 7 * 24 * 3600,
+    "spacegroups": 7 * 24 * 3600,
+    "spacegroupsets": 7 * 24 * 3600,
+    "nickel-strunz-10": 7 * 24 * 3600,
+    "dana-8": 7 * 24 * 3600,
+    "locality-type": 7 * 24 * 3600,
+    "locality-status": 7 * 24 * 3600,
+    "locality-age": 7 * 24 * 3600,
+    "reference-types": 7 * 24 * 3600,
+}
+
+
+# List-typed params of MindatGeoMaterialQuery / MindatLocalityQuery, which
+# to_params() joins into CSV strings; any other string is kept whole
+LIST_PARAMS = frozenset({
+    "cleavagetype", "csystem", "diapheny", "el_exc", "el_inc", "entrytype", "expand",
+    "fracturetype", "ima_notes", "ima_status", "lustretype", "tenacity", "fields",
+    "country", "elements_exc", "elements_inc",
+})
+
+
+#####################################
+# Canonical cache keys
+#####################################
+def _canonical_value(value: Any, is_list: bool = False) -> str:
+    """Normalise one param value so equivalent filters produce the same string"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple, set)):
+        items = [_canonical_value(v) for v in value]
+        return ",".join(sorted(set(items)))
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    if is_list and "," in text:
+        return _canonical_value([part.strip() for part in text.split(",") if part.strip()])
+    if text.lower() in ("true", "false"):
+        return text.lower()
+    try:
+        number = float(text)
+        return str(int(number)) if number.is_integer() else repr(number)
+    except ValueError:
+        return text
+
+
+def canonical_params(params: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Canonical form of a to_params() output: sorted keys, None dropped,
+    booleans/numbers normalised and CSV lists (LIST_PARAMS) sorted and
+    de-duplicated.
+    """
+    return sorted(
+        (str(k), _canonical_value(v, str(k) in LIST_PARAMS))
+        for k, v in (params or {}).items()
+        if v is not None
+    )
+
+
+def make_cache_key(endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+    """Stable cache key for an endpoint + param set"""
+    payload = json.dumps([endpoint, canonical_params(params)], separators=(",", ":"))
+    return f"mindat:{endpoint}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+#####################################
+# Cache tiers
+#####################################
+class LRUTier:
+    """
+    In-process LRU tier bounded by entry count and by the result rows it
+    holds, so caching the pages of one large fetch cannot keep the whole
+    result set in memory. A page larger than max_rows is not kept here.
+    """
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256, max_rows: int = 20_000):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.rows = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        results = value.get("results") if isinstance(value, dict) else None
+        return len(results) if isinstance(results, list) else 1
+
+    def _drop(self, key: str) -> None:
+        del self._data[key]
+        self.rows -= self._sizes.pop(key, 0)
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            self._drop(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        if key in self._data:
+            self._drop(key)
+        size = self._size(value)
+        if size > self.max_rows:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._sizes[key] = size
+        self.rows += size
+        while len(self._data) > self.max_entries or self.rows > self.max_rows:
+            self._drop(next(iter(self._data)))
+            self.evictions += 1
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.rows = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskTier:
+    """
+    Persistent tier backed by diskcache (survives restarts). diskcache is
+    blocking SQLite + file I/O, so every call runs in a worker thread.
+    diskcache does not count its evictions, so this tier reports none.
+    """
+    name = "disk"
+
+    def __init__(self, directory: Path, size_limit: int = 512 * 1024 * 1024):
+        import diskcache
+
+        self._cache = diskcache.Cache(str(directory), size_limit=size_limit)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._cache.get, key)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await asyncio.to_thread(self._cache.set, key, value, expire=ttl)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._cache.clear)
+
+
+class RedisTier:
+    """
+    Shared tier so the FastAPI backend and the MCP server see each other's hits.
+    Accepts any redis.asyncio-compatible client (fakeredis works for tests).
+    Entries expire through Redis TTLs; evictions under Redis' maxmemory
+    policy are not visible per client, so none are reported.
+    """
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "alchemist:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        return loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.client.set(self.prefix + key, dumps_bytes(value), ex=ttl)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}mindat:*"):
+            await self.client.delete(key)
+
+
+#####################################
+# Tiered cache
+#####################################
+class MindatResponseCache:
+    """
+    Read-through cache over several tiers (fastest first).
+    A hit in a slower tier is promoted into the faster ones. Tier failures
+    (e.g. Redis unavailable) are logged and treated as misses so the cache
+    can never break a Mindat request.
+    """
+
+    def __init__(
+        self,
+        tiers: List[Any],
+        default_ttl: int = 3600,
+        endpoint_ttls: Optional[Dict[str, int]] = None,
+    ):
+        self.tiers = tiers
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = {**DEFAULT_ENDPOINT_TTLS, **(endpoint_ttls or {})}
+        self.hits: Dict[str, int] = {tier.name: 0 for tier in tiers}
+        self.misses = 0
+        self.errors = 0
+
+    def ttl_for(self, endpoint: str) -> int:
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[Any]:
+        key = make_cache_key(endpoint, params)
+        for i, tier in enumerate(self.tiers):
+            try:
+                value = await tier.get(key)
+            except Exception as e:
+                self.errors += 1
+                print(f"[Mindat Cache] {tier.name} tier get failed: {e}")
+                continue
+            if value is not None:
+                self.hits[tier.name] += 1
+                for faster in self.tiers[:i]:
+                    await self._safe_set(faster, key, value, self.ttl_for(endpoint))
+                return value
+        self.misses += 1
+        return None
+
+    async def set(self, endpoint: str, params: Optional[Dict[str, Any]], value: Any) -> None:
+        key = make_cache_key(endpoint, params)
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+        for tier in self.tiers:
+            await self._safe_set(tier, key, value, ttl)
+
+    async def _safe_set(self, tier: Any, key: str, value: Any, ttl: int) -> None:
+        try:
+            await tier.set(key, value, ttl)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Mindat Cache] {tier.name} tier set failed: {e}")
+
+    async def clear(self) -> None:
+        for tier in self.tiers:
+            await tier.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "hits_by_tier": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            # only tiers that can count them (the in-process LRU)
+            "evictions": {tier.name: tier.evictions for tier in self.tiers if hasattr(tier, "evictions")},
+            "errors": self.errors,
+        }
+
+
+def build_mindat_cache(config=None) -> Optional[MindatResponseCache]:
+    """Build the cache tiers enabled in settings (None if caching is off)"""
+    if config is None:
+        # imported lazily: app.config imports the client, which imports this module
+        from app.config.settings import settings as config
+
+    if not config.mindat_cache_enabled:
+        return None
+
+    tiers: List[Any] = [LRUTier(max_entries=config.mindat_cache_max_entries, max_rows=config.mindat_cache_max_rows)]
+
+    cache_dir = Path(config.mindat_cache_dir) if config.mindat_cache_dir else CONTENTS_DIR / "cache" / "mindat"
+    try:
+        tiers.append(DiskTier(cache_dir, size_limit=config.mindat_cache_disk_bytes))
+    except Exception as e:
+        print(f"[Mindat Cache] Disk tier disabled: {e}")
+
+    redis_client = get_redis_client(config)
+    if redis_client is not None:
+        tiers.append(RedisTier(redis_client))
+
+    return MindatResponseCache(
+        tiers,
+        default_ttl=config.mindat_cache_ttl,
+        endpoint_ttls=config.mindat_cache_endpoint_ttls,
+    )
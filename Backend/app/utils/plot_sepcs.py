@@ -1,6 +1,7 @@
 # Backend/app/utils/plot_sepcs.py
 from __future__ import annotations
 
+import re
 from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 
@@ -36,3 +37,336 @@ def build_histogram_vega_spec(
         },
     }
     return spec, chart_data
+
+
+# ----------------------------------------------
+# Deterministic chart builders
+# ----------------------------------------------
+# Specs follow the vega_plot_generator conventions: Vega-Lite v5, no
+# embedded data ("data": {"name": "table"}, bound to the dataset rows by
+# the client), and aggregation done in transforms.
+
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+
+def _base_spec(title: str, width: Any = "container", height: int = 400) -> Dict[str, Any]:
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "title": title,
+        "data": {"name": "table"},
+        "width": width,
+        "height": height,
+    }
+
+
+def _item_field(field: str) -> str:
+    """Name of the flattened item of a list field (elements -> element)"""
+    name = field.rsplit(".", 1)[-1]
+    return name[:-1] if name.endswith("s") and len(name) > 1 else f"{name}_item"
+
+
+def _top_n_transform(field: str, top_n: int) -> List[Dict[str, Any]]:
+    """Count rows per value of field and keep the top_n values"""
+    return [
+        {"filter": f"isValid(datum[{field!r}])"},
+        {"aggregate": [{"op": "count", "as": "count"}], "groupby": [field]},
+        {"window": [{"op": "row_number", "as": "rank"}], "sort": [{"field": "count", "order": "descending"}]},
+        {"filter": f"datum.rank <= {top_n}"},
+    ]
+
+
+def build_element_histogram_spec(field: str = "elements", title: Optional[str] = None, top_n: int = 20) -> Dict[str, Any]:
+    """Bar chart of the top_n most frequent items of a list field (e.g. elements)"""
+    item = _item_field(field)
+    spec = _base_spec(title or f"Top {top_n} {item.capitalize()}s")
+    spec["transform"] = [{"flatten": [field], "as": [item]}, *_top_n_transform(item, top_n)]
+    spec["mark"] = {"type": "bar", "tooltip": True}
+    spec["encoding"] = {
+        "x": {"field": item, "type": "nominal", "sort": "-y", "axis": {"labelAngle": -45}},
+        "y": {"field": "count", "type": "quantitative", "title": "Count"},
+    }
+    return spec
+
+
+def build_numeric_histogram_spec(field: str, title: Optional[str] = None, maxbins: int = 30) -> Dict[str, Any]:
+    """Histogram of a quantitative field in at most maxbins bins"""
+    spec = _base_spec(title or f"Distribution of {field}")
+    spec["mark"] = {"type": "bar", "tooltip": True}
+    spec["encoding"] = {
+        "x": {"field": field, "type": "quantitative", "bin": {"maxbins": maxbins}},
+        "y": {"aggregate": "count", "type": "quantitative", "title": "Count"},
+    }
+    return spec
+
+
+def build_bar_spec(field: str, title: Optional[str] = None, top_n: int = 20) -> Dict[str, Any]:
+    """Row counts of the top_n values of a categorical field"""
+    spec = _base_spec(title or f"Count by {field}")
+    spec["transform"] = _top_n_transform(field, top_n)
+    spec["mark"] = {"type": "bar", "tooltip": True}
+    spec["encoding"] = {
+        "x": {"field": field, "type": "nominal", "sort": "-y", "axis": {"labelAngle": -45}},
+        "y": {"field": "count", "type": "quantitative", "title": "Count"},
+    }
+    return spec
+
+
+def build_scatter_spec(
+    x: str,
+    y: str,
+    color: Optional[str] = None,
+    label: Optional[str] = None,
+    title: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Scatter of two quantitative fields, optionally coloured by a nominal one"""
+    spec = _base_spec(title or f"{y} vs {x}")
+    spec["mark"] = {"type": "point", "filled": True, "opacity": 0.7}
+    encoding: Dict[str, Any] = {
+        "x": {"field": x, "type": "quantitative", "scale": {"zero": False}},
+        "y": {"field": y, "type": "quantitative", "scale": {"zero": False}},
+        "tooltip": [{"field": f, "type": "quantitative"} for f in (x, y)],
+    }
+    if color:
+        encoding["color"] = {"field": color, "type": "nominal"}
+        encoding["tooltip"].append({"field": color, "type": "nominal"})
+    if label:
+        encoding["tooltip"].insert(0, {"field": label, "type": "nominal"})
+    spec["encoding"] = encoding
+    return spec
+
+
+def build_locality_map_spec(
+    latitude: str = "latitude",
+    longitude: str = "longitude",
+    color: Optional[str] = None,
+    label: Optional[str] = None,
+    title: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Locality points on a world outline (the outline layers carry their own data)"""
+    spec = _base_spec(title or "Mineral Localities", width=700)
+    spec["projection"] = {"type": "equalEarth"}
+    points: Dict[str, Any] = {
+        "mark": {"type": "circle", "size": 30, "opacity": 0.7},
+        "encoding": {
+            "longitude": {"field": longitude, "type": "quantitative"},
+            "latitude": {"field": latitude, "type": "quantitative"},
+            "tooltip": [
+                {"field": latitude, "type": "quantitative"},
+                {"field": longitude, "type": "quantitative"},
+            ],
+        },
+    }
+    if color:
+        points["encoding"]["color"] = {"field": color, "type": "nominal"}
+    if label:
+        points["encoding"]["tooltip"].insert(0, {"field": label, "type": "nominal"})
+    spec["layer"] = [
+        {"data": {"sphere": True}, "mark": {"type": "geoshape", "fill": "#1f2937"}},
+        {"data": {"graticule": True}, "mark": {"type": "geoshape", "stroke": "#374151", "strokeWidth": 0.5, "fill": None}},
+        points,
+    ]
+    return spec
+
+
+def build_heatmap_spec(
+    field: str,
+    field_type: str,
+    system: str = "csystem",
+    title: Optional[str] = None,
+    maxbins: int = 20,
+) -> Dict[str, Any]:
+    """
+    Row counts by crystal system (x) and a property (y): quantitative
+    properties are binned, list properties (e.g. elements) flattened
+    """
+    spec = _base_spec(title or f"Crystal system by {field}")
+    y: Dict[str, Any] = {"field": field, "type": "nominal"}
+    if field_type == "quantitative":
+        y = {"field": field, "type": "quantitative", "bin": {"maxbins": maxbins}}
+    elif field_type == "list":
+        item = _item_field(field)
+        spec["transform"] = [{"flatten": [field], "as": [item]}]
+        y = {"field": item, "type": "nominal"}
+    spec["mark"] = {"type": "rect", "tooltip": True}
+    spec["encoding"] = {
+        "x": {"field": system, "type": "nominal", "title": "Crystal system"},
+        "y": y,
+        "color": {"aggregate": "count", "type": "quantitative", "title": "Count"},
+    }
+    return spec
+
+
+# ----------------------------------------------
+# Resolving a chart request against a data profile
+# ----------------------------------------------
+
+# a chart is only built when the query asks for a visualization
+_VISUAL_PATTERN = r"\b(plot|chart|graph|histogram|heat ?map|map|scatter|visuali[sz]e|draw)"
+
+# chart kind named in the query, first match wins
+_CHART_PATTERNS = (
+    ("heatmap", r"\bheat ?map"),
+    ("scatter", r"\bscatter|\bvs\b|\bversus\b|\bagainst\b|\bcorrelat"),
+    ("map", r"\bmaps?\b|\bgeograph"),
+    ("histogram", r"\bhistogram|\bdistribution|\bfrequenc"),
+    ("bar", r"\bbar\b|\bbars\b|\bcount|\bhow many\b|\bnumber of\b|\bbreakdown\b"),
+)
+
+# "y vs x" phrasing: the first field named goes on the y axis
+_Y_FIRST_PATTERN = r"\bvs\b|\bversus\b|\bagainst\b"
+
+# query words for Mindat fields -> candidate columns (the first one profiled is used)
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "crystal system": ("csystem",),
+    "hardness": ("hmin", "hmax"),
+    "min hardness": ("hmin",),
+    "minimum hardness": ("hmin",),
+    "max hardness": ("hmax",),
+    "maximum hardness": ("hmax",),
+    "density": ("dmeas", "dcalc", "density_min", "density_max"),
+    "refractive index": ("rimin", "ri_min", "rimax", "ri_max"),
+    "element": ("elements",),
+    "lustre": ("lustretype",),
+    "luster": ("lustretype",),
+    "transparency": ("diapheny",),
+    "cleavage": ("cleavagetype",),
+    "country": ("country_name", "country"),
+    "ima status": ("ima_status_name", "ima_status"),
+    "strunz": ("strunz10ed1",),
+}
+
+_LATITUDE_FIELDS = ("latitude", "lat")
+_LONGITUDE_FIELDS = ("longitude", "lon", "lng", "long")
+_LABEL_FIELDS = ("name", "txt")
+
+
+# a field next to a comparison is a filter on the data ("hardness above 5",
+# "more than 3 elements"), not the field to chart
+_COMPARISON = r"above|below|over|under|greater|less|more|fewer|higher|lower|at (?:least|most)|between|exceed\w*|[<>=≤≥]"
+_FILTER_AFTER = rf"^\s*(?:(?:is|are|of)\s+)?(?:{_COMPARISON})"
+_FILTER_BEFORE = rf"(?:{_COMPARISON})(?:\s+than)?\s*-?\d[\d.]*\s+$"
+
+# "by X", "per X", "of X": the field the chart is about
+_MARKER_BEFORE = r"\b(?:by|per|of)\s+(?:the\s+|each\s+|their\s+)?$"
+
+
+def _mentions(text: str, types: Dict[str, str]) -> List[Tuple[int, int, str]]:
+    """(start, end, field) of every profiled field named in the (lower-cased) query, in query order"""
+    phrases: Dict[str, str] = {}
+    for name in types:
+        phrases.setdefault(name.lower(), name)
+        phrases.setdefault(re.sub(r"[._]", " ", name.lower()), name)
+    for phrase, candidates in FIELD_ALIASES.items():
+        field = next((c for c in candidates if c in types), None)
+        if field is not None:
+            phrases.setdefault(phrase, field)
+    # longest phrases first, so "country name" is not also read as "name"
+    taken = [False] * len(text)
+    found = []
+    for phrase in sorted(phrases, key=len, reverse=True):
+        for match in re.finditer(rf"\b{re.escape(phrase)}s?\b", text):
+            if not any(taken[match.start():match.end()]):
+                taken[match.start():match.end()] = [True] * (match.end() - match.start())
+                found.append((match.start(), match.end(), phrases[phrase]))
+    return sorted(found)
+
+
+def _is_filter(text: str, start: int, end: int) -> bool:
+    return bool(re.search(_FILTER_AFTER, text[end:]) or re.search(_FILTER_BEFORE, text[:start]))
+
+
+def _first_field(types: Dict[str, str], names: Tuple[str, ...], kind: str) -> Optional[str]:
+    return next((n for n in names if types.get(n) == kind), None)
+
+
+def is_chart_request(query: str) -> bool:
+    """Whether the query asks for a visualization at all"""
+    return re.search(_VISUAL_PATTERN, query.lower()) is not None
+
+
+def resolve_chart(query: str, profile: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Chart kind and fields for a request, when both follow from the query
+    and the dataset profile (profile_sample_data output): {"chart": kind,
+    **builder arguments}. None when the request is ambiguous or unusual,
+    so the caller can hand it to the vega_plot_generator agent.
+    """
+    columns = (profile or {}).get("columns") or {}
+    types = {name: column.get("type") for name, column in columns.items()}
+    text = query.lower()
+    if not types or not is_chart_request(text):
+        return None
+    chart = next((kind for kind, pattern in _CHART_PATTERNS if re.search(pattern, text)), None)
+    if chart is None and re.search(r"\blocalit|\blocation", text):
+        chart = "map"
+    mentions = [m for m in _mentions(text, types) if not _is_filter(text, m[0], m[1])]
+    fields = list(dict.fromkeys(field for _, _, field in mentions))
+    numeric = [f for f in fields if types[f] == "quantitative"]
+    nominal = [f for f in fields if types[f] == "nominal"]
+    label = next((n for n in _LABEL_FIELDS if types.get(n) == "nominal" and n not in fields), None)
+
+    if chart == "heatmap":
+        others = [f for f in fields if f != "csystem" and types[f] in ("quantitative", "nominal", "list")]
+        if "csystem" not in fields or not others:
+            return None
+        return {"chart": "heatmap", "field": others[0], "field_type": types[others[0]], "system": "csystem"}
+
+    if chart == "scatter":
+        if len(numeric) < 2:
+            return None
+        y, x = numeric[:2] if re.search(_Y_FIRST_PATTERN, text) else numeric[1::-1]
+        return {"chart": "scatter", "x": x, "y": y, "color": nominal[0] if nominal else None, "label": label}
+
+    if chart == "map":
+        latitude = _first_field(types, _LATITUDE_FIELDS, "quantitative")
+        longitude = _first_field(types, _LONGITUDE_FIELDS, "quantitative")
+        if latitude is None or longitude is None:
+            return None
+        return {
+            "chart": "map",
+            "latitude": latitude,
+            "longitude": longitude,
+            "color": nominal[0] if nominal else None,
+            "label": label,
+        }
+
+    # histogram, bar or a plain "plot of X": one field, or the one field
+    # marked by "by", "per" or "of" when several are named
+    candidates = [f for f in fields if types[f] in ("list", "quantitative", "nominal")]
+    if len(candidates) > 1:
+        marked, previous = [], None
+        for start, end, field in mentions:
+            # "of hardness and density" marks both
+            joined = previous is not None and re.fullmatch(r"\s*(?:,|and|or|,\s*and)\s*", text[previous:start])
+            if re.search(_MARKER_BEFORE, text[:start]) or joined:
+                marked.append(field)
+                previous = end
+            else:
+                previous = None
+        candidates = [f for f in candidates if f in marked]
+    if len(candidates) != 1:
+        return None
+    field = candidates[0]
+    if types[field] == "list":
+        return {"chart": "element_histogram", "field": field}
+    if types[field] == "quantitative":
+        return {"chart": "numeric_histogram", "field": field}
+    return {"chart": "bar", "field": field}
+
+
+_BUILDERS = {
+    "element_histogram": build_element_histogram_spec,
+    "numeric_histogram": build_numeric_histogram_spec,
+    "bar": build_bar_spec,
+    "scatter": build_scatter_spec,
+    "map": build_locality_map_spec,
+    "heatmap": build_heatmap_spec,
+}
+
+
+def build_chart_spec(query: str, profile: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Vega-Lite spec for a common chart request (see resolve_chart), or None"""
+    resolved = resolve_chart(query, profile)
+    if resolved is None:
+        return None
+    return _BUILDERS[resolved.pop("chart")](**resolved)
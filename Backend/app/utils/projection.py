@@ -0,0 +1,62 @@
+# Backend/app/utils/projection.py
+# Column projection for collected Mindat records
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# Columns the profiler and vega planner use for geomaterial charts
+GEOMATERIAL_VISUALISATION_FIELDS: List[str] = [
+    "id", "name", "mindat_formula", "ima_formula", "ima_status",
+    "elements", "sigelements", "entrytype",
+    "csystem", "spacegroup", "hmin", "hmax", "dmeas", "dmeas2", "dcalc",
+    "rimin", "rimax", "opticaltype", "opticalsign",
+    "diapheny", "lustretype", "cleavagetype", "fracturetype", "tenacity",
+    "colour", "streak",
+]
+
+# Columns the profiler and vega planner use for locality charts and maps
+LOCALITY_VISUALISATION_FIELDS: List[str] = [
+    "id", "txt", "country", "latitude", "longitude",
+    "elements", "description_short", "loc_status",
+]
+
+# Passing fields=["*"] keeps full records
+ALL_FIELDS = "*"
+
+# expand values that ask for every field rather than naming one
+EXPAND_ALL = {"~all", "*"}
+
+
+def resolve_fields(
+    fields: Optional[Sequence[str]],
+    default: Sequence[str],
+    expand: Optional[Sequence[str]] = None,
+) -> Optional[List[str]]:
+    """
+    Column set for a collector call: the agent's default when none is given,
+    None (no projection) for ["*"], otherwise the requested fields plus "id".
+    Expanded fields (e.g. expand=["locality"]) are always kept, and expanding
+    everything ("~all" / "*") disables projection.
+    """
+    expand = list(expand or [])
+    if EXPAND_ALL.intersection(expand):
+        return None
+    if not fields:
+        resolved = list(default)
+    elif ALL_FIELDS in fields:
+        return None
+    else:
+        resolved = ["id"] + [f for f in fields if f != "id"]
+    return resolved + [f for f in dict.fromkeys(expand) if f not in resolved]
+
+
+def project_rows(rows: List[Dict[str, Any]], fields: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    """
+    Keep only `fields` in each row. Used when the API (or the local mirror)
+    returns full records despite the fields parameter.
+    """
+    if not fields or not rows:
+        return rows
+    wanted = set(fields)
+    if all(wanted.issuperset(row) for row in rows):
+        return rows
+    return [{k: v for k, v in row.items() if k in wanted} for row in rows]
@@ -0,0 +1,150 @@
+# Backend/app/utils/rate_limiter.py
+# Client-side token bucket shared by every process that uses one Mindat API key
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from app.utils.custom_message import MindatAPIException, ErrorSeverity
+from app.utils.redis_client import get_redis_client
+
+
+# Reservation-style bucket: tokens may go negative, and a negative balance is
+# the queue of callers already promised a slot. Returns the wait in seconds,
+# or -1 when the caller would have to wait longer than max_wait.
+_REDIS_RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+end
+if wait > max_wait then
+    return '-1'
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate + max_wait) + 1)
+return tostring(wait)
+"""
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket (rate tokens/second, up to burst) with a bounded wait queue.
+
+    acquire() reserves the next slot and sleeps until it is due instead of
+    failing; only callers who would wait longer than max_wait are rejected
+    with a 429. With a Redis client the bucket lives in Redis, so the
+    backend and the MCP server draw from one budget per API key; if Redis
+    errors, the limiter falls back to its in-process bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_wait: float,
+        key: str = "default",
+        redis_client: Optional[Any] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.key = key
+        self.redis = redis_client
+        self._script = redis_client.register_script(_REDIS_RESERVE_SCRIPT) if redis_client is not None else None
+        self._tokens = float(burst)
+        self._ts = time.monotonic()
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+        self.redis_errors = 0
+
+    def _reserve_local(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._ts) * self.rate)
+        self._ts = now
+        wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+        if wait > self.max_wait:
+            return -1.0
+        self._tokens -= 1
+        return wait
+
+    async def _reserve(self) -> float:
+        if self._script is not None:
+            try:
+                raw = await self._script(keys=[self.key], args=[self.rate, self.burst, time.time(), self.max_wait])
+                return float(raw)
+            except Exception as e:
+                self.redis_errors += 1
+                print(f"[Rate Limiter] Redis unavailable, using local bucket: {e}")
+        return self._reserve_local()
+
+    async def acquire(self) -> float:
+        """Wait for a request slot; returns the seconds spent waiting"""
+        wait = await self._reserve()
+        if wait < 0:
+            self.rejected += 1
+            raise MindatAPIException(
+                message="Mindat request queue is full; try again shortly",
+                status_code=429,
+                severity=ErrorSeverity.WARNING,
+                details={"max_wait_seconds": self.max_wait, "queue_depth": self.queue_depth},
+            )
+        self.acquired += 1
+        if wait > 0:
+            self.waited += 1
+            self.total_wait += wait
+            self.max_wait_seen = max(self.max_wait_seen, wait)
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.queue_depth -= 1
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis" if self._script is not None else "memory",
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "waited": self.waited,
+            "avg_wait_seconds": round(self.total_wait / self.waited, 4) if self.waited else 0.0,
+            "max_wait_seconds": round(self.max_wait_seen, 4),
+            "redis_errors": self.redis_errors,
+        }
+
+
+def build_mindat_rate_limiter(api_key: str, config=None) -> Optional[TokenBucketRateLimiter]:
+    """Rate limiter for one Mindat API key (None when MINDAT_RATE_LIMIT <= 0)"""
+    if config is None:
+        # imported lazily: app.config imports the client, which imports this module
+        from app.config.settings import settings as config
+
+    if config.mindat_rate_limit <= 0:
+        return None
+    # never put the raw key into Redis
+    key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return TokenBucketRateLimiter(
+        rate=config.mindat_rate_limit,
+        burst=config.mindat_rate_burst,
+        max_wait=config.mindat_rate_max_wait,
+        key=f"alchemist:ratelimit:mindat:{key_id}",
+        redis_client=get_redis_client(config),
+    )
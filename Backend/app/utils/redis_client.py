@@ -0,0 +1,25 @@
+# Backend/app/utils/redis_client.py
+from typing import Any, Optional
+
+
+_redis: Optional[Any] = None
+
+
+def get_redis_client(config=None) -> Optional[Any]:
+    """
+    Shared redis.asyncio client for cross-process state (cache, rate limits).
+    Returns None when REDIS_URL is not configured or redis is not installed.
+    """
+    global _redis
+    if config is None:
+        # imported lazily: app.config imports the client, which imports this module
+        from app.config.settings import settings as config
+
+    if _redis is None and config.redis_url:
+        try:
+            import redis.asyncio as aioredis
+
+            _redis = aioredis.from_url(config.redis_url)
+        except Exception as e:
+            print(f"[Redis] Client disabled: {e}")
+    return _redis
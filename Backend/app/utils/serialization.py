@@ -0,0 +1,55 @@
+# Backend/app/utils/serialization.py
+# JSON encode/decode for datasets, message metadata and caches (orjson fast path)
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is pinned in requirements.txt
+    orjson = None
+
+
+# non-str dict keys (e.g. element counts keyed by int) and numpy values are
+# what the stdlib encoder would also have accepted / needed a default for
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def dumps_bytes(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Compact UTF-8 JSON. Falls back to the stdlib for values orjson rejects (e.g. >64-bit ints)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Compact JSON as str (for text columns and LLM payloads)"""
+    return dumps_bytes(obj, default=default).decode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    Parse JSON. Files written by the old json.dump code may contain NaN or
+    Infinity, which orjson rejects, so those fall back to the stdlib parser.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file"""
+    return loads(Path(path).read_bytes())
+
+
+def dump_file(path: Union[str, Path], obj: Any, default: Optional[Callable[[Any], Any]] = None) -> None:
+    """Write obj as compact JSON (no pretty-printing for on-disk artifacts)"""
+    Path(path).write_bytes(dumps_bytes(obj, default=default))
@@ -0,0 +1,13 @@
+# Backend/benchmarks/__init__.py
+# Benchmarks import the app package, whose settings require these variables;
+# placeholders are enough because nothing here talks to a real service.
+import os
+
+os.environ.setdefault("MINDAT_API_KEY", "benchmark-mindat-api-key")
+os.environ.setdefault("AZURE_DEPLOYMENT_NAME", "benchmark")
+os.environ.setdefault("AZURE_OPENAI_API_VERSION", "benchmark")
+os.environ.setdefault("AZURE_OPENAI_API_ENDPOINT", "https://example.invalid")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "benchmark-azure-api-key")
+os.environ.setdefault("SUPABASE_URL", "https://example.invalid")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
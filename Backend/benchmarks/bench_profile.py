@@ -0,0 +1,92 @@
+# Backend/benchmarks/bench_profile.py
+# Time to profile a collected dataset (rows x 60 columns): the previous
+# per-column profiler vs DatasetProfiler on in-memory rows, on the saved
+# JSON file and on the columnar copy
+# run from Backend/: python -m benchmarks.bench_profile [rows]
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from app.utils.column_profile import DatasetProfiler, profile_dataset
+from app.utils.columnar import ColumnarWriter, columnar_path
+from app.utils.serialization import dump_file
+
+SYSTEMS = ["Trigonal", "Isometric", "Hexagonal", "Monoclinic", "Triclinic", "Orthorhombic", "Tetragonal"]
+ELEMENTS = ["O", "Si", "Fe", "S", "Cu", "Zn", "Ca", "C", "H", "Al", "Mg", "Na", "K", "Pb"]
+
+
+def _rows(n: int) -> list:
+    rng = random.Random(1)
+    rows = []
+    for i in range(n):
+        row = {"id": i, "name": f"Mineral {i}", "csystem": rng.choice(SYSTEMS)}
+        row["elements"] = rng.sample(ELEMENTS, rng.randint(1, 5))
+        row["updttime"] = f"2024-0{1 + i % 9}-1{i % 10} 10:00:00"
+        row["locality"] = {"id": i % 500, "country": rng.choice(["Peru", "Chile", "Canada"])}
+        for j in range(18):
+            row[f"f{j}"] = None if rng.random() < 0.1 else round(rng.uniform(0, 10), 2)
+            row[f"n{j}"] = rng.randint(0, 1000)
+            row[f"s{j}"] = None if rng.random() < 0.1 else rng.choice(SYSTEMS) + str(j)
+        rows.append(row)
+    return rows
+
+
+def _previous(rows: list, max_keys: int = 50, sample_n: int = 5) -> dict:
+    """The profiler profile_sample_data used before DatasetProfiler (2000-value counts)"""
+    keys = list(dict.fromkeys(k for r in rows for k in r.keys()))[:max_keys]
+    summary = {}
+    for k in keys:
+        col = [r.get(k) for r in rows]
+        non_null = [v for v in col if v is not None]
+        numeric = bool(non_null) and all(isinstance(v, (int, float)) for v in non_null)
+        summary[k] = {
+            "type": "quantitative" if numeric else "nominal",
+            "unique_approx": len(set(map(str, non_null[:2000]))),
+            "top_values": Counter(map(str, non_null[:2000])).most_common(5),
+            "sample": [r.get(k) for r in rows[:sample_n]],
+        }
+    return {"ok": True, "columns": summary, "row_count": len(rows)}
+
+
+def _profile_rows(rows: list) -> dict:
+    profiler = DatasetProfiler()
+    for start in range(0, len(rows), 5000):
+        profiler.update_rows(rows[start:start + 5000])
+    return profiler.result()
+
+
+def _best(fn, repeat: int = 7) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(n: int) -> None:
+    rows = _rows(n)
+    with tempfile.TemporaryDirectory(prefix="bench-profile-") as tmp:
+        json_path = Path(tmp) / "rows.json"
+        dump_file(json_path, {"results": rows})
+        plain = Path(tmp) / "plain.json"
+        dump_file(plain, {"results": rows})
+        writer = ColumnarWriter(columnar_path(json_path))
+        writer.write_rows(rows)
+        writer.close({})
+        cases = [
+            ("previous, rows", lambda: _previous(rows)),
+            ("rows", lambda: _profile_rows(rows)),
+            ("json file", lambda: profile_dataset(plain)),
+            ("columnar", lambda: profile_dataset(json_path)),
+        ]
+        print(f"{n} rows x {len(rows[0])} columns")
+        for name, fn in cases:
+            print(f"{name:>16} {_best(fn):>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,49 @@
+# Backend/benchmarks/bench_serialization.py
+# Encode/decode time and size for a collected dataset: stdlib json (the old
+# indent=4 dump and a compact dump) vs app.utils.serialization
+# run from Backend/: python -m benchmarks.bench_serialization [rows]
+import json
+import sys
+import time
+
+from app.utils.serialization import dumps_bytes, loads, orjson
+
+
+def _rows(n: int) -> list:
+    return [
+        {
+            "id": i, "name": f"Mineral {i}", "mindat_formula": "Cu<sub>2</sub>(CO<sub>3</sub>)(OH)<sub>2</sub>",
+            "elements": ["Cu", "C", "O", "H"], "csystem": "Monoclinic", "hmin": 3.5, "hmax": 4.0,
+            "dmeas": 3.6 + i % 10 / 100, "colour": "Bright green, dark green, blackish green",
+            "description_short": "Secondary copper mineral in oxidised zones — Ünterberg, Österreich.",
+        }
+        for i in range(n)
+    ]
+
+
+def _best(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(n: int) -> None:
+    data = {"count": n, "results": _rows(n)}
+    cases = [
+        ("json indent=4", lambda: json.dumps(data, indent=4).encode("utf-8"), lambda b: json.loads(b)),
+        ("json compact", lambda: json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), lambda b: json.loads(b)),
+        ("serialization", lambda: dumps_bytes(data), loads),
+    ]
+    print(f"{n} rows, orjson {'available' if orjson is not None else 'MISSING (stdlib fallback)'}")
+    print(f"{'':>15} {'dump ms':>9} {'load ms':>9} {'size MB':>9}")
+    for name, dump, load in cases:
+        body = dump()
+        assert load(body) == data
+        print(f"{name:>15} {_best(dump):>9.1f} {_best(lambda: load(body)):>9.1f} {len(body) / 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
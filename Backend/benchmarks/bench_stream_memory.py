@@ -0,0 +1,108 @@
+# Backend/benchmarks/bench_stream_memory.py
+# Peak Python heap for fetching one Mindat page, and a whole result set in
+# 500-row pages: buffered vs streamed vs streamed with cache write-through
+# to the disk tier and to the default memory (LRU) tier
+# run from Backend/: python -m benchmarks.bench_stream_memory [rows ...]
+import asyncio
+import json
+import sys
+import tempfile
+import tracemalloc
+
+import httpx
+
+from app.config.mindat_config import MindatAPIClient, MindatAuth
+from app.utils.mindat_cache import DiskTier, LRUTier, MindatResponseCache
+
+CHUNK = 64 * 1024
+PAGE_SIZE = 500
+
+
+def _record(i: int) -> dict:
+    return {
+        "id": i, "name": "Quartz", "mindat_formula": "SiO<sub>2</sub>", "elements": ["Si", "O"],
+        "csystem": "Trigonal", "hmin": 7.0, "hmax": 7.0, "dmeas": 2.65,
+        "description_short": "A very common mineral. " * 10,
+    }
+
+
+def _page(offset: int, limit: int, total: int) -> bytes:
+    rows = [_record(i) for i in range(offset, min(offset + limit, total))]
+    return json.dumps({"count": total, "next": None, "previous": None, "results": rows}).encode("utf-8")
+
+
+def _client(total: int, cache=None) -> MindatAPIClient:
+    # bodies are rendered before measuring starts, so only the client's own
+    # allocations count towards the peak
+    bodies = {}
+    for offset in range(0, total, PAGE_SIZE):
+        bodies[(offset, PAGE_SIZE)] = _page(offset, PAGE_SIZE, total)
+    bodies[(0, total)] = _page(0, total, total)
+
+    async def chunks(body: bytes):
+        for i in range(0, len(body), CHUNK):
+            yield body[i:i + CHUNK]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = (int(request.url.params["offset"]), int(request.url.params["limit"]))
+        return httpx.Response(200, content=chunks(bodies[key]), headers={"Content-Type": "application/json"})
+
+    client = MindatAPIClient(auth=MindatAuth(), cache=cache)
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+async def _one_page_buffered(client: MindatAPIClient, total: int) -> None:
+    await client.get_data_from_api("geomaterials", {"limit": total, "offset": 0})
+
+
+async def _one_page_streamed(client: MindatAPIClient, total: int) -> None:
+    await client.stream_data_from_api("geomaterials", {"limit": total, "offset": 0}, on_rows=lambda rows: None)
+
+
+async def _all_collected(client: MindatAPIClient, total: int) -> None:
+    await client.fetch_all("geomaterials", {}, max_rows=total, page_size=PAGE_SIZE, use_cache=False)
+
+
+async def _all_streamed(client: MindatAPIClient, total: int) -> None:
+    # the mirror sync: streamed, nothing kept
+    await client.fetch_all("geomaterials", {}, max_rows=total, page_size=PAGE_SIZE, on_page=lambda rows: None, use_cache=False)
+
+
+async def _all_streamed_cached(client: MindatAPIClient, total: int) -> None:
+    # a collector: streamed, each page written through to the cache
+    await client.fetch_all("geomaterials", {}, max_rows=total, page_size=PAGE_SIZE, on_page=lambda rows: None)
+
+
+CASES = [
+    ("page buffered", _one_page_buffered, None),
+    ("page streamed", _one_page_streamed, None),
+    ("all collected", _all_collected, None),
+    ("all streamed", _all_streamed, None),
+    ("all streamed+disk", _all_streamed_cached, "disk"),
+    # the default setup: the memory tier holds pages up to its row budget
+    ("all streamed+memory", _all_streamed_cached, "memory"),
+]
+
+
+def _peak(fn, total: int, tier) -> float:
+    with tempfile.TemporaryDirectory(prefix="bench-cache-") as cache_dir:
+        tiers = {"disk": [DiskTier(cache_dir)], "memory": [LRUTier()]}
+        cache = MindatResponseCache(tiers[tier], default_ttl=60) if tier else None
+        client = _client(total, cache)
+        tracemalloc.start()
+        asyncio.run(fn(client, total))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def main(sizes) -> None:
+    print(f"{'rows':>8} " + " ".join(f"{name:>19}" for name, _, _ in CASES))
+    for total in sizes:
+        peaks = [_peak(fn, total, tier) for _, fn, tier in CASES]
+        print(f"{total:>8} " + " ".join(f"{p:>18.1f}M" for p in peaks))
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [5_000, 20_000])
@@ -11,21 +11,43 @@ sys.path.insert(0, current_dir)
 
 print("Current path added:", current_dir)
 
+from contextlib import asynccontextmanager
+
 from fastmcp import FastMCP
+from app.services import start_reference_data, stop_reference_data, start_geomaterial_mirror, stop_geomaterial_mirror
 from app.tools import (
     collect_geomaterials,
     collect_localities,
+    collect_mineral_localities,
+    aggregate_geomaterials,
     profile_sample_data
 )
 
 
+@asynccontextmanager
+async def lifespan(server):
+    # the collectors run in this process, so their reference labels
+    # (see ReferenceDataService.enrich) must be loaded here too
+    await start_reference_data()
+    # the mirror is synced here only; the backend reads the same SQLite file
+    # and reloads it when it changes
+    await start_geomaterial_mirror()
+    try:
+        yield
+    finally:
+        await stop_geomaterial_mirror()
+        await stop_reference_data()
+
+
 # Initialize the Server
-mcp = FastMCP("Mindat Master Server")
+mcp = FastMCP("Mindat Master Server", lifespan=lifespan)
 
 
 # Register the Tools
 mcp.tool(collect_geomaterials)
 mcp.tool(collect_localities)
+mcp.tool(collect_mineral_localities)
+mcp.tool(aggregate_geomaterials)
 mcp.tool(profile_sample_data)
 
 # Run the Server
@@ -0,0 +1,32 @@
+# Backend/tests/conftest.py
+# Minimal settings so app modules import without a .env file
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+for name, value in {
+    "MINDAT_API_KEY": "test-mindat-api-key",
+    "AZURE_DEPLOYMENT_NAME": "test",
+    "AZURE_OPENAI_API_VERSION": "test",
+    "AZURE_OPENAI_API_ENDPOINT": "http://localhost",
+    "AZURE_OPENAI_API_KEY": "test-azure-api-key",
+    "SUPABASE_URL": "http://localhost",
+    "SUPABASE_KEY": "test",
+    "DATABASE_URL": "sqlite://",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    """A process-wide ArtifactManager rooted in a temporary contents/ directory"""
+    from app.services import artifact_store
+
+    manager = artifact_store.ArtifactManager(tmp_path / "contents", quota_bytes=10 ** 9)
+    monkeypatch.setattr(artifact_store, "_artifact_manager", manager)
+    return manager
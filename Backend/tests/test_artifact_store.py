@@ -0,0 +1,86 @@
+# Backend/tests/test_artifact_store.py
+import os
+import time
+
+from app.services.artifact_store import TEMP_MAX_AGE
+from app.utils.column_profile import cached_profile
+from app.utils.columnar import ColumnarWriter
+
+
+def _file(manager, rel, size):
+    path = manager.root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    manager.register(path)
+    return path
+
+
+def _age(manager, rel, seconds):
+    """Pretend an artifact was last used `seconds` ago"""
+    conn = manager._connect()
+    with conn:
+        conn.execute("UPDATE artifacts SET last_access = ? WHERE path = ?", (time.time() - seconds, rel))
+    conn.close()
+
+
+def test_evicts_least_recently_used_first(artifacts):
+    artifacts.quota_bytes = 250
+    for i, name in enumerate(["a", "b", "c"]):
+        _file(artifacts, f"plots/{name}.png", 100)
+        _age(artifacts, f"plots/{name}.png", 300 - i * 100)
+    # reading "a" makes "b" the least recently used
+    artifacts.touch(["/contents/plots/a.png"])
+    summary = artifacts.evict()
+    assert summary["evicted"] == 1 and summary["total_bytes"] == 200
+    assert not (artifacts.root / "plots/b.png").exists()
+    assert (artifacts.root / "plots/a.png").exists() and (artifacts.root / "plots/c.png").exists()
+
+
+def test_pinned_groups_are_kept(artifacts):
+    artifacts.quota_bytes = 0
+    _file(artifacts, "sample_data/d1.json", 10)
+    _file(artifacts, "sample_data/d1.columns/schema.json", 10)
+    _file(artifacts, "sample_data/d2.json", 10)
+    artifacts.pin(["/contents/sample_data/d1.json"])
+    artifacts.evict()
+    assert (artifacts.root / "sample_data/d1.columns").exists() and (artifacts.root / "sample_data/d1.json").exists()
+    assert not (artifacts.root / "sample_data/d2.json").exists()
+    artifacts.unpin(["/contents/sample_data/d1.json"])
+    artifacts.evict()
+    assert not (artifacts.root / "sample_data/d1.columns").exists()
+
+
+def test_files_inside_a_dataset_count_towards_it(artifacts):
+    writer = ColumnarWriter(artifacts.root / "sample_data/d.columns")
+    writer.write_rows([{"id": i, "name": f"m{i}"} for i in range(50)])
+    directory = writer.close()
+    artifacts.register(directory)
+    before = artifacts.stats()["areas"]["sample_data"]
+    _age(artifacts, "sample_data/d.columns", 1000)
+
+    profile = cached_profile(directory.with_suffix(".json"), on_saved=artifacts.register)
+    assert profile["ok"]
+    after = artifacts.stats()["areas"]["sample_data"]
+    assert after["artifacts"] == before["artifacts"] == 1
+    assert after["bytes"] > before["bytes"]
+    entry = artifacts.list("sample_data")[0]
+    assert entry["name"] == "d.columns" and time.time() - entry["last_access"] < 60
+
+    # a read of any file in the dataset is a use of the dataset
+    _age(artifacts, "sample_data/d.columns", 1000)
+    artifacts.touch([directory / "schema.json"])
+    assert time.time() - artifacts.list("sample_data")[0]["last_access"] < 60
+
+
+def test_sweep_removes_stale_temp_files_and_indexes_new_ones(artifacts):
+    stale = artifacts.root / "sample_data/.x.pending.abc.tmp"
+    stale.mkdir(parents=True)
+    old = time.time() - TEMP_MAX_AGE - 10
+    os.utime(stale, (old, old))
+    fresh = artifacts.root / "sample_data/.y.json.tmp"
+    fresh.write_bytes(b"{}")
+    (artifacts.root / "plots").mkdir()
+    (artifacts.root / "plots/new.png").write_bytes(b"png")
+    summary = artifacts.sweep()
+    assert summary["temp_removed"] == 1 and not stale.exists() and fresh.exists()
+    assert [e["name"] for e in artifacts.list("plots")] == ["new.png"]
@@ -0,0 +1,98 @@
+# Backend/tests/test_column_profile.py
+import os
+import shutil
+
+import pytest
+
+from app.services.dataset_store import DatasetStore
+from app.utils import column_profile
+from app.utils.column_profile import cached_profile
+from app.utils.columnar import ColumnarWriter
+from app.utils.serialization import dump_file
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Names of the datasets profile_dataset actually profiled"""
+    seen = []
+    profile = column_profile.profile_dataset
+
+    def recording(path, **kwargs):
+        seen.append(os.path.basename(path))
+        return profile(path, **kwargs)
+
+    monkeypatch.setattr(column_profile, "profile_dataset", recording)
+    return seen
+
+
+def _top(profile, column):
+    return [value for value, _ in profile["columns"][column]["top_values"]]
+
+
+def test_json_profile_is_reused_until_the_file_changes(tmp_path, calls):
+    path = tmp_path / "d.json"
+    dump_file(path, {"results": [{"csystem": "Trigonal"}, {"csystem": "Trigonal"}]})
+    stat = path.stat()
+    first = cached_profile(path)
+    assert cached_profile(path) == first
+    assert calls == ["d.json"]
+
+    # same size and mtime, different content
+    dump_file(path, {"results": [{"csystem": "Isometri"}, {"csystem": "Isometri"}]})
+    assert path.stat().st_size == stat.st_size
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    second = cached_profile(path)
+    assert calls == ["d.json", "d.json"]
+    assert _top(second, "csystem") == ["Isometri"]
+    assert cached_profile(path) == second
+    assert len(calls) == 2
+
+
+def test_changing_the_arguments_misses_the_cache(tmp_path, calls):
+    path = tmp_path / "d.json"
+    dump_file(path, {"results": [{"id": i, "name": f"m{i}"} for i in range(10)]})
+    cached_profile(path, sample_n=2)
+    cached_profile(path, sample_n=2)
+    assert len(calls) == 1
+    wide = cached_profile(path, sample_n=4)
+    assert len(calls) == 2
+    assert len(wide["columns"]["id"]["sample"]) == 4
+    cached_profile(path, max_keys=1)
+    cached_profile(path, top_k=2)
+    assert len(calls) == 4
+    cached_profile(path, sample_n=2)
+    assert len(calls) == 4
+
+
+def test_stored_dataset_is_keyed_by_its_content_key(artifacts, calls):
+    store = DatasetStore(artifacts.root / "sample_data")
+    with store.writer("mindat_geomaterial", {"q": 1}) as writer:
+        writer.write_rows([{"id": 1, "name": "Quartz"}])
+    saved = []
+    profile = cached_profile(writer.path, on_saved=saved.append)
+    assert profile["row_count"] == 1
+    assert len(saved) == 1 and saved[0].parent.name == f"{writer.dataset_id}.columns"
+    digest = writer.dataset_id.rsplit("-", 1)[1]
+    assert column_profile._fingerprint(writer.path).startswith(f"content:{digest}")
+    assert cached_profile(writer.path) == profile
+    assert len(calls) == 1
+
+
+def test_columnar_copy_without_a_content_key_is_hashed(tmp_path, calls):
+    directory = tmp_path / "d.columns"
+
+    def write(target, system):
+        writer = ColumnarWriter(target)
+        writer.write_rows([{"csystem": system}])
+        writer.close({})
+
+    write(directory, "Trigonal")
+    cached_profile(directory)
+    cached_profile(directory)
+    assert len(calls) == 1
+    # rewrite the column files in place with same-size content
+    write(tmp_path / "new.columns", "Isometri")
+    for part in (tmp_path / "new.columns").iterdir():
+        shutil.copyfile(part, directory / part.name)
+    assert _top(cached_profile(directory), "csystem") == ["Isometri"]
+    assert len(calls) == 2
@@ -0,0 +1,97 @@
+# Backend/tests/test_columnar.py
+import numpy as np
+import pytest
+
+from app.utils.columnar import ColumnarDataset, ColumnarWriter
+
+ROWS = [
+    {"id": 1, "n": 1, "f": 1, "s": "a", "mixed": "x", "flag": True},
+    {"id": 2, "n": None, "f": 2, "s": "ü", "mixed": 3, "flag": False},
+    {"id": 3, "n": 3, "f": 2.5, "s": None, "mixed": {"a": [1]}},
+    {"id": 4, "late": "first seen here", "big": 2 ** 70, "f": None},
+    {"id": 5, "n": 5, "s": "e", "big": 1, "flag": True},
+    {"id": 6},
+    {"id": 7, "n": 7, "f": 7, "s": "g", "late": None, "nested": [1, "two"]},
+]
+
+
+def _write(path, rows, chunk_rows, batch=2):
+    writer = ColumnarWriter(path, chunk_rows=chunk_rows)
+    for i in range(0, len(rows), batch):
+        writer.write_rows(rows[i:i + batch])
+    writer.close({"count": len(rows)})
+    return ColumnarDataset(path)
+
+
+def _expected(rows):
+    names = list(dict.fromkeys(k for row in rows for k in row))
+    return [{k: row.get(k) for k in names} for row in rows]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 100])
+def test_chunked_output_matches_the_rows(tmp_path, chunk_rows):
+    dataset = _write(tmp_path / "d.columns", ROWS, chunk_rows)
+    assert dataset.rows == len(ROWS) and dataset.meta == {"count": len(ROWS)}
+    assert dataset.to_rows() == _expected(ROWS)
+    kinds = {name: dataset.kind(name) for name in dataset.columns}
+    assert kinds == {
+        "id": "int", "n": "int", "f": "float", "s": "str", "mixed": "json", "flag": "bool",
+        "late": "str", "big": "json", "nested": "json",
+    }
+    assert dataset.array("f")[3] != dataset.array("f")[3]  # NaN where missing
+    assert dataset.valid("late").tolist() == [False, False, False, True, False, False, False]
+    assert dataset.take(np.array([6, 0]), ["id", "mixed"]) == [{"id": 7, "mixed": None}, {"id": 1, "mixed": "x"}]
+
+
+def _typed(rows):
+    return [{k: (type(v), v) for k, v in row.items()} for row in rows]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 100])
+def test_round_trip_keeps_value_types(tmp_path, chunk_rows):
+    rows = [{"hmin": 5}, {"hmin": 5.5}, {"hmin": None}, {"hmin": 7}, {"hmin": 2.0}, {"id": 6}]
+    dataset = _write(tmp_path / "d.columns", rows, chunk_rows)
+    assert dataset.kind("hmin") == "float"
+    assert dataset.array("hmin").dtype == np.float64
+    assert _typed(dataset.to_rows()) == _typed(_expected(rows))
+    assert _typed(dataset.take(np.array([3, 1, 0]))) == _typed([_expected(rows)[k] for k in (3, 1, 0)])
+    # the fixture's int/float and json columns too; "big" (>64-bit ints)
+    # is only value-equal, orjson parses those back as floats
+    names = [name for name in _expected(ROWS)[0] if name != "big"]
+    mixed = _write(tmp_path / "m.columns", ROWS, chunk_rows)
+    assert _typed(mixed.to_rows(names)) == _typed(_expected([{k: r[k] for k in names if k in r} for r in ROWS]))
+
+
+def test_chunking_does_not_change_the_files(tmp_path):
+    one = _write(tmp_path / "one.columns", ROWS, 100)
+    many = _write(tmp_path / "many.columns", ROWS, 2)
+    for name in one.columns:
+        i, j = one._schema[name][0], many._schema[name][0]
+        assert one._schema[name][1] == many._schema[name][1]
+        for part in one._schema[name][1]["parts"]:
+            assert np.array_equal(
+                np.load(one.directory / f"c{i}.{part}.npy"), np.load(many.directory / f"c{j}.{part}.npy"), equal_nan=True
+            )
+
+
+def test_rows_are_spilled_per_chunk(tmp_path):
+    writer = ColumnarWriter(tmp_path / "d.columns", chunk_rows=10)
+    writer.write_rows([{"id": i, "name": f"m{i}"} for i in range(25)])
+    assert writer._buffered == 5 and len(writer._chunks) == 2
+    assert len(list(writer._tmp.glob("k*.npy"))) > 0
+    writer.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["d.columns"]
+    assert not list((tmp_path / "d.columns").glob("k*.npy"))
+    assert ColumnarDataset(tmp_path / "d.columns").values("name", 23) == ["m23", "m24"]
+
+
+def test_abort_removes_spilled_parts(tmp_path):
+    writer = ColumnarWriter(tmp_path / "d.columns", chunk_rows=2)
+    writer.write_rows(ROWS)
+    writer.abort()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_dataset(tmp_path):
+    dataset = _write(tmp_path / "d.columns", [], 10)
+    assert dataset.rows == 0 and dataset.columns == [] and dataset.to_rows() == []
@@ -0,0 +1,73 @@
+# Backend/tests/test_dataset_store.py
+import pytest
+
+from app.services.dataset_store import DatasetStore
+from app.utils.columnar import SCHEMA_FILE, columnar_path
+from app.utils.dataset_io import ensure_json, read_rows
+from app.utils.serialization import load_file
+
+ROWS = [{"id": 1, "name": "Quartz", "hmin": 7.0}, {"id": 2, "name": "Calcite", "hmin": 3.0, "extra": "x"}]
+
+
+@pytest.fixture
+def store(artifacts):
+    return DatasetStore(artifacts.root / "sample_data", reuse_ttl=3600)
+
+
+def _save(store, query, rows=ROWS, fields=None):
+    with store.writer("mindat_geomaterial", query, fields=fields) as writer:
+        writer.write_rows(rows[:1])
+        writer.write_rows(rows[1:])
+        writer.count = 10
+    return writer
+
+
+def _leftovers(store):
+    return [p.name for p in store.root.iterdir() if p.name.endswith((".pending", ".tmp"))]
+
+
+def test_publishes_a_content_addressed_columnar_dataset(store, artifacts):
+    writer = _save(store, {"q": 1}, fields=["id", "name", "hmin"])
+    assert writer.dataset_id.startswith("mindat_geomaterial-")
+    directory = columnar_path(writer.path)
+    assert (directory / SCHEMA_FILE).exists() and not writer.path.exists()
+    assert read_rows(writer.path) == [{"id": 1, "name": "Quartz", "hmin": 7.0}, {"id": 2, "name": "Calcite", "hmin": 3.0}]
+    assert _leftovers(store) == []
+    assert [e["name"] for e in artifacts.list("sample_data")] == [directory.name]
+
+
+def test_identical_results_share_one_dataset(store):
+    first = _save(store, {"q": 1})
+    mtime = columnar_path(first.path).stat().st_mtime_ns
+    second = _save(store, {"q": 1})
+    assert second.dataset_id == first.dataset_id
+    assert _leftovers(store) == []
+    assert columnar_path(second.path).stat().st_mtime_ns >= mtime
+    # a different response to the same query is a new dataset
+    assert _save(store, {"q": 1}, rows=ROWS[:1]).dataset_id != first.dataset_id
+
+
+def test_failed_write_publishes_nothing(store):
+    with pytest.raises(RuntimeError):
+        with store.writer("mindat_geomaterial", {"q": 2}) as writer:
+            writer.write_rows(ROWS)
+            raise RuntimeError("upstream failed")
+    assert writer.dataset_id is None
+    assert store.lookup("mindat_geomaterial", {"q": 2}) is None
+    store.root.mkdir(parents=True, exist_ok=True)
+    assert [p.name for p in store.root.iterdir() if not p.name.startswith(".queries")] == []
+
+
+def test_lookup_reuses_the_saved_dataset(store):
+    writer = _save(store, {"q": 3})
+    saved = store.lookup("mindat_geomaterial", {"q": 3})
+    assert saved["dataset_id"] == writer.dataset_id and saved["rows"] == 2 and saved["count"] == 10
+    assert store.lookup("mindat_geomaterial", {"q": 4}) is None
+    store.reuse_ttl = 0
+    assert store.lookup("mindat_geomaterial", {"q": 3}) is None
+
+
+def test_json_is_generated_on_demand(store):
+    writer = _save(store, {"q": 5})
+    data = load_file(ensure_json(writer.path))
+    assert data["count"] == 10 and data["returned"] == 2 and data["results"][1]["extra"] == "x"
@@ -0,0 +1,78 @@
+# Backend/tests/test_element_index.py
+import random
+
+import numpy as np
+import pytest
+
+from app.services.element_index import ElementIndex, parse_elements
+
+SYMBOLS = ["O", "Si", "Fe", "S", "Cu", "Zn", "Ca", "C", "H"]
+
+
+def _records(n=133, seed=5):
+    # not a multiple of 8, so the last packed word is partial
+    rng = random.Random(seed)
+    return [
+        {"id": 100 + i, "elements": rng.sample(SYMBOLS, rng.randint(0, 4)), "sigelements": rng.sample(SYMBOLS, rng.randint(0, 1))}
+        for i in range(n)
+    ]
+
+
+def _sets(records, essential_only=True):
+    return [set(r["elements"]) | (set() if essential_only else set(r["sigelements"])) for r in records]
+
+
+@pytest.fixture(scope="module")
+def records():
+    return _records()
+
+
+@pytest.mark.parametrize("include, any_of, exclude", [
+    (["Fe", "O"], None, ["S"]),
+    (["O"], None, None),
+    (None, ["Cu", "Zn"], None),
+    (["O"], ["Cu", "Zn"], ["H"]),
+    (None, None, ["O", "Si"]),
+    (["Xx"], None, None),
+    (None, ["Xx"], None),
+    (None, None, ["Xx"]),
+])
+@pytest.mark.parametrize("essential_only", [True, False])
+def test_mask_matches_set_logic(records, include, any_of, exclude, essential_only):
+    index = ElementIndex.from_records(records)
+    expected = [
+        bool(set(include or []) <= s and (not any_of or set(any_of) & s) and not set(exclude or []) & s)
+        for s in _sets(records, essential_only)
+    ]
+    mask = index.mask(include, exclude, essential_only=essential_only, any_of=any_of)
+    assert mask.dtype == bool and mask.tolist() == expected
+
+
+def test_save_load_round_trip_is_memory_mapped(records, tmp_path):
+    built = ElementIndex.from_records(records)
+    built.save(tmp_path / "idx")
+    loaded = ElementIndex.load(tmp_path / "idx")
+    assert isinstance(loaded.essential, np.memmap) and isinstance(loaded.ids, np.memmap)
+    assert loaded.symbols == built.symbols and loaded.ids.tolist() == [r["id"] for r in records]
+    assert loaded.mask(["Fe"], ["S"]).tolist() == built.mask(["Fe"], ["S"]).tolist()
+    assert loaded.counts() == built.counts()
+    assert not list((tmp_path / "idx").glob("*.tmp*"))
+    assert ElementIndex.load(tmp_path / "missing") is None
+
+
+def test_counts_and_cooccurrence(records):
+    index = ElementIndex.from_records(records)
+    sets = _sets(records)
+    assert index.counts() == {s: n for s in SYMBOLS if (n := sum(s in row for row in sets))}
+    rows = np.arange(0, len(records), 3)
+    result = index.cooccurrence(rows, elements=["O", "Fe", "Xx"])
+    assert result["elements"] == ["O", "Fe"]
+    subset = [sets[i] for i in rows]
+    assert result["matrix"] == [[sum(a in s and b in s for s in subset) for b in ("O", "Fe")] for a in ("O", "Fe")]
+    everything = index.cooccurrence(essential_only=False)
+    assert len(everything["matrix"]) == len(index.symbols)
+
+
+def test_parses_locality_element_strings():
+    assert parse_elements("-Ag-As-Au-") == {"Ag", "As", "Au"}
+    assert parse_elements(["Fe", " O "]) == {"Fe", "O"} and parse_elements(None) == set()
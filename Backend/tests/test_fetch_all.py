@@ -0,0 +1,134 @@
+# Backend/tests/test_fetch_all.py
+import asyncio
+
+import httpx
+
+from app.config.mindat_config import MindatAPIClient, MindatAuth
+from app.utils.mindat_cache import LRUTier, MindatResponseCache
+
+TOTAL = 25
+
+
+def _client(cache=None):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params.get("offset", 0))
+        limit = int(request.url.params.get("limit", 10))
+        calls.append(offset)
+        await asyncio.sleep(0.01)
+        rows = [{"id": i} for i in range(offset, min(offset + limit, TOTAL))]
+        return httpx.Response(200, json={"count": TOTAL, "next": None, "results": rows})
+
+    client = MindatAPIClient(auth=MindatAuth(), cache=cache)
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.max_retries = 0
+    return client, calls
+
+
+def test_pages_arrive_in_offset_order():
+    async def run():
+        client, calls = _client()
+        seen = []
+        summary = await client.fetch_all("geomaterials", {}, page_size=10, max_workers=3, on_page=seen.extend)
+        assert [r["id"] for r in seen] == list(range(TOTAL))
+        assert summary["returned"] == TOTAL and summary["pages"] == 3 and summary["results"] == []
+        assert sorted(calls) == [0, 10, 20]
+
+    asyncio.run(run())
+
+
+def test_streamed_pages_are_cached():
+    async def run():
+        client, calls = _client(MindatResponseCache([LRUTier()], default_ttl=60))
+        first, second = [], []
+        await client.fetch_all("geomaterials", {}, page_size=10, on_page=first.extend)
+        await client.fetch_all("geomaterials", {}, page_size=10, on_page=second.extend)
+        assert first == second and len(first) == TOTAL
+        assert len(calls) == 3
+        # a buffered read of a page shares the streamed copy
+        page = await client.get_data_from_api("geomaterials", {"limit": 10, "offset": 10})
+        assert [r["id"] for r in page["results"]] == list(range(10, 20))
+        assert "returned" not in page and len(calls) == 3
+
+    asyncio.run(run())
+
+
+def test_concurrent_streams_of_one_query_are_coalesced():
+    async def run():
+        client, calls = _client(MindatResponseCache([LRUTier()], default_ttl=60))
+        a, b = [], []
+        await asyncio.gather(
+            client.fetch_all("geomaterials", {}, page_size=10, on_page=a.extend),
+            client.fetch_all("geomaterials", {}, page_size=10, on_page=b.extend),
+        )
+        assert a == b and len(a) == TOTAL
+        assert len(calls) == 3
+        assert client.stats()["coalescing"]["deduplicated"] == 3
+
+    asyncio.run(run())
+
+
+def test_uncached_streams_keep_nothing():
+    async def run():
+        memory = LRUTier()
+        client, calls = _client(MindatResponseCache([memory], default_ttl=60))
+        await client.fetch_all("geomaterials", {}, page_size=10, on_page=lambda rows: None, use_cache=False)
+        assert len(calls) == 3 and len(memory) == 0
+
+    asyncio.run(run())
+
+
+def test_a_slow_head_page_bounds_the_pages_held_back(monkeypatch):
+    from app.config import mindat_config
+
+    held = []
+
+    class Recording(mindat_config._OrderedPages):
+        def writer(self, offset):
+            write = super().writer(offset)
+
+            def record(rows):
+                write(rows)
+                held.append(sum(1 for rows in self.buffers.values() if rows))
+            return record
+
+    monkeypatch.setattr(mindat_config, "_OrderedPages", Recording)
+    total, started = 200, []
+    head_done = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params.get("offset", 0))
+        limit = int(request.url.params.get("limit", 10))
+        started.append((offset, head_done.is_set()))
+        if offset == 10:
+            await asyncio.sleep(0.2)
+            head_done.set()
+        rows = [{"id": i} for i in range(offset, min(offset + limit, total))]
+        return httpx.Response(200, json={"count": total, "next": None, "results": rows})
+
+    async def run():
+        client = MindatAPIClient(auth=MindatAuth())
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        seen = []
+        await client.fetch_all("geomaterials", {}, page_size=10, max_workers=3, on_page=seen.extend, use_cache=False)
+        assert [r["id"] for r in seen] == list(range(total))
+
+    asyncio.run(run())
+    # only pages 20 and 30 may start (and wait) while page 10 is slow
+    assert sorted(o for o, done in started if not done and o) == [10, 20, 30]
+    assert max(held) <= 2
+
+
+def test_memory_tier_is_bounded_by_rows():
+    async def run():
+        memory = LRUTier(max_rows=20)
+        client, calls = _client(MindatResponseCache([memory], default_ttl=60))
+        await client.fetch_all("geomaterials", {}, page_size=10, on_page=lambda rows: None)
+        # three pages of 10, 10 and 5 rows: the oldest is evicted
+        assert memory.rows <= 20 and len(memory) == 2
+
+        await memory.set("big", {"results": list(range(21))}, 60)
+        assert await memory.get("big") is None
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+# Backend/tests/test_geomaterial_aggregates.py
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.mindat_query import MindatGeoMaterialQuery, MindatGeomaterialFilters, MindatGeomaterialInput
+from app.services.geomaterial_aggregates import count_geomaterials_by
+from app.utils.custom_message import MindatAPIException
+
+
+class _NoMirror:
+    def can_answer(self, query):
+        return False
+
+
+class _Client:
+    fetch_workers = 2
+
+    def __init__(self):
+        self.params = []
+
+    async def get_data_from_api(self, endpoint, params):
+        self.params.append(params)
+        return {"count": len(params.get("csystem", "").split(",")) if "csystem" in params else 100}
+
+
+def test_unknown_filter_keys_are_rejected():
+    with pytest.raises(ValidationError):
+        MindatGeomaterialFilters(**{"hardness": 5})
+    assert MindatGeomaterialFilters(**{"hmin": 5}).hardness_min == 5
+
+
+def test_shared_query_models_still_ignore_unknown_keys():
+    assert MindatGeoMaterialQuery(**{"hardness": 5, "hmin": 5}).hardness_min == 5
+    payload = MindatGeomaterialInput(query={"name": "Quartz", "note": "from the agent"})
+    assert payload.query.name == "Quartz"
+
+
+@pytest.mark.parametrize("facet", ["entrytype", "el_inc"])
+def test_facets_without_a_value_list_need_values(facet):
+    with pytest.raises(MindatAPIException) as excinfo:
+        asyncio.run(count_geomaterials_by(MindatGeoMaterialQuery(), facet, client=_Client(), mirror=_NoMirror()))
+    assert excinfo.value.status_code == 400
+
+
+def test_counts_one_request_per_value_plus_total():
+    client = _Client()
+    result = asyncio.run(count_geomaterials_by(
+        MindatGeoMaterialQuery(ima=True), "csystem", values=["Isometric", "Hexagonal"], client=client, mirror=_NoMirror()
+    ))
+    assert result == {"facet": "csystem", "total": 100, "counts": {"Isometric": 1, "Hexagonal": 1}, "source": "api"}
+    assert all(p["limit"] == 1 and p["fields"] == "id" for p in client.params)
@@ -0,0 +1,111 @@
+# Backend/tests/test_geomaterial_catalogue.py
+import math
+import random
+
+import pytest
+
+from app.models import MindatGeoMaterialQuery
+from app.services.geomaterial_catalogue import GeomaterialCatalogue
+
+SYSTEMS = ["Trigonal", "Isometric", "Hexagonal", "Monoclinic"]
+ELEMENTS = ["O", "Si", "Fe", "S", "Ca", "C", "Cu", "Al"]
+LUSTRES = ["Vitreous", "Metallic", "Pearly", "Dull"]
+
+
+def _records(n=300, seed=3):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        hmin = rng.choice([None, round(rng.uniform(1, 9), 1)])
+        dmeas = rng.choice([None, round(rng.uniform(2, 8), 2)])
+        records.append({
+            "id": i + 1,
+            "name": f"mineral{i}",
+            "hmin": hmin,
+            "hmax": rng.choice([None, hmin + 1 if hmin is not None else round(rng.uniform(1, 9), 1)]),
+            "dmeas": dmeas,
+            "dmeas2": rng.choice([None, dmeas + 0.5 if dmeas is not None else None]),
+            "csystem": rng.choice(SYSTEMS + [None]),
+            "elements": rng.sample(ELEMENTS, rng.randint(0, 4)),
+            "sigelements": rng.sample(ELEMENTS, rng.randint(0, 1)),
+            "lustretype": rng.sample(LUSTRES, rng.randint(0, 2)),
+        })
+    return records
+
+
+def _overlaps(lo, hi, q_min, q_max):
+    """Mindat range semantics, one record at a time"""
+    lo, hi = (hi if lo is None else lo), (lo if hi is None else hi)
+    if lo is None:
+        return False
+    return (q_min is None or hi >= q_min) and (q_max is None or lo <= q_max)
+
+
+def _matches(record, q):
+    if ("hardness_min" in q or "hardness_max" in q) and not _overlaps(
+        record["hmin"], record["hmax"], q.get("hardness_min"), q.get("hardness_max")
+    ):
+        return False
+    if ("density_min" in q or "density_max" in q) and not _overlaps(
+        record["dmeas"], record["dmeas2"], q.get("density_min"), q.get("density_max")
+    ):
+        return False
+    if "crystal_system" in q and record["csystem"] not in q["crystal_system"]:
+        return False
+    if "lustretype" in q and not {v.lower() for v in q["lustretype"]} <= {v.lower() for v in record["lustretype"]}:
+        return False
+    elements = set(record["elements"])
+    if q.get("el_essential") is False:
+        elements |= set(record["sigelements"])
+    if not set(q.get("el_inc", [])) <= elements or set(q.get("el_exc", [])) & elements:
+        return False
+    return True
+
+
+QUERIES = [
+    {"hardness_min": 5},
+    {"hardness_max": 3.5},
+    {"hardness_min": 4, "hardness_max": 6},
+    {"density_min": 3, "density_max": 5},
+    {"crystal_system": ["Trigonal"]},
+    {"crystal_system": ["Isometric", "Hexagonal"], "hardness_min": 6},
+    {"el_inc": ["O"]},
+    {"el_inc": ["Fe", "O"]},
+    {"el_exc": ["S", "C"]},
+    {"el_inc": ["O"], "el_exc": ["Si"], "density_max": 4},
+    {"el_inc": ["Cu"], "el_essential": False},
+    {"el_inc": ["Xx"]},
+    {"lustretype": ["Vitreous"]},
+    {"lustretype": ["Vitreous", "Pearly"], "crystal_system": ["Monoclinic"]},
+]
+
+
+@pytest.fixture(scope="module")
+def catalogue():
+    return GeomaterialCatalogue(_records())
+
+
+@pytest.mark.parametrize("q", QUERIES)
+def test_masks_match_a_row_by_row_filter(catalogue, q):
+    expected = [r["id"] for r in catalogue.records if _matches(r, q)]
+    rows = catalogue.rows(catalogue.filter(MindatGeoMaterialQuery(**q)))
+    assert [r["id"] for r in rows] == expected
+
+
+def test_every_query_discriminates(catalogue):
+    # guards the fixture: each query above must actually discriminate
+    sizes = [int(catalogue.mask(MindatGeoMaterialQuery(**q)).sum()) for q in QUERIES if q != {"el_inc": ["Xx"]}]
+    assert all(0 < n < catalogue.size for n in sizes)
+
+
+def test_implied_filters_are_skipped():
+    records = [{"id": 1, "hmin": 5.0, "ima_status": ["APPROVED"]}, {"id": 2, "hmin": 6.0}]
+    assert GeomaterialCatalogue(records).filter(MindatGeoMaterialQuery(ima=True)).tolist() == [0]
+    implied = GeomaterialCatalogue(records, implied={"ima": True})
+    assert implied.filter(MindatGeoMaterialQuery(ima=True)).tolist() == [0, 1]
+
+
+def test_missing_values_never_match_a_range():
+    records = [{"id": 1, "hmin": None, "hmax": None}, {"id": 2, "hmin": math.nan, "hmax": 4.0}]
+    catalogue = GeomaterialCatalogue(records)
+    assert catalogue.filter(MindatGeoMaterialQuery(hardness_max=10)).tolist() == [1]
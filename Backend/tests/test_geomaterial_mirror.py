@@ -0,0 +1,153 @@
+# Backend/tests/test_geomaterial_mirror.py
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.models import MindatGeoMaterialQuery
+from app.services.geomaterial_mirror import MIRROR_SCOPE_PARAMS, UPDATED_SINCE_PARAM, GeomaterialMirror
+
+
+def _record(i, hmin, elements, updated="2024-01-01 00:00:00", **extra):
+    return {
+        "id": i, "name": f"mineral{i}", "ima_status": ["APPROVED"], "hmin": hmin, "hmax": hmin + 0.5,
+        "elements": elements, "csystem": "Trigonal", "updttime": updated, **extra,
+    }
+
+
+class FakeClient:
+    """fetch_all over an in-memory catalogue, honouring the last-updated filter"""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+
+    async def fetch_all(self, endpoint, params, max_rows=None, on_page=None, use_cache=True):
+        self.calls.append(dict(params))
+        since = params.get(UPDATED_SINCE_PARAM)
+        rows = [r for r in self.records if since is None or r["updttime"] > since]
+        for start in range(0, len(rows), 2):
+            on_page(rows[start:start + 2])
+        return {"count": len(rows), "returned": len(rows)}
+
+
+@pytest.fixture
+def upstream():
+    return FakeClient([
+        _record(1, 2.0, ["Ca", "C", "O"]),
+        _record(2, 7.0, ["Si", "O"]),
+        _record(3, 6.0, ["Fe", "S"], updated="2024-02-01 00:00:00"),
+    ])
+
+
+@pytest.fixture
+def mirror(tmp_path, upstream):
+    return GeomaterialMirror(tmp_path / "mirror.sqlite3", client=upstream)
+
+
+def _ids(result):
+    return [r["id"] for r in result["results"]]
+
+
+def test_full_sync_pulls_the_scope_and_answers_locally(mirror, upstream):
+    summary = asyncio.run(mirror.sync())
+    assert summary["mode"] == "full" and summary["upserted"] == summary["total_records"] == 3
+    assert set(MIRROR_SCOPE_PARAMS) <= set(upstream.calls[0]) and UPDATED_SINCE_PARAM not in upstream.calls[0]
+    result = mirror.query(MindatGeoMaterialQuery(ima=True, hardness_min=5))
+    assert result["source"] == "mirror" and result["count"] == 2 and _ids(result) == [2, 3]
+    assert _ids(mirror.query(MindatGeoMaterialQuery(ima=True, el_inc=["O"], el_exc=["Si"]))) == [1]
+    assert (mirror.index_dir / "essential.npy").exists()
+
+
+def test_incremental_sync_pulls_only_updated_rows(mirror, upstream):
+    asyncio.run(mirror.sync())
+    upstream.records[0] = _record(1, 3.5, ["Ca", "C", "O"], updated="2024-03-01 00:00:00")
+    upstream.records.append(_record(4, 9.0, ["Al", "O"], updated="2024-03-02 00:00:00"))
+    summary = asyncio.run(mirror.sync())
+    assert summary["mode"] == "incremental" and summary["since"] == "2024-02-01 00:00:00"
+    assert upstream.calls[-1][UPDATED_SINCE_PARAM] == "2024-02-01 00:00:00"
+    assert summary["upserted"] == 2 and summary["total_records"] == 4
+    assert _ids(mirror.query(MindatGeoMaterialQuery(ima=True, hardness_min=3, hardness_max=4))) == [1]
+    # the element index is rebuilt with the new row
+    assert _ids(mirror.query(MindatGeoMaterialQuery(ima=True, el_inc=["Al"]))) == [4]
+
+
+def test_full_sync_drops_rows_gone_upstream(mirror, upstream):
+    asyncio.run(mirror.sync())
+    del upstream.records[1]
+    assert asyncio.run(mirror.sync(full=True))["total_records"] == 2
+
+
+def test_queries_outside_the_scope_fall_back(mirror):
+    asyncio.run(mirror.sync())
+    assert mirror.query(MindatGeoMaterialQuery(hardness_min=5)) is None
+    assert mirror.query(MindatGeoMaterialQuery(ima=False)) is None
+    assert mirror.query(MindatGeoMaterialQuery(ima=True, ima_notes=[1])) is None
+    assert mirror.fallbacks == 3 and mirror.local_hits == 0
+
+
+def test_an_empty_or_stale_mirror_falls_back(mirror):
+    query = MindatGeoMaterialQuery(ima=True)
+    assert mirror.query(query) is None and mirror.count([query]) is None
+    asyncio.run(mirror.sync())
+    assert mirror.query(query)["count"] == 3 and not mirror.stale()
+    conn = sqlite3.connect(mirror.db_path)
+    conn.execute("UPDATE mirror_meta SET value = '2000-01-01 00:00:00' WHERE key = 'last_sync'")
+    conn.commit()
+    conn.close()
+    mirror._loaded_mtime = None
+    assert mirror.query(query) is None and mirror.stale()
+    mirror.max_age = 0
+    assert mirror.query(query)["count"] == 3
+
+
+def test_background_refresh_syncs_incrementally(tmp_path, upstream):
+    mirror = GeomaterialMirror(tmp_path / "mirror.sqlite3", refresh_interval=0.05, client=upstream)
+
+    async def run():
+        await mirror.start()
+        await asyncio.sleep(0.3)
+        assert mirror.stats()["background_refresh"]
+        await mirror.stop()
+
+    asyncio.run(run())
+    assert len(upstream.calls) >= 2
+    assert UPDATED_SINCE_PARAM not in upstream.calls[0] and UPDATED_SINCE_PARAM in upstream.calls[1]
+    assert mirror.stats()["background_refresh"] is False
+
+
+class FakeGeomaterialAPI:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_all_geomaterials(self, query_params, max_rows=None, on_page=None):
+        self.calls += 1
+        on_page([_record(99, 5.0, ["Au"])])
+        return {"count": 1, "returned": 1}
+
+
+@pytest.fixture
+def tool(monkeypatch, artifacts, mirror):
+    from app.services.dataset_store import DatasetStore
+    from app.tools import geomaterial
+
+    api = FakeGeomaterialAPI()
+    monkeypatch.setattr(geomaterial, "get_geomaterial_api", lambda: api)
+    monkeypatch.setattr(geomaterial, "get_geomaterial_mirror", lambda: mirror)
+    monkeypatch.setattr(geomaterial, "get_dataset_store", lambda: DatasetStore(artifacts.root / "sample_data", reuse_ttl=0))
+    return geomaterial.collect_geomaterials, api
+
+
+def test_tool_uses_a_fresh_mirror_and_falls_back_otherwise(tool, mirror):
+    collect, api = tool
+    # empty mirror: the API answers
+    assert asyncio.run(collect(ima=True, hmin=5)).status == "OK" and api.calls == 1
+    asyncio.run(mirror.sync())
+    assert asyncio.run(collect(ima=True, hmin=5)).status == "OK" and api.calls == 1
+    # a filter the mirror cannot evaluate, or a stale mirror: the API again
+    asyncio.run(collect(ima=True, hmin=5, optical2v_min="10"))
+    assert api.calls == 2
+    mirror.max_age, mirror.last_sync = 1, 0.0
+    mirror._loaded_mtime = mirror.db_path.stat().st_mtime
+    asyncio.run(collect(ima=True, hmin=5))
+    assert api.calls == 3
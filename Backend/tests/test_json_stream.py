@@ -0,0 +1,60 @@
+# Backend/tests/test_json_stream.py
+import json
+
+import pytest
+
+from app.utils.json_stream import JSONStreamError, ResultsStreamParser
+
+
+BODY = json.dumps({
+    "count": 3,
+    "next": None,
+    "results": [
+        {"id": 1, "name": "Quartz", "elements": ["Si", "O"]},
+        {"id": 2, "name": "Ümit \"quoted\" {braces}", "hmin": 5.5},
+        {"id": 3, "nested": {"list": [1, [2, 3]], "empty": {}}},
+    ],
+    "previous": "https://api.mindat.org/v1/geomaterials/?offset=0",
+}, ensure_ascii=False).encode("utf-8")
+
+
+def _parse(body: bytes, size: int):
+    parser = ResultsStreamParser()
+    rows = []
+    for i in range(0, len(body), size):
+        rows.extend(parser.feed(body[i:i + size]))
+    rows.extend(parser.feed(b"", final=True))
+    return parser, rows
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, len(BODY)])
+def test_any_chunking_gives_the_same_rows_and_meta(size):
+    parser, rows = _parse(BODY, size)
+    expected = json.loads(BODY)
+    assert rows == expected["results"]
+    assert parser.meta == {"count": 3, "next": None, "previous": expected["previous"]}
+    assert parser.rows_parsed == 3 and parser.done
+
+
+def test_rows_are_yielded_before_the_body_ends():
+    parser = ResultsStreamParser()
+    head = BODY[: BODY.index(b'{"id": 2')]
+    assert [r["id"] for r in parser.feed(head)] == [1]
+
+
+def test_empty_results_and_trailing_number():
+    parser, rows = _parse(b'{"results": [], "count": 12}', 3)
+    assert rows == [] and parser.meta == {"count": 12}
+
+
+@pytest.mark.parametrize("body", [b'{"count": 1, "results": [{"id": 1}', b'[1, 2]', b'{"results": [1]} x'])
+def test_truncated_or_malformed_body_raises(body):
+    with pytest.raises(JSONStreamError):
+        _parse(body, 4)
+
+
+@pytest.mark.parametrize("body", [b'{"results": [{"id": 1},]}', b'{"results": [{"id": 1}], "count": 1,}'])
+def test_trailing_commas_are_rejected(body):
+    parser = ResultsStreamParser()
+    with pytest.raises(JSONStreamError, match="Trailing comma"):
+        parser.feed(body)
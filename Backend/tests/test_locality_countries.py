@@ -0,0 +1,74 @@
+# Backend/tests/test_locality_countries.py
+import asyncio
+
+from app.services.mindat_endpoints_services import LocalityAPI
+
+PAGE = 10
+
+
+class FakeClient:
+    """fetch_all over per-country localities, in PAGE-row pages with a per-country delay"""
+
+    def __init__(self, sizes, delays=None, failing=()):
+        self.sizes = sizes
+        self.delays = delays or {}
+        self.failing = failing
+        self.calls = []
+
+    async def fetch_all(self, endpoint, params, max_rows=None, on_page=None):
+        country = params["country"]
+        self.calls.append(country)
+        if country in self.failing:
+            raise RuntimeError("upstream error")
+        total = self.sizes[country]
+        rows = min(total, max_rows or total)
+        for start in range(0, rows, PAGE):
+            await asyncio.sleep(self.delays.get(country, 0))
+            on_page([{"id": f"{country}-{i}"} for i in range(start, min(start + PAGE, rows))])
+        return {"count": total, "returned": rows}
+
+
+def _collect(client, countries, **kwargs):
+    pages = []
+    summary = asyncio.run(LocalityAPI(client=client).fetch_localities_by_country({"txt": "gold"}, countries, pages.append, **kwargs))
+    return [row for page in pages for row in page], pages, summary
+
+
+def test_rows_are_grouped_in_the_requested_order():
+    # the first country is the slowest, so the others finish first and wait
+    client = FakeClient({"Peru": 25, "Canada": 30, "Chile": 5}, delays={"Peru": 0.02})
+    rows, _, summary = _collect(client, ["Peru", "Canada", "Chile"])
+    expected = [f"{c}-{i}" for c, n in (("Peru", 25), ("Canada", 30), ("Chile", 5)) for i in range(n)]
+    assert [row["id"] for row in rows] == expected
+    assert all(row["id"].startswith(row["country"]) for row in rows)
+    assert summary["per_country"] == {"Peru": 25, "Canada": 30, "Chile": 5}
+    assert summary["count"] == summary["returned"] == 60
+
+
+def test_spilled_countries_are_replayed_page_by_page():
+    client = FakeClient({"Peru": 5, "Canada": 30}, delays={"Peru": 0.02})
+    _, pages, _ = _collect(client, ["Peru", "Canada"])
+    assert [len(page) for page in pages] == [5, 10, 10, 10]
+
+
+def test_a_country_named_twice_is_fetched_once():
+    client = FakeClient({"Peru": 12, "Chile": 3})
+    rows, _, summary = _collect(client, ["Peru", "Chile", "Peru"])
+    assert sorted(client.calls) == ["Chile", "Peru"]
+    assert len(rows) == 15 and summary["per_country"] == {"Peru": 12, "Chile": 3}
+
+
+def test_max_rows_applies_to_each_country():
+    client = FakeClient({"Peru": 40, "Canada": 8, "Chile": 25})
+    rows, _, summary = _collect(client, ["Peru", "Canada", "Chile"], max_rows=20)
+    assert summary["per_country"] == {"Peru": 20, "Canada": 8, "Chile": 20}
+    assert summary["returned"] == len(rows) == 48
+    # count is what Mindat reports, so a capped fetch shows as truncated
+    assert summary["count"] == 73
+
+
+def test_a_failing_country_does_not_stop_the_others():
+    client = FakeClient({"Peru": 5, "Chile": 5}, failing=("Canada",))
+    rows, _, summary = _collect(client, ["Peru", "Canada", "Chile"])
+    assert [row["country"] for row in rows] == ["Peru"] * 5 + ["Chile"] * 5
+    assert list(summary["failed"]) == ["Canada"] and summary["per_country"]["Canada"] == 0
@@ -0,0 +1,48 @@
+# Backend/tests/test_locality_join.py
+import asyncio
+
+from app.services.locality_join import join_mineral_localities
+
+
+class _Writer:
+    def __init__(self):
+        self.rows = []
+        self.rows_written = 0
+
+    def write_rows(self, rows):
+        self.rows.extend(rows)
+        self.rows_written += len(rows)
+
+
+class _Client:
+    """loc-by-min stub: later minerals answer first, mineral 3 fails"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_all(self, endpoint, params, **kwargs):
+        mineral_id = params["min_id"]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02 / mineral_id)
+            if mineral_id == 3:
+                raise RuntimeError("upstream failed")
+            return {"results": [{"id": mineral_id * 100 + i} for i in range(2)]}
+        finally:
+            self.in_flight -= 1
+
+
+def test_rows_are_written_in_mineral_order_within_the_window():
+    async def run():
+        client, writer = _Client(), _Writer()
+        minerals = [{"id": i, "name": f"m{i}"} for i in range(1, 7)]
+        summary = await join_mineral_localities(minerals, writer, max_workers=2, client=client)
+        assert [r["mineral_id"] for r in writer.rows] == [1, 1, 2, 2, 4, 4, 5, 5, 6, 6]
+        assert writer.rows[0] == {"id": 100, "mineral_id": 1, "mineral_name": "m1"}
+        assert client.max_in_flight <= 2
+        assert summary["rows"] == 10 and summary["localities_per_mineral"][3] == 0
+        assert list(summary["failed"]) == [3]
+
+    asyncio.run(run())
@@ -0,0 +1,124 @@
+# Backend/tests/test_mindat_cache.py
+import asyncio
+import time
+
+import fakeredis
+
+from app.utils.mindat_cache import (
+    DiskTier,
+    LRUTier,
+    MindatResponseCache,
+    RedisTier,
+    canonical_params,
+    make_cache_key,
+)
+
+
+def test_cache_key_ignores_order_case_of_lists_and_none():
+    a = make_cache_key("geomaterials", {"el_inc": "Cu,Fe", "hmin": 3.0, "ima": True, "q": None})
+    b = make_cache_key("geomaterials", {"ima": "true", "hmin": "3", "el_inc": "Fe, Cu,Fe"})
+    assert a == b
+    assert a != make_cache_key("localities", {"el_inc": "Cu,Fe", "hmin": 3, "ima": True})
+
+
+def test_free_text_params_are_not_split():
+    params = canonical_params({"description": "red, fibrous", "el_inc": "S,Cu"})
+    assert ("description", "red, fibrous") in params
+    assert ("el_inc", "Cu,S") in params
+    assert make_cache_key("geomaterials", {"description": "a, b"}) != make_cache_key("geomaterials", {"description": "b, a"})
+
+
+def test_lru_tier_evicts_least_recently_used():
+    async def run():
+        tier = LRUTier(max_entries=2)
+        await tier.set("a", 1, 60)
+        await tier.set("b", 2, 60)
+        assert await tier.get("a") == 1  # a is now the most recent
+        await tier.set("c", 3, 60)
+        assert await tier.get("b") is None
+        assert await tier.get("a") == 1 and await tier.get("c") == 3
+        assert tier.evictions == 1
+
+    asyncio.run(run())
+
+
+def test_lru_tier_expires_entries():
+    async def run():
+        tier = LRUTier()
+        await tier.set("a", 1, 60)
+        tier._data["a"] = (time.monotonic() - 1, 1)
+        assert await tier.get("a") is None
+        assert len(tier) == 0
+
+    asyncio.run(run())
+
+
+def test_disk_tier_round_trip_and_persistence(tmp_path):
+    async def run():
+        tier = DiskTier(tmp_path)
+        await tier.set("k", {"results": [1, 2]}, 60)
+        assert await tier.get("k") == {"results": [1, 2]}
+        # a new instance on the same directory (e.g. after a restart) sees it
+        assert await DiskTier(tmp_path).get("k") == {"results": [1, 2]}
+        await tier.clear()
+        assert await tier.get("k") is None
+
+    asyncio.run(run())
+
+
+def test_redis_tier_with_fakeredis():
+    async def run():
+        client = fakeredis.FakeAsyncRedis()
+        tier = RedisTier(client)
+        await tier.set("mindat:x", {"count": 2}, 60)
+        assert await tier.get("mindat:x") == {"count": 2}
+        assert 0 < await client.ttl("alchemist:mindat:x") <= 60
+        await tier.clear()
+        assert await tier.get("mindat:x") is None
+
+    asyncio.run(run())
+
+
+def test_tiered_cache_promotes_and_counts(tmp_path):
+    async def run():
+        memory, disk, shared = LRUTier(), DiskTier(tmp_path), RedisTier(fakeredis.FakeAsyncRedis())
+        cache = MindatResponseCache([memory, disk, shared], default_ttl=60)
+        assert await cache.get("geomaterials", {"q": "x"}) is None
+        # another process filled the shared tier
+        await shared.set(make_cache_key("geomaterials", {"q": "x"}), {"results": []}, 60)
+        assert await cache.get("geomaterials", {"q": "x"}) == {"results": []}
+        assert await memory.get(make_cache_key("geomaterials", {"q": "x"})) == {"results": []}
+        assert await cache.get("geomaterials", {"q": "x"}) == {"results": []}
+        stats = cache.stats()
+        assert stats["hits_by_tier"] == {"memory": 1, "disk": 0, "redis": 1}
+        assert stats["misses"] == 1
+        assert stats["evictions"] == {"memory": 0}
+
+    asyncio.run(run())
+
+
+def test_search_endpoints_keep_configured_ttl():
+    cache = MindatResponseCache([LRUTier()], default_ttl=3600, endpoint_ttls={"localities": 60})
+    assert cache.ttl_for("geomaterials") == 3600
+    assert cache.ttl_for("localities") == 60
+    assert cache.ttl_for("spacegroups") == 7 * 24 * 3600
+
+
+def test_failing_tier_is_a_miss():
+    class Broken:
+        name = "redis"
+
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ttl):
+            raise ConnectionError("down")
+
+    async def run():
+        cache = MindatResponseCache([LRUTier(), Broken()], default_ttl=60)
+        await cache.set("geomaterials", {}, {"results": [1]})
+        assert await cache.get("geomaterials", {}) == {"results": [1]}
+        assert await cache.get("localities", {}) is None
+        assert cache.stats()["errors"] == 2
+
+    asyncio.run(run())
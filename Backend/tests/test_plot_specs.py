@@ -0,0 +1,54 @@
+# Backend/tests/test_plot_specs.py
+import pytest
+
+from app.utils.plot_sepcs import build_chart_spec, resolve_chart
+
+TYPES = {
+    "name": "nominal",
+    "hmin": "quantitative",
+    "hmax": "quantitative",
+    "dmeas": "quantitative",
+    "csystem": "nominal",
+    "elements": "list",
+    "country": "nominal",
+    "latitude": "quantitative",
+    "longitude": "quantitative",
+}
+PROFILE = {"ok": True, "columns": {name: {"type": kind} for name, kind in TYPES.items()}}
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("plot the hardness distribution", {"chart": "numeric_histogram", "field": "hmin"}),
+    ("histogram of elements", {"chart": "element_histogram", "field": "elements"}),
+    ("plot the number of minerals per country", {"chart": "bar", "field": "country"}),
+    # the field next to a comparison filters the data, the "by" field is charted
+    ("Show me a chart of minerals with hardness above 5 by crystal system", {"chart": "bar", "field": "csystem"}),
+    ("bar chart of minerals with more than 3 elements per crystal system", {"chart": "bar", "field": "csystem"}),
+    ("histogram of elements for minerals with hardness > 5", {"chart": "element_histogram", "field": "elements"}),
+    ("heatmap of crystal system by hardness", {"chart": "heatmap", "field": "hmin", "field_type": "quantitative", "system": "csystem"}),
+])
+def test_resolves_common_requests(query, expected):
+    assert resolve_chart(query, PROFILE) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "chart of hardness and density",
+    "chart of hardness by crystal system",
+    "plot minerals with hardness at least 5",
+    "plot the minerals",
+    "list minerals with hardness 5",
+])
+def test_ambiguous_or_unsupported_requests_fall_back(query):
+    assert resolve_chart(query, PROFILE) is None
+
+
+def test_scatter_puts_the_first_field_on_y():
+    resolved = resolve_chart("scatter of density vs hardness", PROFILE)
+    assert (resolved["y"], resolved["x"]) == ("dmeas", "hmin")
+
+
+def test_builds_a_spec_bound_to_the_dataset():
+    spec = build_chart_spec("map the localities", PROFILE)
+    assert spec["data"] == {"name": "table"}
+    assert spec["layer"][-1]["encoding"]["latitude"]["field"] == "latitude"
+    assert build_chart_spec("plot hardness", None) is None
@@ -0,0 +1,32 @@
+# Backend/tests/test_projection.py
+from app.utils.projection import (
+    GEOMATERIAL_VISUALISATION_FIELDS,
+    project_rows,
+    resolve_fields,
+)
+
+
+def test_default_and_explicit_fields():
+    assert resolve_fields(None, ["id", "name"]) == ["id", "name"]
+    assert resolve_fields(["name", "id", "hmin"], ["id"]) == ["id", "name", "hmin"]
+    assert resolve_fields(["*"], ["id"]) is None
+
+
+def test_expand_targets_are_kept():
+    fields = resolve_fields(None, GEOMATERIAL_VISUALISATION_FIELDS, expand=["locality"])
+    assert fields[-1] == "locality"
+    assert resolve_fields(["name"], ["id"], expand=["locality", "relations"]) == ["id", "name", "locality", "relations"]
+    assert resolve_fields(["name", "locality"], ["id"], expand=["locality"]) == ["id", "name", "locality"]
+
+
+def test_expand_all_disables_projection():
+    assert resolve_fields(["name"], ["id"], expand=["~all"]) is None
+    assert resolve_fields(None, ["id"], expand=["*"]) is None
+
+
+def test_project_rows_checks_every_row():
+    rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b", "extra": "x"}]
+    assert project_rows(rows, ["id", "name"]) == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    narrow = [{"id": 1}, {"id": 2, "name": "b"}]
+    assert project_rows(narrow, ["id", "name"]) is narrow
+    assert project_rows(rows, None) is rows
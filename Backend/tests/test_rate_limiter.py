@@ -0,0 +1,88 @@
+# Backend/tests/test_rate_limiter.py
+import asyncio
+
+import pytest
+
+from app.utils.custom_message import MindatAPIException
+from app.utils.rate_limiter import TokenBucketRateLimiter
+
+
+def test_burst_is_granted_without_waiting():
+    async def run():
+        limiter = TokenBucketRateLimiter(rate=1, burst=3, max_wait=0)
+        waits = [await limiter.acquire() for _ in range(3)]
+        assert waits == [0.0, 0.0, 0.0]
+        assert limiter.stats()["acquired"] == 3
+
+    asyncio.run(run())
+
+
+def test_callers_beyond_the_burst_queue_for_their_slot():
+    async def run():
+        limiter = TokenBucketRateLimiter(rate=100, burst=1, max_wait=1)
+        waits = await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+        waits = sorted(waits)
+        assert waits[0] == 0.0
+        # each queued caller is promised the next free slot, 10 ms apart
+        assert waits[1] == pytest.approx(0.01, abs=0.005)
+        assert waits[2] == pytest.approx(0.02, abs=0.005)
+        stats = limiter.stats()
+        assert stats["waited"] == 2 and stats["max_queue_depth"] == 2 and stats["queue_depth"] == 0
+
+    asyncio.run(run())
+
+
+def test_rejects_callers_who_would_wait_too_long():
+    async def run():
+        limiter = TokenBucketRateLimiter(rate=1, burst=1, max_wait=0.5)
+        await limiter.acquire()
+        with pytest.raises(MindatAPIException) as excinfo:
+            await limiter.acquire()
+        assert excinfo.value.status_code == 429
+        assert limiter.stats()["rejected"] == 1
+        # a rejected caller does not consume a slot
+        assert limiter._tokens == pytest.approx(0.0, abs=0.01)
+
+    asyncio.run(run())
+
+
+def test_bucket_refills_up_to_burst():
+    limiter = TokenBucketRateLimiter(rate=10, burst=2, max_wait=0)
+    limiter._tokens = 0.0
+    limiter._ts -= 10  # ten seconds ago would refill 100 tokens without the cap
+    assert limiter._reserve_local() == 0.0
+    assert limiter._tokens == pytest.approx(1.0)
+
+
+def test_falls_back_to_local_bucket_when_redis_fails():
+    class BrokenRedis:
+        def register_script(self, script):
+            async def call(keys, args):
+                raise ConnectionError("redis down")
+            return call
+
+    async def run():
+        limiter = TokenBucketRateLimiter(rate=1, burst=1, max_wait=0, redis_client=BrokenRedis())
+        assert await limiter.acquire() == 0.0
+        with pytest.raises(MindatAPIException):
+            await limiter.acquire()
+        assert limiter.stats()["redis_errors"] == 2
+
+    asyncio.run(run())
+
+
+def test_redis_bucket_is_shared_between_limiters():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    async def run():
+        client = fakeredis.FakeAsyncRedis()
+        backend = TokenBucketRateLimiter(rate=1, burst=2, max_wait=0, key="k", redis_client=client)
+        mcp = TokenBucketRateLimiter(rate=1, burst=2, max_wait=0, key="k", redis_client=client)
+        assert await backend.acquire() == 0.0
+        assert await mcp.acquire() == 0.0
+        with pytest.raises(MindatAPIException):
+            await backend.acquire()
+        assert backend.stats()["backend"] == "redis" and backend.stats()["redis_errors"] == 0
+
+    asyncio.run(run())
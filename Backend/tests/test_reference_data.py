@@ -0,0 +1,41 @@
+# Backend/tests/test_reference_data.py
+from app.services.reference_data import ReferenceDataService, ReferenceTable
+from app.utils.projection import GEOMATERIAL_VISUALISATION_FIELDS, resolve_fields
+
+
+def _service(tmp_path) -> ReferenceDataService:
+    service = ReferenceDataService(tmp_path / "reference.json")
+    service.tables["spacegroups"] = ReferenceTable(
+        "spacegroups", [{"id": 1, "spacegroup": "P1"}, {"id": 154, "spacegroup": "P3221"}], fetched_at=0.0
+    )
+    return service
+
+
+def test_enrich_labels_copies_and_leaves_inputs_alone(tmp_path):
+    rows = [{"id": 1, "spacegroup": 154}, {"id": 2, "spacegroup": 999}, {"id": 3}]
+    enriched = _service(tmp_path).enrich(rows)
+    assert [r.get("spacegroup_name") for r in enriched] == ["P3221", None, None]
+    assert "spacegroup_name" not in enriched[2]
+    assert all("spacegroup_name" not in r for r in rows)
+
+
+def test_enrich_without_tables_is_a_no_op(tmp_path):
+    rows = [{"id": 1, "spacegroup": 154}]
+    assert ReferenceDataService(tmp_path / "r.json").enrich(rows) == rows
+
+
+def test_enricher_follows_the_projection(tmp_path):
+    service = _service(tmp_path)
+    rows = [{"id": 1, "spacegroup": 154}]
+    default = service.enricher(resolve_fields(None, GEOMATERIAL_VISUALISATION_FIELDS))
+    assert default(rows) == [{"id": 1, "spacegroup": 154, "spacegroup_name": "P3221"}]
+    assert service.enricher(None)(rows)[0]["spacegroup_name"] == "P3221"
+    assert service.enricher(["id", "name", "hmin"]) is None
+
+
+def test_snapshot_round_trip(tmp_path):
+    service = _service(tmp_path)
+    service._write_snapshot()
+    fresh = ReferenceDataService(tmp_path / "reference.json")
+    assert fresh.load_snapshot() == 1
+    assert fresh.label("spacegroups", "154") == "P3221"
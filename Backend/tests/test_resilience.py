@@ -0,0 +1,160 @@
+# Backend/tests/test_resilience.py
+import asyncio
+
+import httpx
+import pytest
+
+from app.config.mindat_config import MindatAPIClient, MindatAuth
+from app.utils.custom_message import MindatAPIException
+from app.utils.rate_limiter import TokenBucketRateLimiter
+from app.utils.resilience import CircuitBreaker, backoff_delay, parse_retry_after
+
+
+def _open_breaker(reset_timeout: float = 0.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_half_open_admits_one_probe():
+    breaker = _open_breaker()
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_breaker_failed_probe_reopens():
+    breaker = _open_breaker(reset_timeout=60)
+    breaker.opened_at -= 60
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_released_probe_can_be_retaken():
+    breaker = _open_breaker()
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt, 0.2, 1.0) <= 1.0 for attempt in range(20))
+
+
+def _client(handler, rate_limiter=None) -> MindatAPIClient:
+    client = MindatAPIClient(auth=MindatAuth(), rate_limiter=rate_limiter)
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.max_retries = 0
+    client.breakers["geomaterials"] = _open_breaker()
+    return client
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"count": 0, "results": []})
+
+
+def test_rate_limited_attempt_does_not_strand_probe():
+    async def run():
+        limiter = TokenBucketRateLimiter(rate=0.001, burst=1, max_wait=0.0)
+        client = _client(_ok, rate_limiter=limiter)
+        breaker = client.breakers["geomaterials"]
+        limiter._tokens = 0.0
+        with pytest.raises(MindatAPIException) as err:
+            await client.get_data_from_api("geomaterials", use_cache=False)
+        assert err.value.status_code == 429
+        # the limiter rejected the call before the breaker admitted a probe
+        assert breaker.state == CircuitBreaker.OPEN
+        client.rate_limiter = None
+        await client.get_data_from_api("geomaterials", use_cache=False)
+        assert breaker.state == CircuitBreaker.CLOSED
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_cancelled_probe_is_released():
+    async def run():
+        entered = asyncio.Event()
+
+        async def slow(request: httpx.Request) -> httpx.Response:
+            entered.set()
+            await asyncio.sleep(10)
+            return _ok(request)
+
+        client = _client(slow)
+        breaker = client.breakers["geomaterials"]
+        # streamed requests are not coalesced, so cancelling the caller cancels the request
+        task = asyncio.create_task(client.stream_data_from_api("geomaterials", {}, on_rows=lambda rows: None))
+        await entered.wait()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # upstream recovered: the next call is admitted as a new probe
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(_ok))
+        await client.get_data_from_api("geomaterials", use_cache=False)
+        assert breaker.state == CircuitBreaker.CLOSED
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_server_errors_open_breaker():
+    async def run():
+        client = _client(lambda request: httpx.Response(503))
+        client.breakers.clear()
+        client.circuit_failure_threshold = 2
+        for _ in range(2):
+            with pytest.raises(MindatAPIException):
+                await client.get_data_from_api("geomaterials", use_cache=False)
+        with pytest.raises(MindatAPIException) as err:
+            await client.get_data_from_api("geomaterials", use_cache=False)
+        assert "circuit open" in err.value.message
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_malformed_stream_is_a_bad_gateway_but_callback_errors_propagate():
+    async def run():
+        client = _client(lambda request: httpx.Response(200, content=b'{"count": 1, "results": [{"id": 1}'))
+        with pytest.raises(MindatAPIException) as err:
+            await client.stream_data_from_api("geomaterials", {}, on_rows=lambda rows: None)
+        assert err.value.status_code == 502
+
+        def failing(rows):
+            raise ValueError("writer rejected the batch")
+
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"count": 1, "results": [{"id": 1}]})
+        ))
+        with pytest.raises(ValueError, match="writer rejected the batch"):
+            await client.stream_data_from_api("geomaterials", {}, on_rows=failing)
+        await client.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,27 @@
+# Backend/tests/test_serialization.py
+import math
+
+import numpy as np
+
+from app.utils.serialization import dump_file, dumps, dumps_bytes, load_file, loads
+
+
+def test_round_trip_is_compact_utf8():
+    data = {"name": "Ünterberg", "elements": ["Cu", "O"], "hmin": 3.5}
+    body = dumps_bytes(data)
+    assert b" " not in body.replace("Ü".encode(), b"") and "Ü".encode() in body
+    assert loads(body) == loads(dumps(data)) == data
+
+
+def test_values_orjson_rejects_fall_back_to_stdlib():
+    assert loads(dumps_bytes({"big": 2 ** 70})) == {"big": 2 ** 70}
+    assert math.isnan(loads(b'{"x": NaN}')["x"])
+
+
+def test_numpy_values_and_non_str_keys():
+    assert loads(dumps_bytes({1: np.arange(3), "f": np.float64(1.5)})) == {"1": [0, 1, 2], "f": 1.5}
+
+
+def test_file_helpers(tmp_path):
+    dump_file(tmp_path / "d.json", {"a": [1, 2]})
+    assert load_file(tmp_path / "d.json") == {"a": [1, 2]}
@@ -0,0 +1,70 @@
+# Backend/tests/test_single_flight.py
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"count": 1}
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+        assert all(r == {"count": 1} for r in results)
+        assert calls == 1
+        assert flight.stats() == {"in_flight": 0, "upstream_calls": 1, "deduplicated": 4}
+
+    asyncio.run(run())
+
+
+def test_different_keys_and_later_calls_are_not_coalesced():
+    async def run():
+        flight = SingleFlight()
+        a, b = await asyncio.gather(flight.do("a", lambda: asyncio.sleep(0, "A")), flight.do("b", lambda: asyncio.sleep(0, "B")))
+        assert (a, b) == ("A", "B")
+        # the first call finished, so the next one goes upstream again
+        assert await flight.do("a", lambda: asyncio.sleep(0, "A2")) == "A2"
+        assert flight.stats()["upstream_calls"] == 3
+
+    asyncio.run(run())
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", boom) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert await flight.do("k", lambda: asyncio.sleep(0, "ok")) == "ok"
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("k", slow))
+        second = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "done"
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
@@ -0,0 +1,133 @@
+# Backend/tests/test_sketches.py
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.utils.column_profile import DatasetProfiler
+from app.utils.columnar import ColumnarDataset, ColumnarWriter
+from app.utils.sketches import HyperLogLog, KLLSketch, SpaceSaving, hash_bytes, hash_numbers, hash_texts
+
+rng = np.random.default_rng(11)
+
+
+def test_hashes_agree_across_entry_points():
+    assert hash_numbers(np.array([1, 2]))[0] == hash_numbers(np.array([1.0]))[0]
+    texts = ["quartz", "", "Ümit"]
+    data = "".join(texts).encode("utf-8")
+    offsets = np.cumsum([0] + [len(t.encode("utf-8")) for t in texts])
+    assert hash_texts(texts).tolist() == hash_bytes(np.frombuffer(data, dtype=np.uint8), offsets).tolist()
+    assert len(set(hash_texts(texts).tolist())) == 3
+
+
+def test_hll_merge_equals_a_single_sketch():
+    values = rng.integers(0, 50_000, 200_000)
+    whole, left, right = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    whole.add(hash_numbers(values))
+    left.add(hash_numbers(values[:70_000]))
+    right.add(hash_numbers(values[70_000:]))
+    left.merge(right)
+    assert np.array_equal(left.registers, whole.registers)
+    truth = len(np.unique(values))
+    assert abs(left.estimate() - truth) / truth < 0.05
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(p=10))
+
+
+def test_hll_small_counts_use_linear_counting():
+    sketch = HyperLogLog()
+    sketch.add(hash_numbers(np.arange(1000)))
+    assert abs(sketch.estimate() - 1000) < 20
+
+
+def _space_saving(values, capacity):
+    sketch = SpaceSaving(capacity)
+    hashes = hash_numbers(values)
+    sketch.add(hashes, lambda i: int(values[i]))
+    return sketch
+
+
+def test_space_saving_merge_is_exact_below_capacity():
+    a, b = rng.integers(0, 20, 500), rng.integers(0, 20, 700)
+    merged = _space_saving(a, 64)
+    merged.merge(_space_saving(b, 64))
+    truth = Counter(np.concatenate([a, b]).tolist())
+    assert {v: c for v, c in merged.top(20)} == dict(truth)
+
+
+def test_space_saving_merge_keeps_heavy_hitters_and_lower_bounds():
+    # a few heavy values over a long uniform tail, split across partitions
+    tail = rng.integers(100, 100_000, 40_000)
+    heavy = np.repeat([1, 2, 3], [3000, 2000, 1000])
+    values = rng.permutation(np.concatenate([tail, heavy]))
+    parts = np.array_split(values, 4)
+    merged = _space_saving(parts[0], 16)
+    for part in parts[1:]:
+        merged.merge(_space_saving(part, 16))
+    truth = Counter(values.tolist())
+    top = merged.top(3)
+    assert [v for v, _ in top] == [1, 2, 3]
+    assert all(count <= truth[v] for v, count in top)
+
+
+def test_kll_is_exact_below_k_and_accurate_after_merging():
+    small = KLLSketch(k=200)
+    small.add(np.arange(101, dtype=float))
+    assert small.quantiles([0.0, 0.5, 1.0]) == [0.0, 50.0, 100.0]
+
+    values = rng.normal(size=100_000)
+    merged = KLLSketch(k=200, seed=1)
+    for i, part in enumerate(np.array_split(values, 10)):
+        sketch = KLLSketch(k=200, seed=i)
+        sketch.add(part)
+        merged.merge(sketch)
+    assert merged.n == len(values)
+    ordered = np.sort(values)
+    for q, estimate in zip([0.1, 0.5, 0.9], merged.quantiles([0.1, 0.5, 0.9])):
+        rank = np.searchsorted(ordered, estimate) / len(values)
+        assert abs(rank - q) < 0.02
+    assert KLLSketch().quantiles([0.5]) is None
+
+
+def test_profiler_merge_matches_one_pass():
+    rows = [{"id": i, "hmin": float(i % 7), "csystem": ["Trigonal", "Isometric"][i % 2]} for i in range(300)]
+    for row in rows[200:]:
+        row["late"] = "x"
+    whole = DatasetProfiler()
+    whole.update_rows(rows)
+    first, second = DatasetProfiler(), DatasetProfiler()
+    first.update_rows(rows[:200])
+    second.update_rows(rows[200:])
+    first.merge(second)
+    a, b = whole.result(), first.result()
+    assert a["row_count"] == b["row_count"] == 300
+    assert list(a["columns"]) == list(b["columns"])
+    for name, column in a["columns"].items():
+        other = b["columns"][name]
+        for key in ("type", "null_count", "unique_approx", "min", "max", "mean"):
+            assert column.get(key) == other.get(key), (name, key)
+    # low-cardinality columns stay under the SpaceSaving capacity, so counts are exact
+    for name in ("hmin", "csystem"):
+        assert a["columns"][name]["top_values"] == b["columns"][name]["top_values"]
+    assert b["columns"]["late"]["null_count"] == 200
+
+
+def test_rows_and_columnar_paths_allocate_the_same_slots(tmp_path):
+    # a nested column first, more top-level columns than slots after it,
+    # and a top-level column that only appears in the second batch
+    rows = [{"info": {"a": i, "b": {"c": i}}, "x": i, "y": str(i)} for i in range(10)]
+    rows += [dict(row, z=1.5) for row in rows]
+    writer = ColumnarWriter(tmp_path / "d.columns")
+    writer.write_rows(rows)
+    writer.close({})
+    dataset = ColumnarDataset(tmp_path / "d.columns")
+    for max_keys in (3, 4, 5, 10):
+        by_rows, by_columns = DatasetProfiler(max_keys=max_keys), DatasetProfiler(max_keys=max_keys)
+        for start in range(0, len(rows), 10):
+            by_rows.update_rows(rows[start:start + 10])
+            by_columns.update_columnar(dataset, start, start + 10)
+        expected = ["info", "x", "y", "z", "info.a", "info.b", "info.b.c"][:max_keys]
+        for profile in (by_rows.result(), by_columns.result()):
+            assert sorted(profile["columns"]) == sorted(expected), max_keys
+            if "z" in profile["columns"]:
+                assert profile["columns"]["z"]["null_count"] == 10
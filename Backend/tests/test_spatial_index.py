@@ -0,0 +1,95 @@
+# Backend/tests/test_spatial_index.py
+import shutil
+
+import numpy as np
+import pytest
+
+from app.models import LocalityToolResponse
+from app.services.dataset_store import DatasetStore
+from app.services.spatial_index import GridIndex, haversine_km, spatial_filter
+from app.tools.locality import _spatial_subset
+from app.utils.columnar import ColumnarDataset, ColumnarWriter, columnar_path
+from app.utils.dataset_io import ensure_json, read_rows
+
+rng = np.random.default_rng(7)
+LAT = rng.uniform(-90, 90, 5000)
+LON = rng.uniform(-180, 180, 5000)
+LAT[::97] = np.nan  # rows without coordinates are never returned
+
+
+@pytest.fixture(scope="module")
+def index():
+    return GridIndex(LAT, LON, cell_deg=5.0)
+
+
+@pytest.mark.parametrize("box", [(-10, -5, 20, 30), (0, 0, 0.5, 0.5), (170, -20, -170, 20), (-180, -90, 180, 90)])
+def test_bbox_matches_brute_force(index, box):
+    west, south, east, north = box
+    in_lon = (LON >= west) & (LON <= east) if west <= east else (LON >= west) | (LON <= east)
+    expected = np.flatnonzero((LAT >= south) & (LAT <= north) & in_lon)
+    assert index.bbox(*box).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("center, km", [((39.7, -105.0), 800), ((0.0, 179.5), 500), ((88.0, 10.0), 700)])
+def test_radius_matches_brute_force_nearest_first(index, center, km):
+    distance = haversine_km(center[0], center[1], LAT, LON)
+    expected = np.flatnonzero(distance <= km)
+    rows, got = index.radius(center[0], center[1], km)
+    assert sorted(rows.tolist()) == expected.tolist()
+    assert np.all(np.diff(got) >= 0)
+    assert np.allclose(got, distance[rows])
+
+
+ROWS = [
+    {"id": 1, "txt": "Denver", "country": "USA", "latitude": 39.74, "longitude": -104.99},
+    {"id": 2, "txt": "Boulder", "country": "USA", "latitude": 40.01, "longitude": -105.27},
+    {"id": 3, "txt": "Chicago", "country": "USA", "latitude": 41.88, "longitude": -87.63},
+    {"id": 4, "txt": "No coordinates", "country": "USA", "latitude": None, "longitude": None},
+]
+
+
+def test_columnar_and_row_inputs_give_the_same_result(tmp_path):
+    writer = ColumnarWriter(tmp_path / "d.columns")
+    writer.write_rows(ROWS)
+    dataset = ColumnarDataset(writer.close())
+    for source in (dataset, ROWS):
+        out = []
+        n = spatial_filter(source, out.extend, center=[39.74, -104.99], radius_km=100)
+        assert n == 2 and [r["id"] for r in out] == [1, 2]
+        assert out[0]["distance_km"] == 0.0 and 25 < out[1]["distance_km"] < 40
+        box = []
+        spatial_filter(source, box.extend, bbox=[-106, 39, -100, 41], limit=1)
+        assert [r["id"] for r in box] == [1]
+    assert "distance_km" not in ROWS[0]
+
+
+def _base(artifacts, count):
+    store = DatasetStore(artifacts.root / "sample_data")
+    with store.writer("mindat_locality", {"country": "USA"}) as writer:
+        writer.write_rows(ROWS)
+        writer.count = count
+    base = LocalityToolResponse(
+        status="OK", file_path=str(writer.path), dataset_id=writer.dataset_id, count=len(ROWS),
+        total_count=count, truncated=count > len(ROWS),
+    )
+    return store, base
+
+
+def test_subset_reports_a_truncated_base(artifacts):
+    store, base = _base(artifacts, count=10_000)
+    result = _spatial_subset(store, base, [-106, 39, -100, 41], None, None, None)
+    assert result.status == "OK" and result.count == 2 and result.truncated
+    assert "first 4 of 10000" in result.warning
+    empty = _spatial_subset(store, base, [0, 0, 1, 1], None, None, None)
+    assert empty.status == "ERROR" and "first 4 of 10000" in empty.error
+
+    store, complete = _base(artifacts, count=len(ROWS))
+    assert _spatial_subset(store, complete, [-106, 39, -100, 41], None, None, None).warning is None
+
+
+def test_subset_falls_back_to_json_after_eviction(artifacts):
+    store, base = _base(artifacts, count=len(ROWS))
+    ensure_json(base.file_path)
+    shutil.rmtree(columnar_path(base.file_path))
+    result = _spatial_subset(store, base, None, [39.74, -104.99], 100, None)
+    assert result.status == "OK" and [r["id"] for r in read_rows(result.file_path)] == [1, 2]